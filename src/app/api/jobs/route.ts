@@ -4,6 +4,8 @@ import { prisma } from '@/lib/prisma'
 import { z } from 'zod'
 import { SkillAnalyzer } from '@/lib/ai/skillAnalyzer'
 
+const ML_API_BASE = process.env.ML_API_BASE || 'http://localhost:8000'
+
 interface Skill {
   id: string
   name: string
@@ -229,6 +231,13 @@ export async function POST(request: Request) {
       }
     })
 
+    // Precompute the job's ML features; matching falls back to the raw text if this fails
+    fetch(`${ML_API_BASE}/jobs/${jobListing.id}/profile`, {
+      method: 'PUT',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ job_description: jobListing.description }),
+    }).catch(error => console.error('Error storing job profile:', error))
+
     return NextResponse.json(jobListing)
   } catch (error) {
     console.error('Error creating job listing:', error)
@@ -16,6 +16,9 @@ export async function POST(req: NextRequest) {
       case 'analyze':
         endpoint = '/analyze';
         break;
+      case 'analyze_stream':
+        endpoint = '/analyze/stream';
+        break;
       case 'feedback':
         endpoint = '/feedback';
         break;
@@ -38,6 +41,13 @@ export async function POST(req: NextRequest) {
       throw new Error(`ML API error: ${response.statusText}`);
     }
 
+    // Pass NDJSON lines through as they arrive so the scores render first
+    if (action === 'analyze_stream') {
+      return new NextResponse(response.body, {
+        headers: { 'Content-Type': 'application/x-ndjson' },
+      });
+    }
+
     const result = await response.json();
     return NextResponse.json(result);
   } catch (error) {
@@ -56,6 +66,8 @@ export async function GET(req: NextRequest) {
     const jobId = searchParams.get('jobId');
     const resumeId = searchParams.get('resumeId');
     const limit = searchParams.get('limit');
+    const cursor = searchParams.get('cursor');
+    const format = searchParams.get('format');
 
     let endpoint = '';
     switch (action) {
@@ -67,6 +79,14 @@ export async function GET(req: NextRequest) {
           ...(jobId && { job_id: jobId }),
           ...(resumeId && { resume_id: resumeId }),
           ...(limit && { limit }),
+          ...(cursor && { cursor }),
+        })}`;
+        break;
+      case 'export':
+        endpoint = `/feedback/export?${new URLSearchParams({
+          ...(format && { format }),
+          ...(jobId && { job_id: jobId }),
+          ...(resumeId && { resume_id: resumeId }),
         })}`;
         break;
       case 'trends':
@@ -87,8 +107,20 @@ export async function GET(req: NextRequest) {
       throw new Error(`ML API error: ${response.statusText}`);
     }
 
+    // Stream exports through instead of buffering the whole history
+    if (action === 'export') {
+      const headers = new Headers();
+      for (const name of ['Content-Type', 'Content-Disposition']) {
+        const value = response.headers.get(name);
+        if (value) headers.set(name, value);
+      }
+      return new NextResponse(response.body, { headers });
+    }
+
     const result = await response.json();
-    return NextResponse.json(result);
+    // History pages hand back the cursor of the next page in a header
+    const nextCursor = response.headers.get('X-Next-Cursor');
+    return NextResponse.json(result, nextCursor ? { headers: { 'X-Next-Cursor': nextCursor } } : undefined);
   } catch (error) {
     console.error('ML API error:', error);
     return NextResponse.json(
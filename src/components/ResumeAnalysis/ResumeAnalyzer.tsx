@@ -64,12 +64,15 @@ export const ResumeAnalyzer: React.FC<ResumeAnalyzerProps> = ({ jobDescription }
   };
 
   const handleFeedback = async (rating: number) => {
+    const analysis = analyzeResume.data;
     try {
       await submitFeedback.mutateAsync({
         job_id: 'job123', // Replace with actual job ID
         resume_id: 'resume123', // Replace with actual resume ID
-        match_score: 0.85, // Replace with actual match score
+        match_score: analysis?.final_score ?? matchResume.data?.overall_match ?? 0,
         user_rating: rating,
+        // Only detailed analyses carry the component scores weight learning needs
+        component_scores: analysis?.component_scores,
       });
 
       // Handle successful feedback submission
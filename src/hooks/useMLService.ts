@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { useMutation, useQuery } from '@tanstack/react-query';
+import { useInfiniteQuery, useMutation, useQuery } from '@tanstack/react-query';
 
 interface MatchRequest {
   resume_text: string;
@@ -23,9 +23,22 @@ interface FeedbackRequest {
   user_rating: number;
   feedback_text?: string;
   feedback_categories?: Record<string, number>;
+  // component_scores of the analysis being rated, used to learn the score weights
+  component_scores?: Record<string, number>;
 }
 
-export const useMLService = () => {
+interface FeedbackHistoryFilters {
+  jobId?: string;
+  resumeId?: string;
+  limit?: number;
+}
+
+interface FeedbackHistoryPage {
+  records: Record<string, unknown>[];
+  nextCursor: string | null;
+}
+
+export const useMLService = (historyFilters: FeedbackHistoryFilters = {}) => {
   const [error, setError] = useState<string | null>(null);
 
   // Match resume with job
@@ -103,24 +116,30 @@ export const useMLService = () => {
     },
   });
 
-  // Get feedback history
-  const getFeedbackHistory = useQuery({
-    queryKey: ['feedbackHistory'],
-    queryFn: async ({ queryKey, pageParam }) => {
-      const [_, { jobId, resumeId, limit }] = queryKey;
+  // Get feedback history, one page per fetchNextPage call
+  const { jobId, resumeId, limit } = historyFilters;
+  const getFeedbackHistory = useInfiniteQuery({
+    queryKey: ['feedbackHistory', { jobId, resumeId, limit }],
+    queryFn: async ({ pageParam }): Promise<FeedbackHistoryPage> => {
       const params = new URLSearchParams({
         action: 'history',
         ...(jobId && { jobId }),
         ...(resumeId && { resumeId }),
         ...(limit && { limit: limit.toString() }),
+        ...(pageParam && { cursor: pageParam }),
       });
 
       const response = await fetch(`/api/ml?${params}`);
       if (!response.ok) {
         throw new Error('Failed to fetch feedback history');
       }
-      return response.json();
+      return {
+        records: await response.json(),
+        nextCursor: response.headers.get('X-Next-Cursor'),
+      };
     },
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (last: FeedbackHistoryPage) => last.nextCursor ?? undefined,
     onError: (error: Error) => {
       setError(error.message);
     },
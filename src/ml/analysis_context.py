@@ -0,0 +1,177 @@
+"""
+Analysis Context for Resume Matcher.
+Per-document cache of parsed and derived features shared by every scorer in a request.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from functools import cached_property
+import numpy as np
+from .keyword_index import KeywordHits, KeywordIndex
+from .key_terms import unique_terms
+
+YEAR_TERMS = ('year', 'years', 'yr', 'yrs')
+# Cardinal number words spaCy marks like_num; ordinals such as 'first' are not durations
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13,
+    'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18,
+    'nineteen': 19, 'twenty': 20, 'thirty': 30, 'forty': 40
+}
+TERM_POS = ('NOUN', 'PROPN')
+
+class DocumentContext:
+    def __init__(self,
+                 text: str,
+                 nlp,
+                 encoder: Callable[[List[str]], np.ndarray],
+                 keyword_index: Optional[KeywordIndex] = None,
+                 fast_encoder: Optional[Callable[[List[str]], np.ndarray]] = None):
+        """
+        Wrap a document whose features are computed on first access and memoized.
+
+        Args:
+            text: Original document text
+            nlp: spaCy pipeline used to parse the lowercased text
+            encoder: Callable that encodes a list of texts into a 2D array
+            keyword_index: Optional index used for keyword_hits and skills
+            fast_encoder: Optional cheaper encoder for short texts (skills and
+                noun terms); defaults to encoder
+        """
+        self.text = text
+        self.nlp = nlp
+        self.encoder = encoder
+        self.fast_encoder = fast_encoder or encoder
+        self.keyword_index = keyword_index
+        self._extras: Dict[str, Any] = {}
+
+    def has(self, field: str) -> bool:
+        """Check whether a cached feature is already computed or prefilled."""
+        return field in self.__dict__
+
+    def memoize(self, name: str, compute: Callable[['DocumentContext'], Any]) -> Any:
+        """Compute an analyzer-specific feature once per document."""
+        if name not in self._extras:
+            self._extras[name] = compute(self)
+        return self._extras[name]
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def doc(self):
+        """spaCy parse of the lowercased text."""
+        return self.nlp(self.lower)
+
+    @cached_property
+    def tokenized(self):
+        """
+        Tokenizer-only doc of the lowercased text.
+
+        Enough for lexical attributes such as like_num; reuses the full parse
+        if there already is one.
+        """
+        if 'doc' in self.__dict__:
+            return self.doc
+        return self.nlp.make_doc(self.lower)
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return [token.text for token in self.tokenized]
+
+    @cached_property
+    def noun_terms(self) -> List[str]:
+        """Nouns and proper nouns longer than two characters, in document order."""
+        return [token.text.lower() for token in self.doc
+                if token.pos_ in TERM_POS and len(token.text) > 2]
+
+    @cached_property
+    def term_vectors(self) -> Dict[str, np.ndarray]:
+        """Embedding of every unique noun term, keyed by term."""
+        terms = unique_terms(self.noun_terms)
+        return dict(zip(terms, self.fast_encoder(terms))) if terms else {}
+
+    @cached_property
+    def years(self) -> List[float]:
+        """Every number directly followed by a year term, e.g. '5 years' or 'two years'."""
+        years = []
+        for token in self.tokenized:
+            if token.like_num:
+                next_token = token.nbor() if token.i + 1 < len(token.doc) else None
+                if next_token and next_token.text.lower() in YEAR_TERMS:
+                    value = parse_number(token.text)
+                    if value is not None:
+                        years.append(value)
+        return years
+
+    @cached_property
+    def max_years(self) -> float:
+        return max(self.years) if self.years else 0.0
+
+    @cached_property
+    def keyword_hits(self) -> KeywordHits:
+        """Matches for every dictionary in the keyword index."""
+        return self.keyword_index.search(self.lower)
+
+    @cached_property
+    def skills(self) -> List[str]:
+        return self.keyword_hits.terms('skills')
+
+    @cached_property
+    def embedding(self) -> np.ndarray:
+        """Embedding of the original text."""
+        return self.encoder([self.text])[0]
+
+    @cached_property
+    def skills_embedding(self) -> np.ndarray:
+        """Embedding of the extracted skills joined into one string."""
+        return self.fast_encoder([' '.join(self.skills)])[0]
+
+    @staticmethod
+    def parse_all(contexts: Iterable['DocumentContext'], **pipe_options) -> None:
+        """Parse every context that is not parsed yet with a single nlp.pipe call."""
+        pending = [context for context in contexts if 'doc' not in context.__dict__]
+        if not pending:
+            return
+        nlp = pending[0].nlp
+        for context, doc in zip(pending, nlp.pipe([context.lower for context in pending], **pipe_options)):
+            context.__dict__['doc'] = doc
+
+    @staticmethod
+    def encode_all(contexts: Iterable['DocumentContext'], field: str = 'embedding') -> None:
+        """
+        Compute an embedding field for every context missing it in a single encode call.
+
+        Args:
+            contexts: Contexts sharing the same encoder
+            field: 'embedding' or 'skills_embedding'
+        """
+        source, encoder = ENCODED_FIELDS[field]
+        pending = [context for context in contexts if field not in context.__dict__]
+        if not pending:
+            return
+        embeddings = getattr(pending[0], encoder)([source(context) for context in pending])
+        for context, embedding in zip(pending, embeddings):
+            context.__dict__[field] = embedding
+
+def parse_number(text: str) -> Optional[float]:
+    """
+    Value of a numeric token such as '5', '2.5' or 'two'.
+
+    Returns:
+        The value, or None for tokens like 'first' or '1/2' that are not a plain count
+    """
+    text = text.lower()
+    if text in NUMBER_WORDS:
+        return float(NUMBER_WORDS[text])
+    try:
+        value = float(text.replace(',', ''))
+    except ValueError:
+        return None
+    # float() also accepts 'nan' and 'inf'
+    return value if np.isfinite(value) else None
+
+# Text each embedding field is computed from, and the context encoder that embeds it
+ENCODED_FIELDS = {
+    'embedding': (lambda context: context.text, 'encoder'),
+    'skills_embedding': (lambda context: ' '.join(context.skills), 'fast_encoder'),
+}
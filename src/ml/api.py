@@ -1,12 +1,91 @@
 """
 FastAPI backend for Resume Matcher ML components.
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Literal
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
+import csv
+import io
+import json
+import os
+import threading
+import time
+from .embedding_cache import get_embedding_cache
+from .inference_executor import ExecutorSaturated, InferenceExecutor
+from .job_profiles import JobProfileNotFound
+from .metrics import SlowRequestProfiler, get_metrics
+from .model_registry import get_model_registry
+from .score_cache import get_score_cache
 
-app = FastAPI(title="Resume Matcher ML API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up models in the background while serving, and stop the workers on shutdown."""
+    warm_up = start_warm_up()
+    index_saver = asyncio.get_running_loop().create_task(save_vector_index_periodically())
+    yield
+    if warm_up is not None:
+        warm_up.cancel()
+    index_saver.cancel()
+    save_vector_index()
+    executor.shutdown(wait=False)
+
+app = FastAPI(title="Resume Matcher ML API", lifespan=lifespan)
+
+# Upper bound on (job, resume) pairs scored by a single batch request
+MAX_BATCH_PAIRS = 10000
+
+# Upper bound on records accepted by a single feedback batch request
+MAX_FEEDBACK_BATCH = 10000
+
+# Upper bound on resumes indexed by a single request
+MAX_INDEX_BATCH = 1000
+
+# Seconds between saves of a changed in-memory vector index
+VECTOR_INDEX_SAVE_SECONDS = float(os.environ.get('JOBLY_VECTOR_INDEX_SAVE_SECONDS', 60.0))
+
+# Column order of feedback exports
+FEEDBACK_EXPORT_COLUMNS = ['id', 'job_id', 'resume_id', 'match_score', 'user_rating',
+                           'feedback_text', 'feedback_categories', 'timestamp', 'component_scores']
+
+# Seconds one warm-up attempt may take, and the pause before retrying a failed one
+WARMUP_TIMEOUT = float(os.environ.get('JOBLY_WARMUP_TIMEOUT', 600.0))
+WARMUP_RETRY_SECONDS = float(os.environ.get('JOBLY_WARMUP_RETRY_SECONDS', 30.0))
+
+def _init_worker() -> None:
+    """Warm up a process worker before it takes its first call."""
+    try:
+        _warm_up()
+    except Exception as e:
+        # A raising initializer would break the whole pool; warm_up() reports the error instead
+        print(f"Error warming up inference worker {os.getpid()}: {e}")
+
+# Model calls run here so the event loop stays free for health checks and feedback
+executor = InferenceExecutor.from_env(initializer=_init_worker)
+
+# Served on /metrics; set JOBLY_METRICS=0 to stop recording
+metrics = get_metrics()
+metrics.collect('jobly_inference_in_flight', lambda: executor.stats()['in_flight'],
+                help_text='Model calls running or waiting for a worker')
+metrics.collect('jobly_inference_queued', lambda: executor.stats()['queued'],
+                help_text='Model calls waiting for a worker')
+metrics.collect('jobly_inference_calls_total',
+                lambda: {result: executor.stats()[result] for result in ('completed', 'failed', 'rejected', 'timeouts')},
+                kind='counter', label='result', help_text='Model calls by outcome')
+metrics.collect('jobly_encode_queue_depth',
+                lambda: {name: batcher.stats()['queue_depth'] for name, batcher in get_model_registry().batchers().items()},
+                label='model', help_text='Encode requests waiting for a micro-batch')
+metrics.collect('jobly_cache_hit_ratio',
+                lambda: {'embedding': get_embedding_cache().stats()['hit_ratio'],
+                         'score': get_score_cache().stats()['hit_ratio']},
+                label='cache', help_text='Share of cache lookups that hit')
+
+# Set JOBLY_PROFILE_SLOW_MS to keep sampling profiles of slow requests
+profiler = SlowRequestProfiler.from_env()
 
 # Add CORS middleware
 app.add_middleware(
@@ -20,7 +99,18 @@ app.add_middleware(
 # Request/Response Models
 class MatchRequest(BaseModel):
     resume_text: str
-    job_description: str
+    job_description: Optional[str] = None
+    job_id: Optional[str] = None
+
+class AnalyzeRequest(MatchRequest):
+    weights: Optional[Dict[str, float]] = None
+    # 'scores' for list views, 'standard' adds skill gaps, culture, future readiness and
+    # recommendations, 'full' adds key terms and relevant experience
+    depth: Literal['scores', 'standard', 'full'] = 'full'
+
+class BatchMatchRequest(BaseModel):
+    resume_texts: List[str]
+    job_descriptions: List[str]
 
 class FeedbackRequest(BaseModel):
     job_id: str
@@ -29,46 +119,628 @@ class FeedbackRequest(BaseModel):
     user_rating: int
     feedback_text: Optional[str] = None
     feedback_categories: Optional[Dict[str, float]] = None
+    component_scores: Optional[Dict[str, float]] = None
+
+class FeedbackRecord(FeedbackRequest):
+    timestamp: Optional[str] = None
+
+class FeedbackBatchRequest(BaseModel):
+    records: List[FeedbackRecord]
+
+class JobProfileRequest(BaseModel):
+    job_description: str
+
+class ResumeIndexRequest(BaseModel):
+    # Resume id -> text
+    resumes: Dict[str, str]
+
+class CandidatesRequest(BaseModel):
+    k: int = 50
+    # Resume id -> text; shortlisted resumes with a text get a full analysis
+    resume_texts: Optional[Dict[str, str]] = None
+    depth: Literal['scores', 'standard', 'full'] = 'scores'
+
+class LearnRequest(BaseModel):
+    l2: float = 10.0
+    min_samples: int = 50
+    activate: bool = True
+
+@lru_cache(maxsize=None)
+def get_nlp_analyzer():
+    """Create the shared NLPAnalyzer on first use."""
+    from .nlp_analyzer import NLPAnalyzer
+    return NLPAnalyzer()
+
+@lru_cache(maxsize=None)
+def get_resume_agent():
+    """Create the shared ResumeAnalyzerAgent on first use."""
+    from .resume_analyzer_agent import ResumeAnalyzerAgent
+    return ResumeAnalyzerAgent('api', {'feedback_manager': get_feedback_manager()})
+
+@lru_cache(maxsize=None)
+def get_feedback_manager():
+    """Create the shared FeedbackManager on first use."""
+    from .feedback_manager import FeedbackManager
+    return FeedbackManager()
+
+@lru_cache(maxsize=None)
+def get_candidate_retriever():
+    """
+    Create the shared CandidateRetriever on first use.
+
+    It lives in the API process, so every inference worker sees the same index.
+    Set JOBLY_EMBEDDING_STORE_DIR to keep vectors in memory-mapped stores;
+    otherwise in-memory indexes are saved to JOBLY_VECTOR_INDEX_DIR.
+    """
+    from .vector_index import CandidateRetriever
+    return CandidateRetriever(
+        get_nlp_analyzer().encode,
+        index_dir=os.environ.get('JOBLY_VECTOR_INDEX_DIR') or os.path.join(os.path.dirname(__file__), 'vector_index'),
+        store_dir=os.environ.get('JOBLY_EMBEDDING_STORE_DIR') or None
+    )
+
+# Worker functions live at module level so process pools can pickle them
+def _match_pair(resume_text: str, job_description: Optional[str], job_id: Optional[str]) -> Dict[str, Any]:
+    return get_nlp_analyzer().match_role(resume_text, job_description, job_id=job_id)
+
+def _match_batch(resume_texts: List[str], job_descriptions: List[str]) -> List[Dict[str, Any]]:
+    return get_nlp_analyzer().match_roles_batch(resume_texts, job_descriptions)
+
+def _analyze(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    return get_resume_agent().process(input_data)
+
+# Cache lookups read job profiles and learned weights from SQLite, so they run in a thread too
+def _cached_analysis(input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return get_resume_agent().cached_process(input_data)
+
+def _cached_analysis_events(input_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    return get_resume_agent().cached_events(input_data)
+
+def _analyze_stream(input_data: Dict[str, Any], emit, stop: threading.Event) -> None:
+    # Thread pools only: emit hands each event back to the event loop as soon as it is ready
+    for event in get_resume_agent().iter_process(input_data):
+        if stop.is_set():
+            break
+        emit(event)
+
+def _analyze_events(input_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return list(get_resume_agent().iter_process(input_data))
+
+def _update_job_profile(job_id: str, job_description: str) -> Dict[str, Any]:
+    profile = get_resume_agent().update_job_profile(
+        job_id, job_description, dependency_skills=get_nlp_analyzer().context_skills
+    )
+    return {"job_id": job_id, "skills": profile.skills, "required_years": profile.required_years}
+
+def _encode(texts: List[str]):
+    # Index vectors come from the same model as NLPAnalyzer similarity scores
+    return get_nlp_analyzer().encode(texts)
+
+def _rank_shortlist(job_id: str, shortlist, resume_texts: Dict[str, str], depth: str) -> List[Dict[str, Any]]:
+    from .vector_index import CandidateRetriever
+    return CandidateRetriever.rank_shortlist(get_resume_agent(), {'job_id': job_id}, shortlist, resume_texts, depth)
+
+def _warm_up() -> None:
+    """Load every model the scoring endpoints use and run each once."""
+    agent, analyzer = get_resume_agent(), get_nlp_analyzer()
+    agent.nlp("warm up")
+    analyzer.nlp("warm up")
+    registry = get_model_registry()
+    # A first forward pass initializes lazy kernels and allocator pools
+    for model_name in {agent.model_name, agent.fast_model_name, analyzer.model_name}:
+        registry.encoder(model_name)(["warm up"])
+
+class Readiness:
+    """State of the background warm-up that gates the scoring endpoints."""
+
+    def __init__(self):
+        self.ready = False
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.started: Optional[float] = None
+        self.seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def begin(self) -> None:
+        with self._lock:
+            # The last error is kept until an attempt succeeds
+            self.ready, self.seconds = False, None
+            self.attempts += 1
+            if self.started is None:
+                self.started = time.monotonic()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.seconds = time.monotonic() - self.started
+            self.error = None if error is None else str(error)
+            # Models that failed to load keep the replica out of rotation until a retry succeeds
+            self.ready = error is None
+
+    @property
+    def loading(self) -> bool:
+        """Warm-up has started and not succeeded yet."""
+        with self._lock:
+            return self.started is not None and not self.ready
+
+    def skip(self) -> None:
+        with self._lock:
+            self.ready = True
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            status = {"ready": self.ready, "error": self.error, "attempts": self.attempts,
+                      "warmup_seconds": self.seconds}
+            if not self.ready and self.started is not None:
+                status["loading_seconds"] = time.monotonic() - self.started
+            return status
+
+readiness = Readiness()
+
+def require_ready() -> None:
+    """Reject scoring requests while models are still warming up."""
+    if readiness.loading:
+        error = readiness.error
+        detail = "Models are loading" if error is None else f"Models failed to load: {error}"
+        raise HTTPException(status_code=503, detail=detail, headers={"Retry-After": "5"})
+
+def require_job(request: MatchRequest) -> None:
+    if request.job_description is None and request.job_id is None:
+        raise HTTPException(status_code=400, detail="job_description or job_id is required")
+
+async def record_request(request: Request, call_next):
+    """Time every request by route and profile it if slow-request profiling is on."""
+    sampler = profiler.begin() if profiler is not None else None
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Streaming bodies are still being sent; this measures time to headers
+        duration = time.perf_counter() - started
+        route = getattr(request.scope.get('route'), 'path', 'unmatched')
+        metrics.observe('jobly_request_seconds', duration, method=request.method, route=route, status=str(status))
+        if sampler is not None:
+            path = profiler.end(sampler, duration, f"{request.method} {route}")
+            if path is not None:
+                print(f"Slow request {request.method} {route} took {1000 * duration:.0f} ms, profile: {path}")
+
+# Without metrics or profiling the middleware is not installed at all
+if metrics.enabled or profiler is not None:
+    app.middleware("http")(record_request)
+
+async def run_inference(fn, *args) -> Any:
+    """Run a model call on the inference executor, mapping overload to HTTP errors."""
+    try:
+        return await executor.run(fn, *args)
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e),
+                            headers={"Retry-After": str(e.retry_after)})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Inference timed out")
+
+def start_warm_up() -> Optional[asyncio.Task]:
+    """Load models in the background so the API serves health and feedback requests immediately."""
+    if os.environ.get('JOBLY_WARMUP', '1') in ('0', 'false', 'no'):
+        readiness.skip()
+        return None
+    return asyncio.get_running_loop().create_task(warm_up())
+
+async def run_index(fn, *args) -> Any:
+    """Run a vector index call in a thread; the index lives in this process."""
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+def save_vector_index() -> None:
+    """Save the shared retriever's in-memory indexes if they changed."""
+    if not get_candidate_retriever.cache_info().currsize:
+        return
+    retriever = get_candidate_retriever()
+    if retriever.dirty:
+        try:
+            retriever.save()
+        except Exception as e:
+            print(f"Error saving vector index: {e}")
+
+async def save_vector_index_periodically() -> None:
+    """Save changed indexes every VECTOR_INDEX_SAVE_SECONDS so a restart loses little."""
+    while True:
+        await asyncio.sleep(VECTOR_INDEX_SAVE_SECONDS)
+        await run_index(save_vector_index)
+
+async def warm_up() -> None:
+    """Warm up the models, retrying failed attempts until one succeeds."""
+    # Thread workers share one set of models. Process workers each load their own in
+    # _init_worker before their first call, so none serves a request cold; one call per
+    # worker starts them all and re-raises any load error from the workers that ran it
+    calls = executor.max_workers if executor.kind == 'process' else 1
+    while True:
+        readiness.begin()
+        try:
+            await asyncio.gather(*(executor.run(_warm_up, timeout=WARMUP_TIMEOUT) for _ in range(calls)))
+        except Exception as e:
+            print(f"Error warming up models, retrying in {WARMUP_RETRY_SECONDS:g}s: {e}")
+            readiness.finish(e)
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+        else:
+            readiness.finish()
+            return
 
 @app.post("/match")
 async def match_resume(request: MatchRequest):
-    """Match a resume against a job description."""
+    """Match a resume against a job description or a stored job profile."""
+    require_ready()
+    require_job(request)
     try:
-        # Simple mock response for testing
-        return {
-            "overall_match": 0.85,
-            "skill_match": 0.9,
-            "experience_match": 0.8
-        }
+        return await run_inference(_match_pair, request.resume_text, request.job_description, request.job_id)
+    except HTTPException:
+        raise
+    except JobProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/match/batch")
+async def match_resumes_batch(request: BatchMatchRequest):
+    """Match every resume against every job description in one batch."""
+    require_ready()
+    if not request.resume_texts or not request.job_descriptions:
+        raise HTTPException(status_code=400, detail="resume_texts and job_descriptions must not be empty")
+    if len(request.resume_texts) * len(request.job_descriptions) > MAX_BATCH_PAIRS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_PAIRS} job/resume pairs")
+
+    try:
+        results = await run_inference(_match_batch, request.resume_texts, request.job_descriptions)
+        return {"results": results}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/analyze")
-async def analyze_resume(request: MatchRequest):
-    """Perform detailed resume analysis."""
+async def analyze_resume(request: AnalyzeRequest):
+    """
+    Perform resume analysis down to the requested depth.
+
+    Latency budgets per depth are listed in resume_analyzer_agent.DEPTH_BUDGETS_MS.
+    """
+    require_ready()
+    require_job(request)
+    input_data = _analyze_input(request)
+
+    try:
+        # Re-weighting a pair that was already analysed is arithmetic; skip the inference queue
+        cached = await asyncio.get_running_loop().run_in_executor(None, _cached_analysis, input_data)
+        if cached is not None:
+            return cached
+        return await run_inference(_analyze, input_data)
+    except HTTPException:
+        raise
+    except JobProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze/stream")
+async def analyze_resume_stream(request: AnalyzeRequest):
+    """
+    Perform resume analysis, streaming each part as NDJSON as soon as it is ready.
+
+    The first line carries final_score and the component scores, which only need
+    the cheapest stages; one line per detailed_analysis section follows as it is
+    computed, and a {"event": "done"} line ends the stream. Errors before the
+    first line are returned as HTTP errors like /analyze, later ones as an
+    {"event": "error"} line. A process inference pool cannot stream from its
+    workers, so there every line is sent once the analysis is complete.
+    """
+    require_ready()
+    require_job(request)
+    input_data = _analyze_input(request)
+
+    try:
+        cached = await asyncio.get_running_loop().run_in_executor(None, _cached_analysis_events, input_data)
+    except JobProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if cached is not None:
+        return StreamingResponse(_ndjson_lines(cached), media_type="application/x-ndjson")
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def emit(event: Dict[str, Any]) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    async def analyze() -> None:
+        if executor.kind == 'process':
+            for event in await run_inference(_analyze_events, input_data):
+                events.put_nowait(event)
+        else:
+            await run_inference(_analyze_stream, input_data, emit, stop)
+
+    # None marks the end of the events; it is queued after every emitted event
+    task = asyncio.ensure_future(analyze())
+    task.add_done_callback(lambda _: events.put_nowait(None))
+
     try:
-        # Simple mock response for testing
-        return {
-            "technical_score": 0.8,
-            "experience_score": 0.7,
-            "semantic_score": 0.85,
-            "culture_score": 0.9,
-            "future_score": 0.75,
-            "detailed_analysis": {
-                "skill_gaps": {
-                    "missing_skills": ["Docker", "Kubernetes"],
-                    "additional_skills": ["React", "Node.js"]
-                },
-                "recommendations": {
-                    "technical": ["Learn Docker basics", "Get familiar with Kubernetes"],
-                    "soft_skills": ["Improve communication skills"],
-                    "future_growth": ["Focus on cloud technologies"]
-                }
-            }
-        }
+        first = await events.get()
+        if first is None:
+            task.result()
+    except asyncio.CancelledError:
+        stop.set()
+        raise
+    except HTTPException:
+        raise
+    except JobProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def lines():
+        try:
+            event = first
+            while event is not None:
+                yield json.dumps(event) + "\n"
+                event = await events.get()
+            task.result()
+        except HTTPException as e:
+            yield json.dumps({"event": "error", "status": e.status_code, "detail": e.detail}) + "\n"
+        except Exception as e:
+            yield json.dumps({"event": "error", "status": 500, "detail": str(e)}) + "\n"
+        finally:
+            # Stop the analysis early if the client went away
+            stop.set()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def _analyze_input(request: AnalyzeRequest) -> Dict[str, Any]:
+    input_data = {'resume_text': request.resume_text, 'depth': request.depth}
+    if request.job_description is not None:
+        input_data['job_description'] = request.job_description
+    if request.job_id is not None:
+        input_data['job_id'] = request.job_id
+    if request.weights:
+        input_data['weights'] = request.weights
+    return input_data
+
+@app.put("/jobs/{job_id}/profile")
+async def put_job_profile(job_id: str, request: JobProfileRequest):
+    """Precompute a job's features so matches against it only analyse the resume."""
+    require_ready()
+    try:
+        profile = await run_inference(_update_job_profile, job_id, request.job_description)
+        # Index the job too so /jobs/{job_id}/candidates can shortlist resumes for it
+        vectors = await run_inference(_encode, [request.job_description])
+        await run_index(get_candidate_retriever().upsert_jobs, {job_id: request.job_description}, vectors)
+        return profile
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/jobs/{job_id}/profile")
+def delete_job_profile(job_id: str):
+    """Drop a job's precomputed features, e.g. when the listing is removed."""
+    get_candidate_retriever().remove_job(job_id)
+    if not get_resume_agent().job_profiles.delete(job_id):
+        raise HTTPException(status_code=404, detail=f"No job profile stored for job {job_id}")
+    return {"success": True}
+
+@app.post("/jobs/{job_id}/candidates")
+async def job_candidates(job_id: str, request: CandidatesRequest):
+    """
+    Shortlist the k indexed resumes closest to a job.
+
+    Resumes whose text is sent in resume_texts are then analysed against the
+    job's stored profile, so the full analysis only runs on the shortlist.
+    """
+    require_ready()
+    if request.k < 1:
+        raise HTTPException(status_code=400, detail="k must be positive")
+    try:
+        shortlist = await run_index(get_candidate_retriever().top_resumes_for_job, job_id, request.k)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} is not indexed")
+
+    response = {
+        "job_id": job_id,
+        "candidates": [{"resume_id": resume_id, "similarity": similarity} for resume_id, similarity in shortlist]
+    }
+    if request.resume_texts:
+        try:
+            response["results"] = await run_inference(_rank_shortlist, job_id, shortlist,
+                                                      request.resume_texts, request.depth)
+        except HTTPException:
+            raise
+        except JobProfileNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    return response
+
+@app.put("/resumes/index")
+async def index_resumes(request: ResumeIndexRequest):
+    """Add or update resumes in the vector index used to shortlist candidates."""
+    require_ready()
+    if len(request.resumes) > MAX_INDEX_BATCH:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_INDEX_BATCH} resumes")
+    if not request.resumes:
+        return {"indexed": 0}
+    try:
+        vectors = await run_inference(_encode, list(request.resumes.values()))
+        await run_index(get_candidate_retriever().upsert_resumes, request.resumes, vectors)
+        return {"indexed": len(request.resumes)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/resumes/{resume_id}/index")
+def delete_resume_index(resume_id: str):
+    """Drop a resume from the vector index."""
+    if not get_candidate_retriever().remove_resume(resume_id):
+        raise HTTPException(status_code=404, detail=f"Resume {resume_id} is not indexed")
+    return {"success": True}
+
+@app.get("/resumes/{resume_id}/jobs")
+def resume_jobs(resume_id: str, k: int = 50):
+    """Get the k indexed jobs closest to an indexed resume."""
+    if k < 1:
+        raise HTTPException(status_code=400, detail="k must be positive")
+    try:
+        shortlist = get_candidate_retriever().top_jobs_for_resume(resume_id, k)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Resume {resume_id} is not indexed")
+    return {
+        "resume_id": resume_id,
+        "jobs": [{"job_id": job_id, "similarity": similarity} for job_id, similarity in shortlist]
+    }
+
+# Feedback endpoints are plain functions so FastAPI runs their SQLite work in its threadpool
+@app.post("/feedback")
+def submit_feedback(request: FeedbackRequest):
+    """Record user feedback for a job-resume match."""
+    success = get_feedback_manager().record_feedback(
+        job_id=request.job_id,
+        resume_id=request.resume_id,
+        match_score=request.match_score,
+        user_rating=request.user_rating,
+        feedback_text=request.feedback_text,
+        feedback_categories=request.feedback_categories,
+        component_scores=request.component_scores
+    )
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to record feedback")
+    return {"success": True}
+
+@app.post("/feedback/batch")
+def submit_feedback_batch(request: FeedbackBatchRequest):
+    """Record many feedback entries, e.g. swipe streams or backfills."""
+    if len(request.records) > MAX_FEEDBACK_BATCH:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_FEEDBACK_BATCH} records")
+    # Invalid records, bad timestamps included, fail on their own with a per-record error
+    results = get_feedback_manager().record_feedback_batch(
+        [record.model_dump() if hasattr(record, 'model_dump') else record.dict() for record in request.records]
+    )
+    recorded = sum(1 for result in results if result['success'])
+    return {"recorded": recorded, "failed": len(results) - recorded, "results": results}
+
+@app.get("/feedback/stats")
+def feedback_stats():
+    """Get statistical analysis of feedback data."""
+    return get_feedback_manager().get_feedback_stats()
+
+@app.get("/feedback/history")
+def feedback_history(response: Response,
+                     job_id: Optional[str] = None,
+                     resume_id: Optional[str] = None,
+                     limit: int = 100,
+                     cursor: Optional[str] = None):
+    """
+    Get feedback history, optionally filtered by job or resume.
+
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    try:
+        page = get_feedback_manager().get_feedback_page(
+            job_id=job_id, resume_id=resume_id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page['next_cursor']:
+        response.headers["X-Next-Cursor"] = page['next_cursor']
+    return page['records']
+
+def _ndjson_lines(records):
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+def _csv_lines(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FEEDBACK_EXPORT_COLUMNS, extrasaction='ignore')
+
+    def flush() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writeheader()
+    yield flush()
+    for record in records:
+        writer.writerow(record)
+        yield flush()
+
+@app.get("/feedback/export")
+def feedback_export(format: str = "ndjson", job_id: Optional[str] = None, resume_id: Optional[str] = None):
+    """Stream the full feedback history as NDJSON or CSV."""
+    records = get_feedback_manager().iter_feedback(job_id=job_id, resume_id=resume_id)
+    if format == "ndjson":
+        return StreamingResponse(_ndjson_lines(records), media_type="application/x-ndjson")
+    if format == "csv":
+        return StreamingResponse(_csv_lines(records), media_type="text/csv",
+                                 headers={"Content-Disposition": 'attachment; filename="feedback.csv"'})
+    raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+
+@app.get("/feedback/trends")
+def feedback_trends():
+    """Analyze trends in feedback data over time."""
+    return get_feedback_manager().analyze_feedback_trends()
+
+@app.get("/feedback/suggestions")
+def feedback_suggestions():
+    """Get suggestions for system improvement based on feedback patterns."""
+    return get_feedback_manager().get_improvement_suggestions()
+
+@app.post("/weights/learn")
+def learn_weights(request: LearnRequest):
+    """Refit the analysis weights to feedback and activate them if they fit at least as well."""
+    data = request.model_dump() if hasattr(request, 'model_dump') else request.dict()
+    result = get_resume_agent().learn(data)
+    if result is None:
+        raise HTTPException(status_code=409, detail="Not enough feedback with component scores to learn from")
+    return result
+
+@app.get("/weights")
+def weights():
+    """Get the active analysis weights and recent versions."""
+    agent = get_resume_agent()
+    agent.reload_weights()
+    version, active = agent.active_weights
+    return {
+        "version": version,
+        "weights": active,
+        "history": get_feedback_manager().get_weight_history()
+    }
+
+@app.post("/weights/{version}/activate")
+def activate_weights(version: int):
+    """Activate a stored weight version, e.g. to roll back a refit."""
+    if not get_feedback_manager().activate_weights(version):
+        raise HTTPException(status_code=404, detail=f"Unknown weights version {version}")
+    get_resume_agent().reload_weights()
+    return {"success": True, "version": version}
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Expose metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/ready")
+async def ready(response: Response):
+    """
+    Readiness probe: 200 once a warm-up succeeded, 503 while models load or after they failed to.
+
+    With a process pool every worker also warms itself up before its first call,
+    so a request is never served by a worker that has not loaded the models.
+    """
+    status = readiness.status()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
+
 @app.get("/")
 async def root():
     return {"status": "healthy", "message": "Resume Matcher ML API is running"}
@@ -0,0 +1,3 @@
+"""
+Benchmarks for Resume Matcher ML components.
+"""
@@ -0,0 +1,151 @@
+"""
+Compare a candidate sentence encoder against the fp32 torch baseline on a fixed corpus.
+
+Reports how closely the candidate's cosine scores follow the baseline's, whether
+it ranks resumes for each job the same way, and how fast each one encodes.
+
+Usage:
+    python -m src.ml.benchmarks.encoder_accuracy --backend quantized
+    python -m src.ml.benchmarks.encoder_accuracy --backend onnx
+    python -m src.ml.benchmarks.encoder_accuracy --model all-MiniLM-L6-v2 --texts terms
+"""
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import json
+import time
+import numpy as np
+from ..key_terms import normalize_rows
+from ..model_registry import DEFAULT_TRANSFORMER_MODEL, ENCODER_BACKENDS, ModelRegistry
+
+JOBS = [
+    "Senior backend engineer building Python microservices on AWS with Docker and Kubernetes. "
+    "5+ years of experience with PostgreSQL and Redis required.",
+    "Frontend developer with strong React and TypeScript skills to build accessible, responsive "
+    "web applications. Experience with Next.js is a plus.",
+    "Machine learning engineer to train and deploy NLP models with PyTorch. Familiarity with "
+    "transformers, MLOps and GPU clusters expected.",
+    "Data analyst comfortable with SQL, Excel and Tableau, turning business questions into "
+    "dashboards and reports for stakeholders.",
+    "DevOps engineer owning CI/CD pipelines, Terraform and Ansible, and on-call for production "
+    "infrastructure on Azure.",
+    "Mobile developer shipping Kotlin and Swift apps, with experience in offline sync and "
+    "push notifications.",
+]
+
+RESUMES = [
+    "Backend developer with 6 years of Python, Django and Flask. Built microservices deployed "
+    "with Docker on AWS ECS, tuned PostgreSQL queries and introduced Redis caching.",
+    "Frontend engineer specialised in React, TypeScript and Next.js. Led an accessibility "
+    "overhaul and built a component library used across four products.",
+    "Research engineer who fine-tuned transformer models in PyTorch for text classification and "
+    "named entity recognition, and served them on Kubernetes with GPU autoscaling.",
+    "Business analyst building Tableau dashboards and SQL reports for the sales team; "
+    "automated monthly Excel reporting.",
+    "Site reliability engineer managing Terraform modules, Jenkins and GitHub Actions pipelines, "
+    "and Azure infrastructure for a payments platform.",
+    "Android developer with 4 years of Kotlin, Jetpack Compose and Room, shipping apps with "
+    "offline-first sync to over a million users.",
+    "Full-stack developer using Node.js, Express and MongoDB with a React frontend, deployed "
+    "on Heroku.",
+    "Embedded software engineer writing C and C++ firmware for IoT sensors over BLE.",
+]
+
+TERMS = [
+    "python", "java", "kotlin", "swift", "typescript", "react", "angular", "django", "flask",
+    "docker", "kubernetes", "terraform", "ansible", "aws", "azure", "gcp", "postgresql", "redis",
+    "mongodb", "tableau", "excel", "pytorch", "tensorflow", "transformers", "microservices",
+    "dashboards", "firmware", "pipelines", "accessibility", "notifications",
+]
+
+# Which texts are encoded: full documents for the main model, short terms for the fast one
+TEXT_SETS = ('documents', 'terms')
+
+def cosine_matrix(encode: Callable[[List[str]], np.ndarray], rows: List[str], columns: List[str]) -> np.ndarray:
+    """Cosine similarity of every row text against every column text."""
+    vectors = normalize_rows(encode(rows + columns))
+    return vectors[:len(rows)] @ vectors[len(rows):].T
+
+def throughput(encode: Callable[[List[str]], np.ndarray], texts: List[str], repeats: int) -> float:
+    """Texts encoded per second over a few repeats, after one warm-up call."""
+    encode(texts)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        encode(texts)
+    return repeats * len(texts) / (time.perf_counter() - started)
+
+def compare(baseline: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """Agreement between two score matrices of the same shape."""
+    a, b = baseline.ravel(), candidate.ravel()
+    difference = np.abs(a - b)
+    ranks_a, ranks_b = a.argsort().argsort(), b.argsort().argsort()
+    return {
+        'pearson': float(np.corrcoef(a, b)[0, 1]),
+        'spearman': float(np.corrcoef(ranks_a, ranks_b)[0, 1]),
+        'mean_abs_diff': float(difference.mean()),
+        'max_abs_diff': float(difference.max()),
+        # Share of rows whose best column is unchanged, e.g. the top resume for each job
+        'top1_agreement': float((baseline.argmax(axis=1) == candidate.argmax(axis=1)).mean()),
+    }
+
+def run(backend: str = 'quantized',
+        model_name: Optional[str] = None,
+        baseline_model: str = DEFAULT_TRANSFORMER_MODEL,
+        texts: str = 'documents',
+        repeats: int = 5) -> Dict[str, Any]:
+    """
+    Score the fixed corpus with the baseline and a candidate encoder.
+
+    Args:
+        backend: Candidate backend, one of ENCODER_BACKENDS
+        model_name: Candidate model (default the baseline model)
+        baseline_model: Model run with the torch backend as the reference
+        texts: 'documents' compares jobs against resumes, 'terms' compares skill
+            terms against each other as the cheap paths do
+        repeats: Encode passes timed for throughput
+
+    Returns:
+        Agreement metrics and encode throughput of both encoders
+    """
+    if texts not in TEXT_SETS:
+        raise ValueError(f"Unknown text set: {texts}")
+    model_name = model_name or baseline_model
+    rows, columns = (JOBS, RESUMES) if texts == 'documents' else (TERMS, TERMS)
+
+    # No micro-batching: each encode call is timed on its own
+    registry = ModelRegistry(batch_max_wait_ms=0)
+    baseline_encode = registry.encoder(baseline_model, 'torch')
+    candidate_encode = registry.encoder(model_name, backend)
+
+    baseline = cosine_matrix(baseline_encode, rows, columns)
+    candidate = cosine_matrix(candidate_encode, rows, columns)
+    if texts == 'terms':
+        # A term always matches itself best; compare the best other term instead
+        mask = ~np.eye(len(rows), dtype=bool)
+        metrics = compare(baseline[mask].reshape(len(rows), -1), candidate[mask].reshape(len(rows), -1))
+    else:
+        metrics = compare(baseline, candidate)
+
+    corpus = rows + columns if texts == 'documents' else rows
+    baseline_speed = throughput(baseline_encode, corpus, repeats)
+    candidate_speed = throughput(candidate_encode, corpus, repeats)
+    return {
+        'baseline': {'model': baseline_model, 'backend': 'torch', 'texts_per_second': baseline_speed},
+        'candidate': {'model': model_name, 'backend': backend, 'texts_per_second': candidate_speed},
+        'texts': texts,
+        'pairs': int(baseline.size if texts == 'documents' else len(rows) * (len(rows) - 1)),
+        'speedup': candidate_speed / baseline_speed,
+        **metrics,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--backend', choices=ENCODER_BACKENDS, default='quantized')
+    parser.add_argument('--model', default=None, help='Candidate model (default the baseline model)')
+    parser.add_argument('--baseline-model', default=DEFAULT_TRANSFORMER_MODEL)
+    parser.add_argument('--texts', choices=TEXT_SETS, default='documents')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.backend, args.model, args.baseline_model, args.texts, args.repeats), indent=2))
+
+if __name__ == '__main__':
+    main()
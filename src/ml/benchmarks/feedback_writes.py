@@ -0,0 +1,95 @@
+"""
+Measure sustained FeedbackManager write throughput while dashboard reads run concurrently.
+
+Usage:
+    python -m src.ml.benchmarks.feedback_writes --seconds 10 --writers 4 --readers 4
+"""
+from typing import Any, Dict
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from ..feedback_manager import FeedbackManager
+
+def run(seconds: float = 10.0, writers: int = 4, readers: int = 4, db_path: str = None) -> Dict[str, Any]:
+    """
+    Hammer a fresh feedback database with writers and readers for a fixed time.
+
+    Returns:
+        Writes and reads per second, plus read latency percentiles
+    """
+    tmp_dir = None
+    if db_path is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp_dir.name, 'feedback.db')
+
+    manager = FeedbackManager(db_path, read_pool_size=readers)
+    stop = threading.Event()
+    writes = [0] * writers
+    read_latencies = [[] for _ in range(readers)]
+
+    def writer(slot: int) -> None:
+        rng = random.Random(slot)
+        while not stop.is_set():
+            manager.record_feedback(
+                job_id=f"job-{rng.randrange(1000)}",
+                resume_id=f"resume-{slot}-{writes[slot]}",
+                match_score=rng.random(),
+                user_rating=rng.randint(1, 5),
+                feedback_text="benchmark",
+                feedback_categories={'skills': rng.random(), 'experience': rng.random()}
+            )
+            writes[slot] += 1
+
+    def reader(slot: int) -> None:
+        queries = (manager.get_feedback_stats, manager.analyze_feedback_trends, manager.get_feedback_history)
+        while not stop.is_set():
+            started = time.perf_counter()
+            queries[len(read_latencies[slot]) % len(queries)]()
+            read_latencies[slot].append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    manager.close()
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+    latencies = sorted(latency for slot in read_latencies for latency in slot)
+    def percentile(p: float) -> float:
+        return 1000.0 * latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+
+    return {
+        'seconds': elapsed,
+        'writers': writers,
+        'readers': readers,
+        'writes': sum(writes),
+        'writes_per_second': sum(writes) / elapsed,
+        'reads': len(latencies),
+        'reads_per_second': len(latencies) / elapsed,
+        'read_p50_ms': percentile(0.5),
+        'read_p99_ms': percentile(0.99),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--db-path', default=None, help='Database to use instead of a temporary one')
+    args = parser.parse_args()
+    print(json.dumps(run(args.seconds, args.writers, args.readers, args.db_path), indent=2))
+
+if __name__ == '__main__':
+    main()
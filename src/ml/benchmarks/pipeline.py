@@ -0,0 +1,320 @@
+"""
+Time every stage of the scoring pipeline on a synthetic corpus and compare runs.
+
+Measures the stages of ResumeAnalyzerAgent.process, end-to-end process latency
+at every analysis depth, time to the first streamed event and NLPAnalyzer.match_role
+latency for short, medium and long documents, batch throughput, and peak RSS. Results are written as JSON so
+runs from different commits can be compared.
+
+Usage:
+    python -m src.ml.benchmarks.pipeline --output before.json
+    python -m src.ml.benchmarks.pipeline --output after.json --compare before.json
+    python -m src.ml.benchmarks.pipeline --check-budgets
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from ..analysis_context import DocumentContext
+from ..embedding_cache import EmbeddingCache
+from ..nlp_analyzer import NLPAnalyzer
+from ..resume_analyzer_agent import DEPTH_BUDGETS_MS, DEPTHS, ResumeAnalyzerAgent
+from ..score_cache import ScoreCache
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Sentences per document for each corpus size
+SIZES = {'short': 4, 'medium': 12, 'long': 40}
+
+BATCH_SIZES = (1, 8, 32)
+
+JOB_TEMPLATES = [
+    "We are hiring a {role} to build {product} with {skill} and {skill}.",
+    "You will need {years} years of experience with {skill} and {skill}.",
+    "Experience with {skill}, {skill} or {skill} is a plus.",
+    "The team values people who {trait} and {trait}.",
+    "You will {trait} while owning {product} end to end.",
+    "Our stack includes {skill}, {skill} and {skill} running on {skill}.",
+]
+
+RESUME_TEMPLATES = [
+    "{role} with {years} years of experience building {product} in {skill}.",
+    "Built and maintained {product} using {skill} and {skill}, deployed with {skill}.",
+    "Known to {trait} and {trait} across teams.",
+    "Led a migration of {product} from {skill} to {skill}, cutting latency by {number} percent.",
+    "Completed certifications in {skill} and {trait} through continuous learning.",
+    "Mentored {number} engineers and introduced {skill} for {product}.",
+]
+
+ROLES = ['backend engineer', 'frontend developer', 'data scientist', 'devops engineer',
+         'machine learning engineer', 'full-stack developer']
+PRODUCTS = ['payment services', 'a recommendation engine', 'internal dashboards', 'mobile apps',
+            'data pipelines', 'a search platform']
+TRAITS = ['collaborate', 'mentor', 'innovate', 'adapt quickly', 'take ownership', 'communicate clearly',
+          'explore new tools', 'lead projects']
+
+def generate_documents(agent: ResumeAnalyzerAgent, size: str, count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Generate reproducible (job description, resume) pairs.
+
+    Args:
+        agent: Agent whose skill dictionary supplies the vocabulary
+        size: One of SIZES
+        count: Number of pairs
+        seed: Random seed
+    """
+    rng = random.Random(f"{seed}-{size}")
+    skills = [skill for group in agent.common_skills.values() for skill in group]
+
+    def fill(template: str) -> str:
+        # Each placeholder gets its own draw, so repeated {skill}s differ
+        parts = template.split('{')
+        text = parts[0]
+        for part in parts[1:]:
+            name, rest = part.split('}', 1)
+            text += str({
+                'role': lambda: rng.choice(ROLES),
+                'product': lambda: rng.choice(PRODUCTS),
+                'skill': lambda: rng.choice(skills),
+                'trait': lambda: rng.choice(TRAITS),
+                'years': lambda: rng.randint(1, 10),
+                'number': lambda: rng.randint(2, 60),
+            }[name]()) + rest
+        return text
+
+    def sentence(templates: List[str]) -> str:
+        text = fill(rng.choice(templates))
+        return text[0].upper() + text[1:]
+
+    def document(templates: List[str]) -> str:
+        return ' '.join(sentence(templates) for _ in range(SIZES[size]))
+
+    return [(document(JOB_TEMPLATES), document(RESUME_TEMPLATES)) for _ in range(count)]
+
+# Stages of ResumeAnalyzerAgent._analyze_pair. Parsing and keyword search
+# are forced up front so their cost is not charged to the first stage that needs them.
+STAGES: List[Tuple[str, Callable[[ResumeAnalyzerAgent, DocumentContext, DocumentContext, Dict], Any]]] = [
+    ('parse', lambda agent, job, resume, state: DocumentContext.parse_all([job, resume])),
+    ('keywords', lambda agent, job, resume, state: (job.keyword_hits, resume.keyword_hits)),
+    ('embeddings', lambda agent, job, resume, state: DocumentContext.encode_all([job, resume])),
+    ('technical', lambda agent, job, resume, state: agent._analyze_technical_skills(job, resume)),
+    ('experience', lambda agent, job, resume, state: agent._analyze_experience(job, resume)),
+    ('culture_future', lambda agent, job, resume, state: state.update(
+        culture_score=agent._analyze_culture_fit(job, resume),
+        future_score=agent._analyze_future_readiness(resume),
+        culture_analysis=agent._detailed_culture_analysis(resume),
+        future_analysis=agent._detailed_future_analysis(resume)
+    )),
+    ('skill_gaps', lambda agent, job, resume, state: state.update(
+        skill_gaps=agent._identify_skill_gaps(job, resume)
+    )),
+    ('relevant_experience', lambda agent, job, resume, state: agent._detailed_experience_analysis(job, resume)),
+    ('key_terms', lambda agent, job, resume, state: agent._analyze_key_terms(job, resume)),
+    ('recommendations', lambda agent, job, resume, state: agent._generate_recommendations(
+        state['skill_gaps'], state['culture_analysis'], state['future_analysis']
+    )),
+]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Mean and percentiles of a list of durations in seconds, in milliseconds."""
+    ordered = sorted(samples)
+    def percentile(p: float) -> float:
+        return 1000.0 * ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+    return {
+        'mean_ms': 1000.0 * sum(ordered) / len(ordered),
+        'p50_ms': percentile(0.5),
+        'p95_ms': percentile(0.95),
+    }
+
+def timed(function: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(pairs: int = 20, warmup: int = 2, seed: int = 0, cached: bool = False) -> Dict[str, Any]:
+    """
+    Benchmark the pipeline on every corpus size.
+
+    Args:
+        pairs: Timed (job, resume) pairs per size
+        warmup: Untimed pairs run first to load models and lazy kernels
+        seed: Corpus seed
+        cached: Keep the embedding and score caches between pairs; by default
+            every pair is analysed from scratch
+
+    Returns:
+        Stage, end-to-end and throughput timings plus run metadata
+    """
+    # Zero-sized caches make every pair a cold analysis without changing the code path
+    embedding_cache = EmbeddingCache() if cached else EmbeddingCache(max_bytes=0)
+    score_cache = ScoreCache() if cached else ScoreCache(max_entries=0)
+    agent = ResumeAnalyzerAgent('benchmark', {
+        'embedding_cache': embedding_cache, 'score_cache': score_cache, 'weights_refresh_seconds': float('inf')
+    })
+    analyzer = NLPAnalyzer(embedding_cache=embedding_cache, model_registry=agent.model_registry)
+
+    for job_text, resume_text in generate_documents(agent, 'short', warmup, seed + 1):
+        agent.process({'job_description': job_text, 'resume_text': resume_text})
+        analyzer.match_role(resume_text, job_text)
+
+    results: Dict[str, Any] = {'sizes': {}}
+    for size in SIZES:
+        documents = generate_documents(agent, size, pairs, seed)
+        stage_samples: Dict[str, List[float]] = {name: [] for name, _ in STAGES}
+        process_samples: Dict[str, List[float]] = {depth: [] for depth in DEPTHS}
+        first_event_samples = []
+        match_samples = []
+
+        for job_text, resume_text in documents:
+            job, resume = agent.create_context(job_text), agent.create_context(resume_text)
+            state: Dict[str, Any] = {}
+            for name, stage in STAGES:
+                stage_samples[name].append(timed(lambda: stage(agent, job, resume, state)))
+
+            for depth in DEPTHS:
+                process_samples[depth].append(timed(
+                    lambda: agent.process({'job_description': job_text, 'resume_text': resume_text, 'depth': depth})
+                ))
+            # Scores event of a full analysis, as streamed by /analyze/stream
+            first_event_samples.append(timed(
+                lambda: next(agent.iter_process({'job_description': job_text, 'resume_text': resume_text}))
+            ))
+            match_samples.append(timed(lambda: analyzer.match_role(resume_text, job_text)))
+
+        results['sizes'][size] = {
+            'characters': sum(len(job) + len(resume) for job, resume in documents) // (2 * len(documents)),
+            'stages': {name: summarize(samples) for name, samples in stage_samples.items()},
+            'process': {depth: summarize(samples) for depth, samples in process_samples.items()},
+            'first_event': summarize(first_event_samples),
+            'match_role': summarize(match_samples),
+        }
+
+    # Batch throughput on medium documents
+    documents = generate_documents(agent, 'medium', max(BATCH_SIZES), seed + 2)
+    throughput = {}
+    for batch_size in BATCH_SIZES:
+        jobs = [job for job, _ in documents[:batch_size]]
+        resumes = [resume for _, resume in documents[:batch_size]]
+        encode = timed(lambda: agent._encode(resumes))
+        match = timed(lambda: analyzer.match_roles_batch(resumes, jobs[:1]))
+        throughput[str(batch_size)] = {
+            'encode_texts_per_second': batch_size / encode,
+            'match_roles_batch_pairs_per_second': batch_size / match,
+        }
+    results['throughput'] = throughput
+
+    # Budgets are defined for uncached medium-length pairs
+    results['budgets'] = {
+        depth: {
+            'budget_ms': budget,
+            'p95_ms': results['sizes']['medium']['process'][depth]['p95_ms'],
+            'ok': results['sizes']['medium']['process'][depth]['p95_ms'] <= budget,
+        }
+        for depth, budget in DEPTH_BUDGETS_MS.items()
+    }
+
+    results['peak_rss_mb'] = peak_rss_mb()
+    results['meta'] = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'model': agent.model_key,
+        'pairs': pairs,
+        'seed': seed,
+        'cached': cached,
+    }
+    return results
+
+def flatten(results: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    """Flatten nested numeric results into 'a.b.c' keys."""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Find metrics that got worse by more than a relative threshold.
+
+    Latencies and memory regress when they grow; throughputs when they shrink.
+
+    Returns:
+        One entry per regressed metric, worst first
+    """
+    before, after = flatten(baseline), flatten(current)
+    regressions = []
+    for name, old in before.items():
+        new = after.get(name)
+        if (new is None or old <= 0 or name.startswith(('meta.', 'budgets.'))
+                or name.endswith('.characters')):
+            continue
+        change = (new - old) / old
+        if name.endswith('per_second'):
+            change = -change
+        if change > threshold:
+            regressions.append({'metric': name, 'before': old, 'after': new, 'change': change})
+    return sorted(regressions, key=lambda item: item['change'], reverse=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pairs', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cached', action='store_true', help='Keep embedding and score caches between pairs')
+    parser.add_argument('--output', default=None, help='Write results to this JSON file')
+    parser.add_argument('--compare', default=None, help='Previous results to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative slowdown reported as a regression')
+    parser.add_argument('--check-budgets', action='store_true',
+                        help='Fail if an analysis depth misses its latency budget')
+    args = parser.parse_args()
+
+    results = run(args.pairs, args.warmup, args.seed, args.cached)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    failed = False
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold)
+        print(json.dumps({'regressions': regressions}, indent=2))
+        failed = bool(regressions)
+    if args.check_budgets:
+        over = {depth: budget for depth, budget in results['budgets'].items() if not budget['ok']}
+        print(json.dumps({'over_budget': over}, indent=2))
+        failed = failed or bool(over)
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
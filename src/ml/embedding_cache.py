@@ -0,0 +1,192 @@
+"""
+Embedding Cache for Resume Matcher.
+Content-addressed cache for sentence embeddings shared by the NLP components.
+"""
+from typing import Callable, Dict, Any, List, Optional, Sequence
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+import unicodedata
+from pathlib import Path
+import numpy as np
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+class EmbeddingCache:
+    def __init__(self,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 disk_dir: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Byte budget for the in-memory LRU tier
+            disk_dir: Optional directory for the persistent on-disk tier
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so trivially different inputs share a cache entry."""
+        return ' '.join(unicodedata.normalize('NFC', text).split())
+
+    @classmethod
+    def make_key(cls, text: str, model_name: str) -> str:
+        """Build the content address for a text encoded by a given model."""
+        payload = f"{model_name}\0{cls.normalize(text)}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Look up a vector by key, promoting disk hits into memory."""
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return vector
+
+        vector = self._read_disk(key)
+        with self._lock:
+            if vector is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['disk_hits'] += 1
+            self._insert(key, vector)
+        return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Store a vector in memory and, if configured, on disk."""
+        vector = np.asarray(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._insert(key, vector)
+        self._write_disk(key, vector)
+
+    def encode(self,
+               texts: Sequence[str],
+               encoder: Callable[[List[str]], np.ndarray],
+               model_name: str) -> np.ndarray:
+        """
+        Encode texts, only running the encoder for texts not already cached.
+
+        Args:
+            texts: Texts to encode
+            encoder: Callable that encodes a list of texts into a 2D array
+            model_name: Name of the model behind the encoder
+
+        Returns:
+            Array of shape (len(texts), dim) in the order of the input
+        """
+        keys = [self.make_key(text, model_name) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        pending: Dict[str, str] = {}
+
+        for key, text in zip(keys, texts):
+            if key in vectors or key in pending:
+                continue
+            cached = self.get(key)
+            if cached is None:
+                pending[key] = self.normalize(text)
+            else:
+                vectors[key] = cached
+
+        if pending:
+            encoded = np.asarray(encoder(list(pending.values())), dtype=np.float32)
+            for key, vector in zip(pending.keys(), encoded):
+                self.put(key, vector)
+                vectors[key] = vector
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and memory usage."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drop the in-memory tier and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def _insert(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the LRU tier and evict down to the byte budget. Caller holds the lock."""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        if vector.nbytes > self.max_bytes:
+            return
+
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self._stats['evictions'] += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.npy"
+
+    def _read_disk(self, key: str) -> Optional[np.ndarray]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            vector = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        vector.setflags(write=False)
+        return vector
+
+    def _write_disk(self, key: str, vector: np.ndarray) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        if path.exists():
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, vector, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing embedding cache entry: {e}")
+
+_shared_cache: Optional[EmbeddingCache] = None
+_shared_lock = threading.Lock()
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Get the process-wide embedding cache.
+
+    The byte budget and disk tier are configured with the
+    JOBLY_EMBEDDING_CACHE_MB and JOBLY_EMBEDDING_CACHE_DIR environment variables.
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            max_mb = float(os.environ.get('JOBLY_EMBEDDING_CACHE_MB', DEFAULT_MAX_BYTES / (1024 * 1024)))
+            _shared_cache = EmbeddingCache(
+                max_bytes=int(max_mb * 1024 * 1024),
+                disk_dir=os.environ.get('JOBLY_EMBEDDING_CACHE_DIR') or None
+            )
+        return _shared_cache
@@ -0,0 +1,356 @@
+"""
+Embedding Store for Resume Matcher.
+Append-only, memory-mapped float16/int8 vectors that worker processes share through the page cache.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import json
+import os
+import threading
+import time
+from pathlib import Path
+import numpy as np
+from .key_terms import normalize_rows
+
+DTYPES = ('float16', 'int8')
+
+class EmbeddingStore:
+    """
+    Directory of fixed-size vector rows plus an id log.
+
+    Rows are only ever appended; replacing or removing an id marks its old
+    row dead until compact() rewrites the files. Vectors are normalized on the
+    way in, so scores are cosine similarities. At 768 dimensions a million
+    vectors take about 1.5 GB as float16 or 0.8 GB as int8, mapped once and
+    shared by every process that opens the store.
+
+    One process writes; any number of processes may open the store read-only
+    and pick up new rows with refresh().
+    """
+
+    def __init__(self,
+                 path: str,
+                 dim: Optional[int] = None,
+                 dtype: str = 'float16',
+                 readonly: bool = False,
+                 refresh_interval: float = 1.0):
+        """
+        Open or create a store.
+
+        Args:
+            path: Directory holding the store
+            dim: Vector dimension, inferred from the first added vector if omitted
+            dtype: 'float16', or 'int8' with a per-row scale; ignored for existing stores
+            readonly: Open without write access, e.g. in serving workers
+            refresh_interval: Seconds between automatic checks for rows written by
+                other processes; 0 or less disables them
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype: {dtype}")
+
+        self.path = Path(path)
+        self.readonly = readonly
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.RLock()
+        self._meta_path = self.path / 'meta.json'
+        if self._meta_path.exists():
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+        elif readonly:
+            raise FileNotFoundError(f"No embedding store at {path}")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            meta = {'dim': dim, 'dtype': dtype, 'generation': 0}
+            self._write_meta(meta)
+
+        self.dim: Optional[int] = meta['dim']
+        self.dtype: str = meta['dtype']
+        self._open(meta['generation'])
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._row_of
+
+    @property
+    def row_count(self) -> int:
+        """Rows in the file, including dead ones."""
+        return self._rows
+
+    def ids(self) -> List[str]:
+        """Ids of the live vectors."""
+        with self._lock:
+            return list(self._row_of)
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        """Get the stored (normalized) vector for an id as float32."""
+        self._maybe_refresh()
+        with self._lock:
+            row = self._row_of.get(item_id)
+            return None if row is None else self._decode(np.array([row]))[0]
+
+    def get_many(self, item_ids: Iterable[str]) -> np.ndarray:
+        """
+        Get several vectors as one float32 array.
+
+        Raises:
+            KeyError: If an id is not stored
+        """
+        self._maybe_refresh()
+        with self._lock:
+            rows = np.array([self._row_of[item_id] for item_id in item_ids], dtype=np.int64)
+            return self._decode(rows)
+
+    def add(self, item_id: str, vector: np.ndarray) -> None:
+        """Add or replace a single vector."""
+        self.add_many([item_id], np.asarray(vector)[None, :])
+
+    def add_many(self, item_ids: Iterable[str], vectors: np.ndarray) -> None:
+        """Append vectors; ids already present now point at their new row."""
+        item_ids = list(item_ids)
+        vectors = normalize_rows(np.atleast_2d(vectors))
+        if len(item_ids) != len(vectors):
+            raise ValueError("item_ids and vectors must have the same length")
+        if not item_ids:
+            return
+        if any('\t' in item_id or '\n' in item_id for item_id in item_ids):
+            raise ValueError("item_ids must not contain tabs or newlines")
+
+        with self._lock:
+            self._check_writable()
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._write_meta({'dim': self.dim, 'dtype': self.dtype, 'generation': self._generation})
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+            start = self._rows
+            with open(self._vectors_path(self._generation), 'ab') as f:
+                # Drop rows of an earlier append that died before its log entry
+                f.truncate(start * self._row_dtype().itemsize)
+                f.write(self._encode(vectors).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            # The id log is the commit point: readers only trust rows it references
+            self._append_log([f"+{start + offset}\t{item_id}\n" for offset, item_id in enumerate(item_ids)])
+            self._refresh_locked()
+
+    def remove(self, item_id: str) -> bool:
+        """Remove a vector by id. Returns False if the id was not present."""
+        with self._lock:
+            self._check_writable()
+            if item_id not in self._row_of:
+                return False
+            self._append_log([f"-\t{item_id}\n"])
+            self._refresh_locked()
+            return True
+
+    def search(self, vector: np.ndarray, k: int = 10,
+               exclude: Optional[Iterable[str]] = None,
+               chunk_size: int = 65536) -> List[Tuple[str, float]]:
+        """
+        Find the k most similar live vectors by exact scan.
+
+        Rows are decoded chunk by chunk, so the scan needs no more than
+        chunk_size float32 rows of extra memory.
+
+        Returns:
+            List of (id, cosine similarity) pairs, best first
+        """
+        self._maybe_refresh()
+        query = normalize_rows(np.atleast_2d(vector))[0]
+        with self._lock:
+            alive = self._alive.copy()
+            for item_id in exclude or ():
+                row = self._row_of.get(item_id)
+                if row is not None:
+                    alive[row] = False
+
+            best_rows = np.zeros(0, dtype=np.int64)
+            best_scores = np.zeros(0, dtype=np.float32)
+            for start in range(0, self._rows, chunk_size):
+                rows = np.flatnonzero(alive[start:start + chunk_size]) + start
+                if not len(rows):
+                    continue
+                scores = self._decode(rows) @ query
+                best_rows = np.concatenate([best_rows, rows])
+                best_scores = np.concatenate([best_scores, scores])
+                if len(best_rows) > k:
+                    top = np.argpartition(-best_scores, k - 1)[:k]
+                    best_rows, best_scores = best_rows[top], best_scores[top]
+
+            order = np.argsort(-best_scores)[:k]
+            return [(self._id_of[int(best_rows[i])], float(best_scores[i])) for i in order]
+
+    def iter_vectors(self, chunk_size: int = 65536) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """Yield (ids, float32 vectors) chunks of the live rows, e.g. to build an index."""
+        with self._lock:
+            live = np.flatnonzero(self._alive)
+            id_of = dict(self._id_of)
+        for start in range(0, len(live), chunk_size):
+            rows = live[start:start + chunk_size]
+            with self._lock:
+                vectors = self._decode(rows)
+            yield [id_of[int(row)] for row in rows], vectors
+
+    def refresh(self) -> None:
+        """Pick up rows and removals written by another process, or a compaction."""
+        with self._lock:
+            self._refresh_locked()
+
+    def save(self) -> None:
+        """Rows are durable as soon as they are added; kept for VectorIndex compatibility."""
+
+    def compact(self) -> int:
+        """
+        Rewrite the store without dead rows.
+
+        Readers that still map the old files keep working and switch to the
+        compacted files on their next refresh.
+
+        Returns:
+            Number of rows reclaimed
+        """
+        with self._lock:
+            self._check_writable()
+            self._refresh_locked()
+            live = np.flatnonzero(self._alive)
+            reclaimed = self._rows - len(live)
+            if not reclaimed:
+                return 0
+
+            generation = self._generation + 1
+            with open(self._vectors_path(generation), 'wb') as f:
+                for start in range(0, len(live), 65536):
+                    f.write(np.asarray(self._mmap[live[start:start + 65536]]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self._log_path(generation), 'w') as f:
+                f.writelines(f"+{new_row}\t{self._id_of[int(row)]}\n" for new_row, row in enumerate(live))
+                f.flush()
+                os.fsync(f.fileno())
+
+            old_generation = self._generation
+            self._write_meta({'dim': self.dim, 'dtype': self.dtype, 'generation': generation})
+            self._open(generation)
+            for old_path in (self._vectors_path(old_generation), self._log_path(old_generation)):
+                try:
+                    old_path.unlink()
+                except OSError as e:
+                    print(f"Error removing compacted embedding file: {e}")
+            return reclaimed
+
+    def _open(self, generation: int) -> None:
+        """Start reading a generation of the files from scratch."""
+        self._generation = generation
+        self._mmap: Optional[np.memmap] = None
+        self._rows = 0
+        self._log_offset = 0
+        self._row_of: Dict[str, int] = {}
+        self._id_of: Dict[int, str] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._refreshed = 0.0
+        self._refresh_locked()
+
+    def _refresh_locked(self) -> None:
+        self._refreshed = time.monotonic()
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        self.dim = meta['dim']
+        if meta['generation'] != self._generation:
+            self._open(meta['generation'])
+            return
+
+        log_path = self._log_path(self._generation)
+        if not log_path.exists():
+            return
+        with open(log_path, 'rb') as f:
+            f.seek(self._log_offset)
+            data = f.read()
+        # A half-written last line is picked up on the next refresh
+        complete = data[:data.rfind(b'\n') + 1]
+        self._log_offset += len(complete)
+
+        max_row = self._rows - 1
+        changes = []
+        for line in complete.decode('utf-8').splitlines():
+            marker, item_id = line.split('\t', 1)
+            row = int(marker[1:]) if marker[0] == '+' else None
+            changes.append((item_id, row))
+            if row is not None:
+                max_row = max(max_row, row)
+
+        if max_row >= self._rows:
+            self._remap(max_row + 1)
+        for item_id, row in changes:
+            previous = self._row_of.pop(item_id, None)
+            if previous is not None:
+                self._alive[previous] = False
+                del self._id_of[previous]
+            if row is not None:
+                self._row_of[item_id] = row
+                self._id_of[row] = item_id
+                self._alive[row] = True
+
+    def _remap(self, rows: int) -> None:
+        self._mmap = np.memmap(self._vectors_path(self._generation), dtype=self._row_dtype(),
+                               mode='r', shape=(rows,))
+        alive = np.zeros(rows, dtype=bool)
+        alive[:self._rows] = self._alive
+        self._alive = alive
+        self._rows = rows
+
+    def _maybe_refresh(self) -> None:
+        if self.refresh_interval > 0 and time.monotonic() - self._refreshed > self.refresh_interval:
+            self.refresh()
+
+    def _row_dtype(self) -> np.dtype:
+        if self.dtype == 'int8':
+            return np.dtype([('scale', '<f4'), ('vector', 'i1', (self.dim,))])
+        return np.dtype([('vector', '<f2', (self.dim,))])
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        encoded = np.zeros(len(vectors), dtype=self._row_dtype())
+        if self.dtype == 'int8':
+            # Symmetric per-row scale keeps the largest component exact
+            scale = np.abs(vectors).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            encoded['scale'] = scale
+            encoded['vector'] = np.round(vectors / scale[:, None]).astype(np.int8)
+        else:
+            encoded['vector'] = vectors.astype(np.float16)
+        return encoded
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        if not len(rows):
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        records = self._mmap[rows]
+        vectors = records['vector'].astype(np.float32)
+        if self.dtype == 'int8':
+            vectors *= records['scale'][:, None]
+        return vectors
+
+    def _append_log(self, lines: List[str]) -> None:
+        with open(self._log_path(self._generation), 'a', encoding='utf-8') as f:
+            # A half-written line from an interrupted append would corrupt the next entry
+            f.truncate(self._log_offset)
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_meta(self, meta: Dict) -> None:
+        tmp_path = self._meta_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _check_writable(self) -> None:
+        if self.readonly:
+            raise PermissionError("EmbeddingStore was opened read-only")
+
+    def _vectors_path(self, generation: int) -> Path:
+        return self.path / f"vectors.{generation}.bin"
+
+    def _log_path(self, generation: int) -> Path:
+        return self.path / f"ids.{generation}.log"
@@ -2,27 +2,260 @@
 Feedback Manager for Resume Matcher.
 Handles collection, storage, and analysis of user feedback to improve matching results.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
+from contextlib import contextmanager
+import base64
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+import queue
 import sqlite3
+import threading
 from pathlib import Path
+from .metrics import Metrics, get_metrics
+
+# Applied to every pooled connection
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA busy_timeout = 5000',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -16000',
+    'PRAGMA mmap_size = 268435456',
+)
+
+# Bumped whenever a schema migration must run on existing databases
+SCHEMA_VERSION = 4
+
+# How feedback timestamps are stored; CURRENT_TIMESTAMP uses the same UTC format,
+# so stored values sort chronologically as text
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Rollup tables kept in sync with feedback and feedback_categories by triggers,
+# so dashboard statistics never scan the base tables
+ROLLUP_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS feedback_rollup (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        feedback_count INTEGER NOT NULL DEFAULT 0,
+        rating_count INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0,
+        score_diff_count INTEGER NOT NULL DEFAULT 0,
+        score_diff_sum REAL NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS feedback_monthly_rollup (
+        month TEXT PRIMARY KEY,
+        feedback_count INTEGER NOT NULL DEFAULT 0,
+        rating_count INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS feedback_category_rollup (
+        category TEXT PRIMARY KEY,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        score_count INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0
+    )
+    ''',
+    "INSERT OR IGNORE INTO feedback_rollup (id) VALUES (1)",
+)
+
+def _feedback_rollup_sql(row: str, sign: str) -> str:
+    """Statements adding (sign '+') or removing (sign '-') one feedback row from the rollups."""
+    return f'''
+        UPDATE feedback_rollup SET
+            feedback_count = feedback_count {sign} 1,
+            rating_count = rating_count {sign} ({row}.user_rating IS NOT NULL),
+            rating_sum = rating_sum {sign} IFNULL({row}.user_rating, 0),
+            score_diff_count = score_diff_count {sign} ({row}.match_score IS NOT NULL AND {row}.user_rating IS NOT NULL),
+            score_diff_sum = score_diff_sum {sign} IFNULL(ABS({row}.match_score - {row}.user_rating / 5.0), 0)
+        WHERE id = 1;
+        INSERT INTO feedback_monthly_rollup (month, feedback_count, rating_count, rating_sum)
+        SELECT strftime('%Y-%m', {row}.timestamp), {sign}1, {sign}({row}.user_rating IS NOT NULL),
+               {sign}IFNULL({row}.user_rating, 0)
+        WHERE strftime('%Y-%m', {row}.timestamp) IS NOT NULL
+        ON CONFLICT(month) DO UPDATE SET
+            feedback_count = feedback_count + excluded.feedback_count,
+            rating_count = rating_count + excluded.rating_count,
+            rating_sum = rating_sum + excluded.rating_sum;
+    '''
+
+def _category_rollup_sql(row: str, sign: str) -> str:
+    """Statements adding (sign '+') or removing (sign '-') one category row from the rollups."""
+    return f'''
+        INSERT INTO feedback_category_rollup (category, row_count, score_count, score_sum)
+        SELECT {row}.category, {sign}1, {sign}({row}.score IS NOT NULL), {sign}IFNULL({row}.score, 0)
+        WHERE {row}.category IS NOT NULL
+        ON CONFLICT(category) DO UPDATE SET
+            row_count = row_count + excluded.row_count,
+            score_count = score_count + excluded.score_count,
+            score_sum = score_sum + excluded.score_sum;
+    '''
+
+# Trigger bodies are upserts: an INSERT OR IGNORE inside a trigger takes the conflict
+# policy of the statement that fired it, so it fails under the feedback upsert
+ROLLUP_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS feedback_rollup_insert AFTER INSERT ON feedback BEGIN "
+    f"{_feedback_rollup_sql('NEW', '+')} END",
+    f"CREATE TRIGGER IF NOT EXISTS feedback_rollup_delete AFTER DELETE ON feedback BEGIN "
+    f"{_feedback_rollup_sql('OLD', '-')} END",
+    f"CREATE TRIGGER IF NOT EXISTS feedback_rollup_update AFTER UPDATE ON feedback BEGIN "
+    f"{_feedback_rollup_sql('OLD', '-')} {_feedback_rollup_sql('NEW', '+')} END",
+    f"CREATE TRIGGER IF NOT EXISTS category_rollup_insert AFTER INSERT ON feedback_categories BEGIN "
+    f"{_category_rollup_sql('NEW', '+')} END",
+    f"CREATE TRIGGER IF NOT EXISTS category_rollup_delete AFTER DELETE ON feedback_categories BEGIN "
+    f"{_category_rollup_sql('OLD', '-')} END",
+    f"CREATE TRIGGER IF NOT EXISTS category_rollup_update AFTER UPDATE ON feedback_categories BEGIN "
+    f"{_category_rollup_sql('OLD', '-')} {_category_rollup_sql('NEW', '+')} END",
+)
+
+ROLLUP_TRIGGER_NAMES = (
+    'feedback_rollup_insert', 'feedback_rollup_delete', 'feedback_rollup_update',
+    'category_rollup_insert', 'category_rollup_delete', 'category_rollup_update',
+)
+
+# Versioned scoring weights fitted by weight_learning.py; at most one version is active
+WEIGHTS_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS model_weights (
+        version INTEGER PRIMARY KEY AUTOINCREMENT,
+        weights TEXT NOT NULL,
+        metrics TEXT,
+        active INTEGER NOT NULL DEFAULT 0,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_model_weights_active ON model_weights(active)',
+)
+
+# Output of the offline theme miner (see feedback_themes.py)
+THEME_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS feedback_themes (
+        theme_id INTEGER PRIMARY KEY,
+        label TEXT,
+        size INTEGER NOT NULL DEFAULT 0,
+        centroid BLOB,
+        snippets TEXT,
+        terms TEXT,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS feedback_theme_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        model_name TEXT,
+        last_timestamp TEXT,
+        last_id INTEGER
+    )
+    ''',
+)
+
+FEEDBACK_INDEXES = (
+    # job_id lookups are served by the UNIQUE(job_id, resume_id) index
+    'CREATE INDEX IF NOT EXISTS idx_feedback_resume_id ON feedback(resume_id)',
+    'CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback(timestamp)',
+    'CREATE INDEX IF NOT EXISTS idx_feedback_categories_feedback_id ON feedback_categories(feedback_id)',
+    'CREATE INDEX IF NOT EXISTS idx_feedback_categories_category ON feedback_categories(category)',
+)
+
+def normalize_timestamp(value: str) -> str:
+    """
+    Convert an ISO 8601 date or date-time to the stored UTC format.
+
+    Args:
+        value: e.g. '2024-01-15', '2024-01-15 10:00:00' or '2024-01-15T10:00:00+02:00';
+            values without an offset are taken as UTC
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 date or date-time
+    """
+    try:
+        # Python before 3.11 does not accept a 'Z' suffix
+        parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Invalid timestamp {value!r}, expected ISO 8601 such as '2024-01-15 10:00:00'")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime(TIMESTAMP_FORMAT)
 
 class FeedbackManager:
-    def __init__(self, db_path: Optional[str] = None):
-        """Initialize FeedbackManager with database connection."""
+    def __init__(self,
+                 db_path: Optional[str] = None,
+                 read_pool_size: int = 4,
+                 metrics: Optional[Metrics] = None):
+        """
+        Initialize FeedbackManager with a pool of database connections.
+
+        One writer connection serializes all writes; reads are served by a pool
+        of read-only connections. The database runs in WAL mode so readers never
+        block the writer and vice versa.
+
+        Args:
+            db_path: Path to the SQLite database file
+            read_pool_size: Number of pooled reader connections
+            metrics: Registry for query timings (default the shared one)
+        """
         if db_path is None:
-            db_path = str(Path(__file__).parent / 'feedback.db')
+            db_path = os.environ.get('JOBLY_FEEDBACK_DB') or str(Path(__file__).parent / 'feedback.db')
         
         self.db_path = db_path
+        self.metrics = metrics or get_metrics()
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.execute('PRAGMA journal_mode = WAL')
         self._init_database()
+        
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(read_pool_size):
+            reader = self._connect()
+            reader.execute('PRAGMA query_only = ON')
+            self._readers.put(reader)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a tuned connection that may be shared across threads."""
+        # Statements are kept compiled per connection by the statement cache
+        conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False, cached_statements=256)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _write(self, query: str) -> Iterator[sqlite3.Cursor]:
+        """Run a write transaction on the writer connection, timed under a query name."""
+        with self._write_lock, self.metrics.timer('jobly_sqlite_seconds', query=query, mode='write'):
+            try:
+                yield self._writer.cursor()
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    @contextmanager
+    def _read(self, query: str) -> Iterator[sqlite3.Cursor]:
+        """Borrow a reader connection from the pool, timed under a query name."""
+        with self.metrics.timer('jobly_sqlite_pool_wait_seconds'):
+            conn = self._readers.get()
+        try:
+            with self.metrics.timer('jobly_sqlite_seconds', query=query, mode='read'):
+                yield conn.cursor()
+        finally:
+            # Never hand back a connection with an open transaction
+            conn.rollback()
+            self._readers.put(conn)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._write_lock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
 
     def _init_database(self) -> None:
         """Initialize the SQLite database and create necessary tables."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self._write('init_database') as cursor:
             # Create feedback table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS feedback (
@@ -34,6 +267,7 @@ class FeedbackManager:
                     feedback_text TEXT,
                     feedback_categories TEXT,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    component_scores TEXT,
                     UNIQUE(job_id, resume_id)
                 )
             ''')
@@ -48,8 +282,70 @@ class FeedbackManager:
                     FOREIGN KEY(feedback_id) REFERENCES feedback(id)
                 )
             ''')
+            version = cursor.execute('PRAGMA user_version').fetchone()[0]
+            # Triggers from before version 3 break when an existing pair is re-rated
+            if version < 3:
+                for trigger in ROLLUP_TRIGGER_NAMES:
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            for statement in FEEDBACK_INDEXES + ROLLUP_SCHEMA + ROLLUP_TRIGGERS + THEME_SCHEMA + WEIGHTS_SCHEMA:
+                cursor.execute(statement)
+            
+            # Remove category rows orphaned by the old INSERT OR REPLACE upsert
+            cursor.execute('''
+                DELETE FROM feedback_categories
+                WHERE feedback_id NOT IN (SELECT id FROM feedback)
+            ''')
             
-            conn.commit()
+            # Databases created before the rollups existed need a one-off backfill
+            if version < 1:
+                self._rebuild_rollups(cursor)
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(feedback)')}
+            if 'component_scores' not in columns:
+                cursor.execute('ALTER TABLE feedback ADD COLUMN component_scores TEXT')
+            # Backfills before version 4 stored timestamps unvalidated, e.g. with a 'T' separator
+            if version < 4:
+                cursor.execute('''
+                    UPDATE feedback SET timestamp = strftime('%Y-%m-%d %H:%M:%S', timestamp)
+                    WHERE strftime('%Y-%m-%d %H:%M:%S', timestamp) IS NOT timestamp
+                      AND strftime('%Y-%m-%d %H:%M:%S', timestamp) IS NOT NULL
+                ''')
+            if version < SCHEMA_VERSION:
+                cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def rebuild_rollups(self) -> None:
+        """Recompute every rollup from the base tables, e.g. from a periodic compaction job."""
+        with self._write('rebuild_rollups') as cursor:
+            self._rebuild_rollups(cursor)
+
+    @staticmethod
+    def _rebuild_rollups(cursor: sqlite3.Cursor) -> None:
+        cursor.execute('''
+            UPDATE feedback_rollup SET
+                (feedback_count, rating_count, rating_sum, score_diff_count, score_diff_sum) = (
+                    SELECT COUNT(*), COUNT(user_rating), IFNULL(SUM(user_rating), 0),
+                           COUNT(ABS(match_score - user_rating / 5.0)),
+                           IFNULL(SUM(ABS(match_score - user_rating / 5.0)), 0)
+                    FROM feedback
+                )
+            WHERE id = 1
+        ''')
+        cursor.execute('DELETE FROM feedback_monthly_rollup')
+        cursor.execute('''
+            INSERT INTO feedback_monthly_rollup (month, feedback_count, rating_count, rating_sum)
+            SELECT strftime('%Y-%m', timestamp) AS month, COUNT(*), COUNT(user_rating),
+                   IFNULL(SUM(user_rating), 0)
+            FROM feedback
+            WHERE month IS NOT NULL
+            GROUP BY month
+        ''')
+        cursor.execute('DELETE FROM feedback_category_rollup')
+        cursor.execute('''
+            INSERT INTO feedback_category_rollup (category, row_count, score_count, score_sum)
+            SELECT category, COUNT(*), COUNT(score), IFNULL(SUM(score), 0)
+            FROM feedback_categories
+            WHERE category IS NOT NULL
+            GROUP BY category
+        ''')
 
     def record_feedback(self, 
                        job_id: str,
@@ -57,7 +353,8 @@ class FeedbackManager:
                        match_score: float,
                        user_rating: int,
                        feedback_text: Optional[str] = None,
-                       feedback_categories: Optional[Dict[str, float]] = None) -> bool:
+                       feedback_categories: Optional[Dict[str, float]] = None,
+                       component_scores: Optional[Dict[str, float]] = None) -> bool:
         """
         Record user feedback for a job-resume match.
         
@@ -68,53 +365,147 @@ class FeedbackManager:
             user_rating: User rating (1-5)
             feedback_text: Optional text feedback
             feedback_categories: Optional category-specific feedback scores
+            component_scores: Optional per-component scores behind match_score, i.e. the
+                component_scores of a ResumeAnalyzerAgent.process result, used to refit weights
             
         Returns:
             bool: True if feedback was successfully recorded
         """
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Convert feedback categories to JSON string
-                categories_json = json.dumps(feedback_categories) if feedback_categories else None
-                
-                # Insert or update main feedback
-                cursor.execute('''
-                    INSERT OR REPLACE INTO feedback 
-                    (job_id, resume_id, match_score, user_rating, feedback_text, feedback_categories)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (job_id, resume_id, match_score, user_rating, feedback_text, categories_json))
-                
-                feedback_id = cursor.lastrowid
-                
-                # Record category-specific feedback if provided
-                if feedback_categories:
-                    for category, score in feedback_categories.items():
-                        cursor.execute('''
-                            INSERT INTO feedback_categories (feedback_id, category, score)
-                            VALUES (?, ?, ?)
-                        ''', (feedback_id, category, score))
-                
-                conn.commit()
-                return True
-                
-        except Exception as e:
-            print(f"Error recording feedback: {e}")
-            return False
+        status = self.record_feedback_batch([{
+            'job_id': job_id,
+            'resume_id': resume_id,
+            'match_score': match_score,
+            'user_rating': user_rating,
+            'feedback_text': feedback_text,
+            'feedback_categories': feedback_categories,
+            'component_scores': component_scores
+        }])[0]
+        
+        if not status['success']:
+            print(f"Error recording feedback: {status['error']}")
+        return status['success']
+
+    def record_feedback_batch(self,
+                              records: List[Dict[str, Any]],
+                              chunk_size: int = 500) -> List[Dict[str, Any]]:
+        """
+        Record many feedback entries using chunked transactions.
+        
+        Each chunk is written with executemany in a single transaction. If a
+        chunk fails, its records are retried one by one so every record gets
+        an accurate status.
+        
+        Args:
+            records: Dicts with the arguments of record_feedback, plus an optional
+                ISO 8601 'timestamp' for backfills (see normalize_timestamp)
+            chunk_size: Number of records per transaction
+            
+        Returns:
+            One status dict per record, in input order, with 'index', 'success'
+            and, for failures, 'error'
+        """
+        statuses: List[Optional[Dict[str, Any]]] = [None] * len(records)
+        valid = []
+        
+        for index, record in enumerate(records):
+            try:
+                valid.append((index, self._feedback_row(record)))
+            except (KeyError, TypeError, ValueError) as e:
+                statuses[index] = {'index': index, 'success': False, 'error': f"Invalid record: {e}"}
+        
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            try:
+                self._write_feedback_rows([row for _, row in chunk])
+                for index, _ in chunk:
+                    statuses[index] = {'index': index, 'success': True}
+            except sqlite3.Error:
+                for index, row in chunk:
+                    try:
+                        self._write_feedback_rows([row])
+                        statuses[index] = {'index': index, 'success': True}
+                    except sqlite3.Error as e:
+                        statuses[index] = {'index': index, 'success': False, 'error': str(e)}
+        
+        return statuses
+
+    @staticmethod
+    def _feedback_row(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a feedback record and convert it to column values."""
+        user_rating = int(record['user_rating'])
+        if not 1 <= user_rating <= 5:
+            raise ValueError("user_rating must be between 1 and 5")
+        
+        categories = record.get('feedback_categories') or {}
+        components = record.get('component_scores') or {}
+        return {
+            'job_id': str(record['job_id']),
+            'resume_id': str(record['resume_id']),
+            'match_score': float(record['match_score']),
+            'user_rating': user_rating,
+            'feedback_text': record.get('feedback_text'),
+            # Convert feedback categories to JSON string
+            'feedback_categories': json.dumps(categories) if categories else None,
+            'categories': {str(category): float(score) for category, score in categories.items()},
+            'timestamp': normalize_timestamp(record['timestamp']) if record.get('timestamp') else None,
+            'component_scores': json.dumps(
+                {str(name): float(score) for name, score in components.items()}
+            ) if components else None
+        }
+
+    def _write_feedback_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Upsert feedback rows and replace their category rows in one transaction."""
+        with self._write('write_feedback_rows') as cursor:
+            # Update in place on conflict so the row keeps its id and its category rows stay linked
+            cursor.executemany('''
+                INSERT INTO feedback
+                (job_id, resume_id, match_score, user_rating, feedback_text, feedback_categories,
+                 timestamp, component_scores)
+                VALUES (:job_id, :resume_id, :match_score, :user_rating, :feedback_text,
+                        :feedback_categories, COALESCE(:timestamp, CURRENT_TIMESTAMP), :component_scores)
+                ON CONFLICT(job_id, resume_id) DO UPDATE SET
+                    match_score = excluded.match_score,
+                    user_rating = excluded.user_rating,
+                    feedback_text = excluded.feedback_text,
+                    feedback_categories = excluded.feedback_categories,
+                    timestamp = excluded.timestamp,
+                    component_scores = excluded.component_scores
+            ''', rows)
+            
+            feedback_ids = []
+            for row in rows:
+                cursor.execute(
+                    'SELECT id FROM feedback WHERE job_id = ? AND resume_id = ?',
+                    (row['job_id'], row['resume_id'])
+                )
+                feedback_ids.append(cursor.fetchone()[0])
+            
+            # Replace category-specific feedback; if a pair repeats, its last record wins
+            latest = dict(zip(feedback_ids, rows))
+            cursor.executemany(
+                'DELETE FROM feedback_categories WHERE feedback_id = ?',
+                [(feedback_id,) for feedback_id in latest]
+            )
+            cursor.executemany('''
+                INSERT INTO feedback_categories (feedback_id, category, score)
+                VALUES (?, ?, ?)
+            ''', [
+                (feedback_id, category, score)
+                for feedback_id, row in latest.items()
+                for category, score in row['categories'].items()
+            ])
 
     def get_feedback_stats(self) -> Dict[str, Any]:
         """Get statistical analysis of feedback data."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self._read('get_feedback_stats') as cursor:
             # Get overall statistics
             cursor.execute('''
                 SELECT 
-                    COUNT(*) as total_feedback,
-                    AVG(user_rating) as avg_rating,
-                    AVG(ABS(match_score - user_rating/5.0)) as avg_score_diff
-                FROM feedback
+                    feedback_count as total_feedback,
+                    rating_sum / NULLIF(rating_count, 0) as avg_rating,
+                    score_diff_sum / NULLIF(score_diff_count, 0) as avg_score_diff
+                FROM feedback_rollup
+                WHERE id = 1
             ''')
             
             total, avg_rating, avg_diff = cursor.fetchone()
@@ -123,10 +514,10 @@ class FeedbackManager:
             cursor.execute('''
                 SELECT 
                     category,
-                    AVG(score) as avg_score,
-                    COUNT(*) as count
-                FROM feedback_categories
-                GROUP BY category
+                    score_sum / NULLIF(score_count, 0) as avg_score,
+                    row_count as count
+                FROM feedback_category_rollup
+                WHERE row_count > 0
             ''')
             
             category_stats = {row[0]: {'avg_score': row[1], 'count': row[2]} 
@@ -154,41 +545,122 @@ class FeedbackManager:
         Returns:
             List of feedback records
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            query = "SELECT * FROM feedback WHERE 1=1"
-            params = []
-            
-            if job_id:
-                query += " AND job_id = ?"
-                params.append(job_id)
-            
-            if resume_id:
-                query += " AND resume_id = ?"
-                params.append(resume_id)
-            
-            query += " ORDER BY timestamp DESC LIMIT ?"
-            params.append(limit)
-            
-            cursor.execute(query, params)
-            columns = [desc[0] for desc in cursor.description]
+        return self.get_feedback_page(job_id=job_id, resume_id=resume_id, limit=limit)['records']
+
+    def get_feedback_page(self,
+                          job_id: Optional[str] = None,
+                          resume_id: Optional[str] = None,
+                          limit: int = 100,
+                          cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of feedback history, newest first.
+        
+        Pages are addressed by a keyset cursor on (timestamp, id), so fetching a
+        page costs the same however deep into the history it is.
+        
+        Args:
+            job_id: Optional job ID to filter by
+            resume_id: Optional resume ID to filter by
+            limit: Maximum number of records to return
+            cursor: next_cursor of the previous page, or None for the first page
             
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        Returns:
+            Dict with 'records' and 'next_cursor', which is None on the last page
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = self._decode_cursor(cursor) if cursor else None
+        with self._read('get_feedback_page') as db_cursor:
+            records = self._fetch_page(db_cursor, job_id, resume_id, limit, after)
+        
+        next_cursor = None
+        if records and len(records) == limit:
+            next_cursor = self._encode_cursor(records[-1]['timestamp'], records[-1]['id'])
+        return {'records': records, 'next_cursor': next_cursor}
+
+    def iter_feedback(self,
+                      job_id: Optional[str] = None,
+                      resume_id: Optional[str] = None,
+                      chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every feedback record, newest first, for exports and retraining.
+        
+        Records are read in keyset pages of chunk_size and a reader connection is
+        only held while a page is fetched, so memory stays flat and a slow
+        consumer never pins a pooled connection. Rows upserted while the export
+        runs may be skipped or seen twice, since an upsert moves a row's timestamp.
+        
+        Args:
+            job_id: Optional job ID to filter by
+            resume_id: Optional resume ID to filter by
+            chunk_size: Number of records fetched per query
+        """
+        after = None
+        while True:
+            with self._read('iter_feedback') as cursor:
+                records = self._fetch_page(cursor, job_id, resume_id, chunk_size, after)
+            yield from records
+            if len(records) < chunk_size:
+                return
+            after = (records[-1]['timestamp'], records[-1]['id'])
+
+    @staticmethod
+    def _fetch_page(cursor: sqlite3.Cursor,
+                    job_id: Optional[str],
+                    resume_id: Optional[str],
+                    limit: int,
+                    after: Optional[tuple]) -> List[Dict[str, Any]]:
+        """Fetch up to limit records ordered by (timestamp, id) descending, strictly after a keyset position."""
+        query = "SELECT * FROM feedback WHERE 1=1"
+        params: List[Any] = []
+        
+        if job_id:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        
+        if resume_id:
+            query += " AND resume_id = ?"
+            params.append(resume_id)
+        
+        if after is not None:
+            # Row-value comparison lets SQLite seek idx_feedback_timestamp instead of scanning
+            query += " AND (timestamp, id) < (?, ?)"
+            params.extend(after)
+        
+        # id breaks timestamp ties, so the order is total and pages never overlap
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit)
+        
+        cursor.execute(query, params)
+        columns = [desc[0] for desc in cursor.description]
+        
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _encode_cursor(timestamp: str, feedback_id: int) -> str:
+        payload = json.dumps([timestamp, feedback_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        try:
+            timestamp, feedback_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return str(timestamp), int(feedback_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
 
     def analyze_feedback_trends(self) -> Dict[str, Any]:
         """Analyze trends in feedback data over time."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self._read('analyze_feedback_trends') as cursor:
             # Analyze rating trends over time
             cursor.execute('''
                 SELECT 
-                    strftime('%Y-%m', timestamp) as month,
-                    AVG(user_rating) as avg_rating,
-                    COUNT(*) as feedback_count
-                FROM feedback
-                GROUP BY month
+                    month,
+                    rating_sum / NULLIF(rating_count, 0) as avg_rating,
+                    feedback_count
+                FROM feedback_monthly_rollup
+                WHERE feedback_count > 0
                 ORDER BY month DESC
                 LIMIT 12
             ''')
@@ -202,10 +674,10 @@ class FeedbackManager:
             cursor.execute('''
                 SELECT 
                     category,
-                    AVG(score) as avg_score,
-                    COUNT(*) as frequency
-                FROM feedback_categories
-                GROUP BY category
+                    score_sum / NULLIF(score_count, 0) as avg_score,
+                    row_count as frequency
+                FROM feedback_category_rollup
+                WHERE row_count > 0
                 ORDER BY frequency DESC
             ''')
             
@@ -220,43 +692,250 @@ class FeedbackManager:
             }
 
     def get_improvement_suggestions(self) -> List[Dict[str, Any]]:
-        """Generate suggestions for system improvement based on feedback patterns."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        """
+        Generate suggestions for system improvement based on feedback patterns.
+        
+        Every suggestion has the same keys: 'category' (the feedback category,
+        or 'theme' for a negative-feedback theme), 'theme', 'avg_score',
+        'frequency', 'examples' and 'suggestion'; keys that do not apply are
+        None or empty.
+        """
+        with self._read('get_improvement_suggestions') as cursor:
             # Find categories with consistently low scores
             cursor.execute('''
                 SELECT 
                     category,
-                    AVG(score) as avg_score,
-                    COUNT(*) as frequency
-                FROM feedback_categories
-                GROUP BY category
-                HAVING avg_score < 0.6 AND frequency >= 10
+                    score_sum / NULLIF(score_count, 0) as avg_score,
+                    row_count as frequency
+                FROM feedback_category_rollup
+                WHERE avg_score < 0.6 AND frequency >= 10
                 ORDER BY avg_score ASC
             ''')
             
             low_performing_categories = [
                 {
                     'category': row[0],
+                    'theme': None,
                     'avg_score': row[1],
                     'frequency': row[2],
+                    'examples': [],
                     'suggestion': f"Improve matching algorithm for {row[0]} category"
                 }
                 for row in cursor.fetchall()
             ]
             
-            # Find patterns in negative feedback text
+            # Themes in negative feedback text are mined offline by feedback_themes.py
+            theme_suggestions = [
+                {
+                    'category': 'theme',
+                    'theme': theme['label'],
+                    'avg_score': None,
+                    'frequency': theme['size'],
+                    'examples': theme['snippets'],
+                    'suggestion': f"Review negative feedback about {theme['label']}"
+                }
+                for theme in self._theme_rows(cursor)
+            ]
+            
+            return low_performing_categories + theme_suggestions
+
+    def get_feedback_themes(self) -> List[Dict[str, Any]]:
+        """Get the precomputed negative-feedback themes, largest first."""
+        with self._read('get_feedback_themes') as cursor:
+            return self._theme_rows(cursor)
+
+    @staticmethod
+    def _theme_rows(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+        cursor.execute('''
+            SELECT theme_id, label, size, snippets, updated_at
+            FROM feedback_themes
+            WHERE size > 0
+            ORDER BY size DESC
+        ''')
+        return [
+            {'theme_id': row[0], 'label': row[1], 'size': row[2],
+             'snippets': json.loads(row[3] or '[]'), 'updated_at': row[4]}
+            for row in cursor.fetchall()
+        ]
+
+    def iter_negative_feedback(self,
+                               after: Optional[tuple] = None,
+                               max_rating: int = 2,
+                               chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield low-rated feedback with text, oldest first, for theme mining.
+        
+        Args:
+            after: (timestamp, id) watermark; only later feedback is yielded
+            max_rating: Highest user_rating that counts as negative
+            chunk_size: Number of records fetched per query
+            
+        Yields:
+            Dicts with 'id', 'timestamp' and 'feedback_text'
+        """
+        while True:
+            with self._read('iter_negative_feedback') as cursor:
+                query = '''
+                    SELECT id, timestamp, feedback_text
+                    FROM feedback
+                    WHERE user_rating <= ? AND TRIM(feedback_text) != ''
+                '''
+                params: List[Any] = [max_rating]
+                if after is not None:
+                    query += " AND (timestamp, id) > (?, ?)"
+                    params.extend(after)
+                query += " ORDER BY timestamp, id LIMIT ?"
+                params.append(chunk_size)
+                
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+            
+            for row in rows:
+                yield {'id': row[0], 'timestamp': row[1], 'feedback_text': row[2]}
+            if len(rows) < chunk_size:
+                return
+            after = (rows[-1][1], rows[-1][0])
+
+    def load_theme_state(self) -> Dict[str, Any]:
+        """
+        Load the theme miner's state.
+        
+        Returns:
+            Dict with 'model_name', 'watermark' ((timestamp, id) or None) and
+            'themes', a list of dicts with 'theme_id', 'size', 'centroid' (bytes),
+            'snippets' and 'terms'
+        """
+        with self._read('load_theme_state') as cursor:
+            cursor.execute('SELECT model_name, last_timestamp, last_id FROM feedback_theme_state WHERE id = 1')
+            state = cursor.fetchone()
             cursor.execute('''
-                SELECT feedback_text
-                FROM feedback
-                WHERE user_rating <= 2 AND feedback_text IS NOT NULL
-                ORDER BY timestamp DESC
-                LIMIT 100
+                SELECT theme_id, size, centroid, snippets, terms
+                FROM feedback_themes
+                ORDER BY theme_id
             ''')
+            themes = [
+                {'theme_id': row[0], 'size': row[1], 'centroid': row[2],
+                 'snippets': json.loads(row[3] or '[]'), 'terms': json.loads(row[4] or '{}')}
+                for row in cursor.fetchall()
+            ]
+        
+        model_name, last_timestamp, last_id = state or (None, None, None)
+        watermark = (last_timestamp, last_id) if last_id is not None else None
+        return {'model_name': model_name, 'watermark': watermark, 'themes': themes}
+
+    def save_theme_state(self,
+                         model_name: str,
+                         watermark: Optional[tuple],
+                         themes: List[Dict[str, Any]]) -> None:
+        """
+        Replace the stored themes and advance the watermark in one transaction.
+        
+        Args:
+            model_name: Sentence model the centroids were computed with
+            watermark: (timestamp, id) of the last processed feedback
+            themes: Dicts with 'theme_id', 'label', 'size', 'centroid' (bytes),
+                'snippets' and 'terms'
+        """
+        last_timestamp, last_id = watermark or (None, None)
+        with self._write('save_theme_state') as cursor:
+            cursor.execute('DELETE FROM feedback_themes')
+            cursor.executemany('''
+                INSERT INTO feedback_themes (theme_id, label, size, centroid, snippets, terms)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (theme['theme_id'], theme['label'], theme['size'], theme['centroid'],
+                 json.dumps(theme['snippets']), json.dumps(theme['terms']))
+                for theme in themes
+            ])
+            cursor.execute('''
+                INSERT INTO feedback_theme_state (id, model_name, last_timestamp, last_id)
+                VALUES (1, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    model_name = excluded.model_name,
+                    last_timestamp = excluded.last_timestamp,
+                    last_id = excluded.last_id
+            ''', (model_name, last_timestamp, last_id))
+
+    def iter_component_feedback(self, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield feedback that carries component scores, for weight refits.
+        
+        Yields:
+            Dicts with 'component_scores' (parsed) and 'user_rating'
+        """
+        after = 0
+        while True:
+            with self._read('iter_component_feedback') as cursor:
+                cursor.execute('''
+                    SELECT id, component_scores, user_rating
+                    FROM feedback
+                    WHERE id > ? AND component_scores IS NOT NULL AND user_rating IS NOT NULL
+                    ORDER BY id
+                    LIMIT ?
+                ''', (after, chunk_size))
+                rows = cursor.fetchall()
             
-            negative_feedback = cursor.fetchall()
-            # Here you could implement text analysis on negative_feedback
-            # to identify common themes and generate suggestions
+            for row in rows:
+                yield {'component_scores': json.loads(row[1]), 'user_rating': row[2]}
+            if len(rows) < chunk_size:
+                return
+            after = rows[-1][0]
+
+    def save_weights(self, weights: Dict[str, float], metrics: Optional[Dict[str, Any]] = None,
+                     activate: bool = True) -> int:
+        """
+        Store a new weight set.
+        
+        Args:
+            weights: Component weights
+            metrics: Optional fit metrics stored alongside the weights
+            activate: Make this version the active one
             
-            return low_performing_categories  # Add more suggestion types as needed
+        Returns:
+            The new version number
+        """
+        with self._write('save_weights') as cursor:
+            cursor.execute(
+                'INSERT INTO model_weights (weights, metrics) VALUES (?, ?)',
+                (json.dumps(weights), json.dumps(metrics or {}))
+            )
+            version = cursor.lastrowid
+            if activate:
+                cursor.execute('UPDATE model_weights SET active = (version = ?)', (version,))
+        return version
+
+    def activate_weights(self, version: int) -> bool:
+        """Make a stored weight version the active one, e.g. to roll back a refit."""
+        with self._write('activate_weights') as cursor:
+            cursor.execute('SELECT 1 FROM model_weights WHERE version = ?', (version,))
+            if cursor.fetchone() is None:
+                return False
+            cursor.execute('UPDATE model_weights SET active = (version = ?)', (version,))
+        return True
+
+    def get_active_weights(self) -> Optional[Dict[str, Any]]:
+        """Get the active weight set, or None if weights were never learned."""
+        with self._read('get_active_weights') as cursor:
+            cursor.execute('''
+                SELECT version, weights, metrics, created_at
+                FROM model_weights
+                WHERE active = 1
+            ''')
+            row = cursor.fetchone()
+        return self._weights_row(row) if row else None
+
+    def get_weight_history(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get the most recent weight versions, newest first."""
+        with self._read('get_weight_history') as cursor:
+            cursor.execute('''
+                SELECT version, weights, metrics, created_at, active
+                FROM model_weights
+                ORDER BY version DESC
+                LIMIT ?
+            ''', (limit,))
+            return [dict(self._weights_row(row), active=bool(row[4])) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _weights_row(row: tuple) -> Dict[str, Any]:
+        return {'version': row[0], 'weights': json.loads(row[1]),
+                'metrics': json.loads(row[2] or '{}'), 'created_at': row[3]}
@@ -0,0 +1,268 @@
+"""
+Feedback Theme Mining for Resume Matcher.
+Clusters negative feedback text offline so improvement suggestions can be served without text work.
+
+Usage:
+    python -m src.ml.feedback_themes --themes 8
+    python -m src.ml.feedback_themes --interval 3600
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from collections import Counter
+import argparse
+import json
+import math
+import re
+import time
+import numpy as np
+from .feedback_manager import FeedbackManager
+from .key_terms import normalize_rows, unique_terms
+from .model_registry import DEFAULT_TRANSFORMER_MODEL, get_model_registry
+
+TERM_PATTERN = re.compile(r"[a-z][a-z+#]+")
+
+STOP_WORDS = frozenset("""
+    a about after all also am an and any are as at be because been but by can could did do does
+    doesn't don't for from had has have he her his how i i'm if in into is it it's its just me
+    more most my no not of on one only or other our out over really she should so some than that
+    the their them then there these they this those to too very was we were what when which who
+    why will with would you your job resume match matched matching
+""".split())
+
+class FeedbackThemeMiner:
+    """
+    Incremental spherical mini-batch k-means over embedded negative feedback.
+
+    Each run only embeds feedback newer than the stored watermark, folds it
+    into the existing centroids and stores labels and representative snippets
+    for every theme. Feedback that is edited after it was mined is counted
+    again on the next run.
+    """
+
+    def __init__(self,
+                 feedback_manager: FeedbackManager,
+                 encoder: Callable[[List[str]], np.ndarray],
+                 model_name: str = DEFAULT_TRANSFORMER_MODEL,
+                 n_themes: int = 8,
+                 batch_size: int = 256,
+                 n_snippets: int = 3,
+                 max_rating: int = 2,
+                 seed: int = 0):
+        """
+        Initialize the miner.
+
+        Args:
+            feedback_manager: Source of feedback and store for the themes
+            encoder: Callable that encodes a list of texts into a 2D array
+            model_name: Name of the encoder's model; themes are rebuilt when it changes
+            n_themes: Number of clusters
+            batch_size: Number of feedback texts embedded per encode call
+            n_snippets: Representative snippets kept per theme
+            max_rating: Highest user_rating that counts as negative
+            seed: Random seed for centroid initialisation
+        """
+        self.feedback_manager = feedback_manager
+        self.encoder = encoder
+        self.model_name = model_name
+        self.n_themes = n_themes
+        self.batch_size = batch_size
+        self.n_snippets = n_snippets
+        self.max_rating = max_rating
+        self.seed = seed
+
+    def run(self, max_records: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fold new negative feedback into the themes and store the result.
+
+        Args:
+            max_records: Stop after this many new records; the rest is picked up next run
+
+        Returns:
+            Dict with the number of 'processed' records and the number of 'themes'
+        """
+        state = self.feedback_manager.load_theme_state()
+        if state['model_name'] != self.model_name or len(state['themes']) != self.n_themes:
+            # Centroids from another model or cluster count are not comparable
+            state = {'watermark': None, 'themes': []}
+
+        centroids, counts, terms, candidates = self._restore(state['themes'])
+        watermark = state['watermark']
+        pending: List[Dict[str, Any]] = []
+        processed = 0
+
+        for batch in self._batches(watermark, max_records):
+            texts = [record['feedback_text'] for record in batch]
+            vectors = normalize_rows(self.encoder(texts))
+
+            if centroids is None:
+                # Collect enough feedback to seed every theme before clustering
+                pending.extend({'text': text, 'vector': vector} for text, vector in zip(texts, vectors))
+                watermark = (batch[-1]['timestamp'], batch[-1]['id'])
+                processed += len(batch)
+                if len(pending) < max(self.n_themes, self.batch_size):
+                    continue
+                texts = [item['text'] for item in pending]
+                vectors = np.stack([item['vector'] for item in pending])
+                centroids = self._seed(vectors)
+                counts = np.zeros(self.n_themes, dtype=np.int64)
+                pending = []
+            else:
+                watermark = (batch[-1]['timestamp'], batch[-1]['id'])
+                processed += len(batch)
+
+            self._update(centroids, counts, terms, candidates, texts, vectors)
+
+        if centroids is None:
+            if len(pending) < self.n_themes:
+                # Too little negative feedback so far; leave the watermark for the next run
+                return {'processed': 0, 'themes': 0}
+            vectors = np.stack([item['vector'] for item in pending])
+            centroids = self._seed(vectors)
+            counts = np.zeros(self.n_themes, dtype=np.int64)
+            self._update(centroids, counts, terms, candidates, [item['text'] for item in pending], vectors)
+
+        themes = self._themes(centroids, counts, terms, candidates)
+        self.feedback_manager.save_theme_state(self.model_name, watermark, themes)
+        return {'processed': processed, 'themes': len(themes)}
+
+    def _batches(self, watermark: Optional[tuple], max_records: Optional[int]) -> Iterable[List[Dict[str, Any]]]:
+        batch = []
+        records = self.feedback_manager.iter_negative_feedback(
+            after=watermark, max_rating=self.max_rating, chunk_size=max(self.batch_size, 1000)
+        )
+        for processed, record in enumerate(records):
+            if max_records is not None and processed >= max_records:
+                break
+            batch.append(record)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _restore(self, stored: List[Dict[str, Any]]) -> Tuple:
+        """Rebuild the in-memory state from stored themes."""
+        terms = [Counter() for _ in range(self.n_themes)]
+        candidates: List[Dict[str, np.ndarray]] = [{} for _ in range(self.n_themes)]
+        if not stored:
+            return None, None, terms, candidates
+
+        centroids = np.stack([np.frombuffer(theme['centroid'], dtype=np.float32) for theme in stored])
+        counts = np.array([theme['size'] for theme in stored], dtype=np.int64)
+
+        # Previous snippets compete with new feedback for the representative slots
+        snippets = unique_terms(snippet for theme in stored for snippet in theme['snippets'])
+        vectors = normalize_rows(self.encoder(snippets)) if snippets else []
+        vector_of = dict(zip(snippets, vectors))
+        for theme in stored:
+            cluster = theme['theme_id']
+            terms[cluster].update(theme['terms'])
+            candidates[cluster] = {snippet: vector_of[snippet] for snippet in theme['snippets']}
+        return centroids.copy(), counts, terms, candidates
+
+    def _seed(self, vectors: np.ndarray, iterations: int = 10) -> np.ndarray:
+        """Initialise centroids with a few full k-means passes over the first feedback."""
+        rng = np.random.default_rng(self.seed)
+        centroids = vectors[rng.choice(len(vectors), self.n_themes, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = (vectors @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            # Re-seed empty clusters from random points
+            empty = np.bincount(assignment, minlength=self.n_themes) == 0
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+            centroids = normalize_rows(sums)
+        return centroids
+
+    def _update(self,
+                centroids: np.ndarray,
+                counts: np.ndarray,
+                terms: List[Counter],
+                candidates: List[Dict[str, np.ndarray]],
+                texts: List[str],
+                vectors: np.ndarray) -> None:
+        """Assign a batch and move each centroid towards the running mean of its members."""
+        similarities = vectors @ centroids.T
+        assignment = similarities.argmax(axis=1)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        batch_counts = np.bincount(assignment, minlength=self.n_themes)
+        touched = batch_counts > 0
+        total = counts + batch_counts
+        centroids[touched] = normalize_rows(
+            (centroids[touched] * counts[touched, None] + sums[touched]) / total[touched, None]
+        )
+        counts[:] = total
+
+        for text, vector, cluster in zip(texts, vectors, assignment):
+            terms[cluster].update(self._terms(text))
+            candidates[cluster][self._snippet(text)] = vector
+
+        # Keep memory flat: only the best few candidates and most frequent terms survive a batch
+        for cluster in np.flatnonzero(touched):
+            candidates[cluster] = self._closest(candidates[cluster], centroids[cluster], 4 * self.n_snippets)
+            terms[cluster] = Counter(dict(terms[cluster].most_common(200)))
+
+    def _themes(self,
+                centroids: np.ndarray,
+                counts: np.ndarray,
+                terms: List[Counter],
+                candidates: List[Dict[str, np.ndarray]]) -> List[Dict[str, Any]]:
+        """Label every cluster and pick its representative snippets."""
+        document_frequency = Counter(term for cluster_terms in terms for term in cluster_terms)
+        themes = []
+        for cluster in range(self.n_themes):
+            # Terms frequent in this theme but rare in the others make the label
+            ranked = sorted(
+                terms[cluster].items(),
+                key=lambda item: item[1] * math.log(1 + self.n_themes / document_frequency[item[0]]),
+                reverse=True
+            )
+            label = ', '.join(term for term, _ in ranked[:3]) or f"theme {cluster}"
+            snippets = self._closest(candidates[cluster], centroids[cluster], self.n_snippets)
+            themes.append({
+                'theme_id': cluster,
+                'label': label,
+                'size': int(counts[cluster]),
+                'centroid': centroids[cluster].astype(np.float32).tobytes(),
+                'snippets': list(snippets),
+                'terms': dict(terms[cluster].most_common(200))
+            })
+        return themes
+
+    @staticmethod
+    def _closest(candidates: Dict[str, np.ndarray], centroid: np.ndarray, n: int) -> Dict[str, np.ndarray]:
+        ranked = sorted(candidates.items(), key=lambda item: float(item[1] @ centroid), reverse=True)
+        return dict(ranked[:n])
+
+    @staticmethod
+    def _terms(text: str) -> List[str]:
+        return unique_terms(term for term in TERM_PATTERN.findall(text.lower()) if term not in STOP_WORDS)
+
+    @staticmethod
+    def _snippet(text: str, max_length: int = 280) -> str:
+        text = ' '.join(text.split())
+        return text if len(text) <= max_length else text[:max_length - 3].rstrip() + '...'
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--themes', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--model', default=DEFAULT_TRANSFORMER_MODEL)
+    parser.add_argument('--db-path', default=None, help='Feedback database (default JOBLY_FEEDBACK_DB)')
+    parser.add_argument('--interval', type=float, default=0,
+                        help='Re-run every this many seconds instead of once')
+    args = parser.parse_args()
+
+    manager = FeedbackManager(args.db_path)
+    registry = get_model_registry()
+    miner = FeedbackThemeMiner(manager, registry.encoder(args.model), model_name=registry.model_key(args.model),
+                               n_themes=args.themes, batch_size=args.batch_size)
+    while True:
+        print(json.dumps(miner.run()))
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+if __name__ == '__main__':
+    main()
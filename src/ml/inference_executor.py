@@ -0,0 +1,144 @@
+"""
+Inference Executor for Resume Matcher.
+Runs blocking model calls off the event loop on a bounded worker pool with admission control.
+"""
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import math
+import os
+import threading
+import time
+
+class ExecutorSaturated(Exception):
+    """Raised when the executor has no free worker or queue slot."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inference executor is saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class InferenceExecutor:
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 max_queue: int = 32,
+                 timeout: float = 30.0,
+                 kind: str = 'thread',
+                 initializer: Optional[Callable[[], None]] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of concurrent model calls
+            max_queue: Number of calls allowed to wait for a worker before rejecting
+            timeout: Default seconds a caller waits for a result
+            kind: 'thread' or 'process' worker pool. Process workers load their own
+                models and require module-level callables and picklable arguments.
+            initializer: Optional module-level callable run once in every process
+                worker before it takes its first call, e.g. to load models. Thread
+                workers share the parent's models and do not run it.
+        """
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.kind = kind
+        self.initializer = initializer
+
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._avg_duration = 1.0
+        self._stats = {'completed': 0, 'failed': 0, 'rejected': 0, 'timeouts': 0}
+
+    @classmethod
+    def from_env(cls, initializer: Optional[Callable[[], None]] = None) -> 'InferenceExecutor':
+        """
+        Create an executor configured from JOBLY_INFERENCE_WORKERS, JOBLY_INFERENCE_QUEUE,
+        JOBLY_INFERENCE_TIMEOUT and JOBLY_INFERENCE_POOL.
+        """
+        workers = os.environ.get('JOBLY_INFERENCE_WORKERS')
+        return cls(
+            max_workers=int(workers) if workers else None,
+            max_queue=int(os.environ.get('JOBLY_INFERENCE_QUEUE', 32)),
+            timeout=float(os.environ.get('JOBLY_INFERENCE_TIMEOUT', 30.0)),
+            kind=os.environ.get('JOBLY_INFERENCE_POOL', 'thread'),
+            initializer=initializer
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.kind == 'process':
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     initializer=self.initializer)
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='inference')
+            return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) on the worker pool and wait for the result.
+
+        Raises:
+            ExecutorSaturated: If all workers and queue slots are taken
+            asyncio.TimeoutError: If the result is not ready within the timeout
+        """
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._stats['rejected'] += 1
+                raise ExecutorSaturated(self._retry_after())
+            self._in_flight += 1
+
+        started = time.perf_counter()
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except Exception:
+            self._release(started, failed=True)
+            raise
+        # The slot is held until the work finishes or, if still queued on timeout, is cancelled
+        future.add_done_callback(
+            lambda f: self._release(started, failed=f.cancelled() or f.exception() is not None)
+        )
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise
+
+    def _release(self, started: float, failed: bool) -> None:
+        duration = time.perf_counter() - started
+        with self._lock:
+            self._in_flight -= 1
+            self._stats['failed' if failed else 'completed'] += 1
+            self._avg_duration = 0.9 * self._avg_duration + 0.1 * duration
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until a slot frees up. Caller holds the lock."""
+        waves = self._in_flight / self.max_workers
+        return max(1, math.ceil(waves * self._avg_duration))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and outcome counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = self._in_flight
+            stats['queued'] = max(0, self._in_flight - self.max_workers)
+            stats['capacity'] = self.capacity
+            stats['avg_duration'] = self._avg_duration
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
@@ -0,0 +1,267 @@
+"""
+Job Profile Store for Resume Matcher.
+Precomputed job description features so matching only does resume-side work per request.
+"""
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+import numpy as np
+from .analysis_context import DocumentContext
+from .keyword_index import KeywordHits, KeywordIndex
+from .key_terms import unique_terms
+
+# Bumped when the stored features change; older profiles are treated as missing
+PROFILE_VERSION = 1
+
+class JobProfileNotFound(LookupError):
+    """Raised when a job is referenced by id but has no current stored profile."""
+
+    def __init__(self, job_id: str):
+        # args stay (job_id,) so the exception survives pickling from process pool workers
+        super().__init__(job_id)
+        self.job_id = job_id
+
+    def __str__(self) -> str:
+        return f"No job profile stored for job {self.job_id}"
+
+class JobProfile:
+    """Parsed features of one job description, ready to stand in for its DocumentContext."""
+
+    def __init__(self,
+                 job_id: str,
+                 text: str,
+                 model_name: str,
+                 features: Dict[str, Any],
+                 vectors: Dict[str, np.ndarray]):
+        """
+        Wrap stored job features.
+
+        Args:
+            job_id: Job listing id
+            text: Job description the features were computed from
+            model_name: Sentence model behind the vectors, 'full|fast' when the
+                short-text vectors come from a separate fast model
+            features: JSON-serializable features (years, noun_terms, keyword matches,
+                dependency_skills)
+            vectors: 'embedding', 'skills_embedding' and 'term_vectors', one row per
+                unique noun term
+        """
+        self.job_id = job_id
+        self.text = text
+        self.model_name = model_name
+        self.features = features
+        self.vectors = vectors
+
+    @property
+    def embedding_model(self) -> str:
+        """Model behind the full-text embedding."""
+        return self.model_name.split('|')[0]
+
+    @property
+    def skills(self) -> List[str]:
+        return KeywordHits(self.features['keyword_matches']).terms('skills')
+
+    @property
+    def required_years(self) -> float:
+        years = self.features['years']
+        return max(years) if years else 0.0
+
+    @classmethod
+    def from_context(cls,
+                     job_id: str,
+                     context: DocumentContext,
+                     model_name: str,
+                     dependency_skills: Optional[Callable[[DocumentContext], set]] = None) -> 'JobProfile':
+        """
+        Compute every feature the analyzers read from a job context.
+
+        Args:
+            job_id: Job listing id
+            context: Context of the job description, built with a keyword index
+            model_name: Sentence model behind the context's encoder
+            dependency_skills: Optional NLPAnalyzer-style skill extractor, stored
+                for match_role
+        """
+        DocumentContext.encode_all([context])
+        DocumentContext.encode_all([context], 'skills_embedding')
+        terms = unique_terms(context.noun_terms)
+        if terms:
+            term_vectors = np.stack([context.term_vectors[term] for term in terms])
+        else:
+            term_vectors = np.zeros((0, len(context.skills_embedding)))
+
+        features = {
+            'years': context.years,
+            'noun_terms': context.noun_terms,
+            'keyword_matches': context.keyword_hits.matches,
+            'dependency_skills': sorted(dependency_skills(context)) if dependency_skills else None
+        }
+        vectors = {
+            'embedding': np.asarray(context.embedding, dtype=np.float32),
+            'skills_embedding': np.asarray(context.skills_embedding, dtype=np.float32),
+            # Term vectors only feed a thresholded argmax, so half precision is plenty
+            'term_vectors': np.asarray(term_vectors, dtype=np.float16)
+        }
+        return cls(job_id, context.text, model_name, features, vectors)
+
+    def to_context(self,
+                   nlp,
+                   encoder: Callable[[List[str]], np.ndarray],
+                   keyword_index: Optional[KeywordIndex] = None,
+                   fast_encoder: Optional[Callable[[List[str]], np.ndarray]] = None) -> DocumentContext:
+        """
+        Build a DocumentContext with every stored feature already filled in.
+
+        Features that were not stored, such as the spaCy doc, are still
+        computed on first access.
+        """
+        context = DocumentContext(self.text, nlp, encoder, keyword_index, fast_encoder)
+        hits = KeywordHits(self.features['keyword_matches'])
+        context.__dict__.update({
+            'lower': self.text.lower(),
+            'years': self.features['years'],
+            'max_years': self.required_years,
+            'noun_terms': self.features['noun_terms'],
+            'keyword_hits': hits,
+            'skills': hits.terms('skills'),
+            'embedding': self.vectors['embedding'],
+            'skills_embedding': self.vectors['skills_embedding'],
+            'term_vectors': dict(zip(unique_terms(self.features['noun_terms']),
+                                     self.vectors['term_vectors'].astype(np.float32)))
+        })
+        if self.features.get('dependency_skills') is not None:
+            context.memoize('dependency_skills', lambda _: set(self.features['dependency_skills']))
+        return context
+
+    def to_row(self) -> tuple:
+        """Serialize to (job_id, model_name, text, features JSON, vectors npz bytes)."""
+        buffer = io.BytesIO()
+        np.savez(buffer, **self.vectors)
+        features = dict(self.features, version=PROFILE_VERSION)
+        return self.job_id, self.model_name, self.text, json.dumps(features), buffer.getvalue()
+
+    @classmethod
+    def from_row(cls, row: tuple) -> Optional['JobProfile']:
+        job_id, model_name, text, features, blob = row
+        features = json.loads(features)
+        if features.pop('version', None) != PROFILE_VERSION:
+            return None
+        with np.load(io.BytesIO(blob), allow_pickle=False) as arrays:
+            vectors = {name: arrays[name] for name in arrays.files}
+        return cls(job_id, text, model_name, features, vectors)
+
+class JobProfileStore:
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open the profile store.
+
+        Args:
+            db_path: Path to the SQLite database file (default JOBLY_JOB_PROFILE_DB
+                or job_profiles.db next to this module)
+        """
+        if db_path is None:
+            db_path = os.environ.get('JOBLY_JOB_PROFILE_DB') or str(Path(__file__).parent / 'job_profiles.db')
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=5.0, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS job_profiles (
+                    job_id TEXT PRIMARY KEY,
+                    model_name TEXT,
+                    text TEXT,
+                    text_hash TEXT,
+                    features TEXT,
+                    vectors BLOB,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def put(self, profile: JobProfile) -> None:
+        """Store or replace a job's profile."""
+        job_id, model_name, text, features, vectors = profile.to_row()
+        with self._lock, self._conn:
+            self._conn.execute('''
+                INSERT INTO job_profiles (job_id, model_name, text, text_hash, features, vectors)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    model_name = excluded.model_name,
+                    text = excluded.text,
+                    text_hash = excluded.text_hash,
+                    features = excluded.features,
+                    vectors = excluded.vectors,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (job_id, model_name, text, self.text_hash(text), features, vectors))
+
+    def get(self, job_id: str, model_name: Optional[str] = None) -> Optional[JobProfile]:
+        """
+        Load a job's profile.
+
+        Args:
+            job_id: Job listing id
+            model_name: If given, profiles computed with another model count as missing
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT job_id, model_name, text, features, vectors FROM job_profiles WHERE job_id = ?',
+                (job_id,)
+            ).fetchone()
+        if row is None or (model_name is not None and row[1] != model_name):
+            return None
+        return JobProfile.from_row(row)
+
+    def get_text(self, job_id: str, model_name: Optional[str] = None) -> Optional[str]:
+        """
+        Load only the job description of a profile, without decoding its vectors.
+
+        Returns None in the same cases as get().
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT model_name, text, json_extract(features, '$.version') FROM job_profiles WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None or (model_name is not None and row[0] != model_name) or row[2] != PROFILE_VERSION:
+            return None
+        return row[1]
+
+    def is_current(self, job_id: str, text: str, model_name: str) -> bool:
+        """Check whether a stored profile already matches a job description."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT model_name, text_hash FROM job_profiles WHERE job_id = ?', (job_id,)
+            ).fetchone()
+        return row is not None and row[0] == model_name and row[1] == self.text_hash(text)
+
+    def delete(self, job_id: str) -> bool:
+        """Remove a job's profile."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute('DELETE FROM job_profiles WHERE job_id = ?', (job_id,))
+        return cursor.rowcount > 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_shared_store: Optional[JobProfileStore] = None
+_shared_lock = threading.Lock()
+
+def get_job_profile_store() -> JobProfileStore:
+    """Get the process-wide job profile store."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = JobProfileStore()
+        return _shared_store
@@ -0,0 +1,90 @@
+"""
+Key term matching for Resume Matcher.
+Batched semantic matching of job terms against resume terms.
+"""
+from typing import Callable, Dict, List, Iterable, Optional
+import numpy as np
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length, leaving all-zero rows at zero."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of two vectors, 0 if either is all zeros."""
+    a, b = normalize_rows([a, b])
+    return float(a @ b)
+
+def unique_terms(terms: Iterable[str]) -> List[str]:
+    """Deduplicate terms while keeping first-occurrence order."""
+    return list(dict.fromkeys(terms))
+
+class KeyTermMatcher:
+    def __init__(self, encoder: Callable[[List[str]], np.ndarray], threshold: float = 0.8):
+        """
+        Initialize the matcher.
+
+        Args:
+            encoder: Callable that encodes a list of terms into a 2D array
+            threshold: Minimum cosine similarity for a job term to count as matched
+        """
+        self.encoder = encoder
+        self.threshold = threshold
+
+    def match(self,
+              job_terms: Iterable[str],
+              resume_terms: Iterable[str],
+              known_vectors: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, List[str]]:
+        """
+        Find the closest resume term for every job term.
+
+        All unique terms from both documents are encoded in a single call and
+        compared with one matrix product.
+
+        Args:
+            job_terms: Terms from the job description
+            resume_terms: Terms from the resume
+            known_vectors: Optional precomputed vectors by term, e.g. from a job
+                profile; only the remaining terms are encoded
+
+        Returns:
+            Dict with 'matched' and 'missing' job terms in first-occurrence order
+        """
+        job_terms = unique_terms(job_terms)
+        resume_terms = unique_terms(resume_terms)
+
+        if not job_terms:
+            return {'matched': [], 'missing': []}
+        if not resume_terms:
+            return {'matched': [], 'missing': job_terms}
+
+        known_vectors = known_vectors or {}
+        vocabulary = unique_terms(job_terms + resume_terms)
+        pending = [term for term in vocabulary if term not in known_vectors]
+        encoded = dict(zip(pending, self.encoder(pending))) if pending else {}
+        position = {term: i for i, term in enumerate(vocabulary)}
+        vectors = normalize_rows([
+            known_vectors[term] if term in known_vectors else encoded[term] for term in vocabulary
+        ])
+
+        job_vectors = vectors[[position[term] for term in job_terms]]
+        resume_vectors = vectors[[position[term] for term in resume_terms]]
+
+        similarities = job_vectors @ resume_vectors.T
+        best_match = similarities.argmax(axis=1)
+        best_score = similarities[np.arange(len(job_terms)), best_match]
+
+        matched_terms = []
+        missing_terms = []
+        for term, score in zip(job_terms, best_score):
+            if score > self.threshold:
+                matched_terms.append(term)
+            else:
+                missing_terms.append(term)
+
+        return {
+            'matched': matched_terms,
+            'missing': missing_terms
+        }
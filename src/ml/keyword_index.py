@@ -0,0 +1,116 @@
+"""
+Keyword Index for Resume Matcher.
+Aho-Corasick automaton that finds every dictionary keyword in a single pass over a text.
+"""
+from typing import Dict, List, Tuple
+from collections import deque
+
+class KeywordHits:
+    def __init__(self, matches: Dict[str, Dict[str, List[str]]]):
+        """Wrap keyword matches grouped by dictionary and category."""
+        self.matches = matches
+
+    def get(self, group: str, category: str) -> List[str]:
+        """Get matched keywords for one category, in dictionary order."""
+        return self.matches.get(group, {}).get(category, [])
+
+    def group(self, group: str) -> Dict[str, List[str]]:
+        """Get matched keywords for every category of a dictionary."""
+        return self.matches.get(group, {})
+
+    def terms(self, group: str) -> List[str]:
+        """Get the unique keywords matched anywhere in a dictionary."""
+        return list(dict.fromkeys(
+            term for terms in self.group(group).values() for term in terms
+        ))
+
+class KeywordIndex:
+    def __init__(self, dictionaries: Dict[str, Dict[str, List[str]]]):
+        """
+        Compile keyword dictionaries into a single automaton.
+
+        Args:
+            dictionaries: Mapping of dictionary name -> category -> keywords.
+                Keywords are matched case-insensitively as substrings.
+        """
+        self.dictionaries = dictionaries
+
+        # Each pattern maps to every (dictionary, category, position) it appears in
+        self._patterns: List[str] = []
+        self._locations: List[List[Tuple[str, str, int]]] = []
+        pattern_ids: Dict[str, int] = {}
+
+        for group, categories in dictionaries.items():
+            for category, keywords in categories.items():
+                for position, keyword in enumerate(keywords):
+                    pattern = keyword.lower()
+                    if not pattern:
+                        continue
+                    if pattern not in pattern_ids:
+                        pattern_ids[pattern] = len(self._patterns)
+                        self._patterns.append(pattern)
+                        self._locations.append([])
+                    self._locations[pattern_ids[pattern]].append((group, category, position))
+
+        self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        """Build the goto, failure and output tables."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self._patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern_id)
+
+        # Breadth-first pass to link each state to its longest proper suffix
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> set:
+        """Find the ids of every pattern occurring in the text."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found = set()
+        state = 0
+
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+
+        return found
+
+    def search(self, text: str) -> KeywordHits:
+        """Match every dictionary against the text in one pass."""
+        located: Dict[str, Dict[str, List[int]]] = {}
+        for pattern_id in self.find(text):
+            for group, category, position in self._locations[pattern_id]:
+                located.setdefault(group, {}).setdefault(category, []).append(position)
+
+        matches = {
+            group: {category: [self.dictionaries[group][category][position] for position in sorted(positions)]
+                    for category, positions in categories.items()}
+            for group, categories in located.items()
+        }
+        return KeywordHits(matches)
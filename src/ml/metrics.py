@@ -0,0 +1,323 @@
+"""
+Metrics for Resume Matcher.
+In-process counters, histograms and collected gauges rendered in the Prometheus text format,
+plus an opt-in sampling profiler for slow requests.
+"""
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from collections import Counter
+import bisect
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Seconds; spans sub-millisecond cache hits to multi-second full analyses
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# HELP lines of the metrics recorded across the ML components
+METRIC_HELP = {
+    'jobly_request_seconds': 'HTTP request latency by route',
+    'jobly_analysis_stage_seconds': 'ResumeAnalyzerAgent analysis stage latency',
+    'jobly_match_stage_seconds': 'NLPAnalyzer match_role stage latency',
+    'jobly_encode_seconds': 'Sentence transformer forward pass latency',
+    'jobly_encode_batch_size': 'Texts per sentence transformer forward pass',
+    'jobly_sqlite_seconds': 'Feedback database transaction latency by query',
+    'jobly_sqlite_pool_wait_seconds': 'Time spent waiting for a pooled reader connection',
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'labels', 'started')
+
+    def __init__(self, metrics: 'Metrics', name: str, labels: Dict[str, str]):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> '_Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+_NULL_TIMER = _NullTimer()
+
+class Metrics:
+    """
+    Thread-safe metric registry.
+
+    When disabled every recording call returns before taking the lock, so
+    instrumented code pays one attribute check. Values live in the process
+    that records them; with a process inference pool, model-side metrics stay
+    in the workers.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._bucket_of: Dict[str, Tuple[float, ...]] = {}
+        self._collectors: List[Tuple[str, str, str, Optional[str], Callable]] = []
+        self._help: Dict[str, str] = dict(METRIC_HELP)
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Set the HELP line of a metric."""
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels: str) -> None:
+        """
+        Record a value in a histogram.
+
+        A histogram keeps the buckets it was first observed with.
+        """
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self._bucket_of.setdefault(name, tuple(buckets)))
+            histogram.observe(value)
+
+    def timer(self, name: str, **labels: str) -> Union[_Timer, _NullTimer]:
+        """Context manager that records its duration in seconds to a histogram."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def collect(self,
+                name: str,
+                collect: Callable[[], Union[float, Dict[str, float]]],
+                kind: str = 'gauge',
+                label: Optional[str] = None,
+                help_text: str = '') -> None:
+        """
+        Register a value read at scrape time, e.g. a queue depth.
+
+        Args:
+            name: Metric name
+            collect: Returns a number, or a dict of numbers keyed by the value of `label`
+            kind: 'gauge' or 'counter'
+            label: Label name for dict results
+            help_text: HELP line
+        """
+        with self._lock:
+            self._collectors.append((name, kind, help_text, label, collect))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {key: (list(h.counts), h.sum, h.buckets) for key, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+            collectors = list(self._collectors)
+
+        lines = []
+        for name, kind, help_text, label, collect in collectors:
+            try:
+                value = collect()
+            except Exception as e:
+                print(f"Error collecting metric {name}: {e}")
+                continue
+            self._header(lines, name, kind, help_text)
+            if isinstance(value, dict):
+                for label_value, number in sorted(value.items()):
+                    lines.append(f"{name}{self._format(((label, str(label_value)),))} {float(number)}")
+            elif value is not None:
+                lines.append(f"{name} {float(value)}")
+
+        for name, series in sorted(counters.items()):
+            self._header(lines, name, 'counter', self._help.get(name, ''))
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{self._format(key)} {value}")
+
+        for name, series in sorted(histograms.items()):
+            self._header(lines, name, 'histogram', self._help.get(name, ''))
+            for key, (counts, total, buckets) in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(buckets, counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._format(key + (('le', repr(float(bound))),))} {cumulative}")
+                cumulative += counts[-1]
+                lines.append(f"{name}_bucket{self._format(key + (('le', '+Inf'),))} {cumulative}")
+                lines.append(f"{name}_sum{self._format(key)} {total}")
+                lines.append(f"{name}_count{self._format(key)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Drop recorded counters and histograms; collectors stay registered."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._bucket_of.clear()
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    @staticmethod
+    def _format(key: LabelKey) -> str:
+        if not key:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in key) + '}'
+
+    def _header(self, lines: List[str], name: str, kind: str, help_text: str) -> None:
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class SamplingProfiler:
+    """
+    Wall-clock sampler of every thread's Python stack.
+
+    Samples are folded into 'thread;outer;...;inner' stacks with counts, the
+    input format of common flame graph tools.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'SamplingProfiler':
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+    def write(self, path: Union[str, Path]) -> None:
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[';'.join(reversed(stack))] += 1
+
+class SlowRequestProfiler:
+    """
+    Profiles requests and keeps the profiles of those slower than a threshold.
+
+    Only one request is profiled at a time; others run unprofiled meanwhile.
+    """
+
+    def __init__(self, threshold_ms: float, directory: Optional[str] = None, interval_ms: float = 5.0):
+        """
+        Args:
+            threshold_ms: Requests slower than this get their profile written
+            directory: Where profiles are written (default a 'jobly-profiles' temp directory)
+            interval_ms: Sampling interval
+        """
+        self.threshold = threshold_ms / 1000.0
+        self.directory = Path(directory or Path(tempfile.gettempdir()) / 'jobly-profiles')
+        self.interval = interval_ms / 1000.0
+        self._busy = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['SlowRequestProfiler']:
+        """
+        Create a profiler if JOBLY_PROFILE_SLOW_MS is set; JOBLY_PROFILE_DIR and
+        JOBLY_PROFILE_INTERVAL_MS are optional.
+        """
+        threshold = os.environ.get('JOBLY_PROFILE_SLOW_MS')
+        if not threshold:
+            return None
+        return cls(float(threshold), os.environ.get('JOBLY_PROFILE_DIR'),
+                   float(os.environ.get('JOBLY_PROFILE_INTERVAL_MS', 5.0)))
+
+    def begin(self) -> Optional[SamplingProfiler]:
+        """Start profiling a request, or return None if another one is being profiled."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        return SamplingProfiler(self.interval).start()
+
+    def end(self, profiler: SamplingProfiler, duration: float, name: str) -> Optional[Path]:
+        """Stop profiling; write the profile if the request was slow."""
+        try:
+            profiler.stop()
+            if duration < self.threshold:
+                return None
+            self.directory.mkdir(parents=True, exist_ok=True)
+            slug = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_') or 'request'
+            path = self.directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{int(duration * 1000)}ms-{slug}.folded"
+            profiler.write(path)
+            return path
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+            return None
+        finally:
+            self._busy.release()
+
+_shared_metrics: Optional[Metrics] = None
+_shared_lock = threading.Lock()
+
+def get_metrics() -> Metrics:
+    """
+    Get the process-wide metric registry.
+
+    Recording is on unless JOBLY_METRICS is set to 0.
+    """
+    global _shared_metrics
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_metrics = Metrics(enabled=os.environ.get('JOBLY_METRICS', '1') not in ('0', 'false', 'no'))
+        return _shared_metrics
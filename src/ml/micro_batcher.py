@@ -0,0 +1,155 @@
+"""
+Micro Batcher for Resume Matcher.
+Coalesces encode calls from concurrent callers into single batched forward passes.
+"""
+from typing import Any, Callable, Dict, List, Optional
+import queue
+import threading
+import time
+import numpy as np
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+class _EncodeRequest:
+    __slots__ = ('texts', 'enqueued', 'done', 'result', 'error')
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+
+class MicroBatcher:
+    def __init__(self,
+                 encode_fn: Callable[[List[str]], np.ndarray],
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0,
+                 name: str = 'encoder'):
+        """
+        Initialize the batcher and its worker thread.
+
+        Args:
+            encode_fn: Callable that encodes a list of texts into a 2D array
+            max_batch_size: Stop gathering once this many texts are waiting
+            max_wait_ms: Longest time the first request in a batch waits for company
+            name: Name used for the worker thread
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue[Optional[_EncodeRequest]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {
+            'batches': 0,
+            'requests': 0,
+            'texts': 0,
+            'queue_delay_total': 0.0,
+            'queue_delay_max': 0.0,
+        }
+        self._batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name=f"micro-batcher-{name}", daemon=True)
+        self._worker.start()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts, sharing a forward pass with any concurrent callers."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+
+        request = _EncodeRequest(list(texts))
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    __call__ = encode
+
+    def close(self) -> None:
+        """Stop the worker thread after pending requests are served."""
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batch size and queueing delay metrics."""
+        with self._lock:
+            stats = dict(self._stats)
+            counts = list(self._batch_size_counts)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['avg_batch_size'] = stats['texts'] / stats['batches'] if stats['batches'] else 0.0
+        stats['avg_queue_delay_ms'] = (
+            1000.0 * stats['queue_delay_total'] / stats['requests'] if stats['requests'] else 0.0
+        )
+        stats['max_queue_delay_ms'] = 1000.0 * stats.pop('queue_delay_max')
+        stats['batch_size_histogram'] = {
+            **{str(bound): count for bound, count in zip(BATCH_SIZE_BUCKETS, counts)},
+            '+Inf': counts[-1]
+        }
+        return stats
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            size = len(first.texts)
+            deadline = first.enqueued + self.max_wait
+            stop = False
+            while size < self.max_batch_size:
+                # Requests already waiting are always taken; new ones only until the deadline
+                remaining = deadline - time.perf_counter()
+                try:
+                    if remaining > 0:
+                        request = self._queue.get(timeout=remaining)
+                    else:
+                        request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch: List[_EncodeRequest]) -> None:
+        started = time.perf_counter()
+
+        # Deduplicate and sort by length so padding inside the forward pass is minimal
+        unique = list(dict.fromkeys(text for request in batch for text in request.texts))
+        unique.sort(key=len)
+
+        try:
+            vectors = np.asarray(self.encode_fn(unique))
+            row_of = {text: row for row, text in enumerate(unique)}
+            for request in batch:
+                request.result = vectors[[row_of[text] for text in request.texts]]
+        except BaseException as e:
+            for request in batch:
+                request.error = e
+
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['requests'] += len(batch)
+            self._stats['texts'] += len(unique)
+            for request in batch:
+                delay = started - request.enqueued
+                self._stats['queue_delay_total'] += delay
+                self._stats['queue_delay_max'] = max(self._stats['queue_delay_max'], delay)
+            bucket = next((i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if len(unique) <= bound),
+                          len(BATCH_SIZE_BUCKETS))
+            self._batch_size_counts[bucket] += 1
+
+        for request in batch:
+            request.done.set()
@@ -0,0 +1,169 @@
+"""
+Model Registry for Resume Matcher.
+Loads spaCy pipelines and sentence transformers once per process and shares them.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import os
+import threading
+import numpy as np
+from .metrics import Metrics, get_metrics
+from .micro_batcher import BATCH_SIZE_BUCKETS, MicroBatcher
+
+DEFAULT_SPACY_MODEL = 'en_core_web_sm'
+DEFAULT_TRANSFORMER_MODEL = 'all-mpnet-base-v2'
+
+# Components none of the analyzers read; skipping them speeds up every parse
+DEFAULT_SPACY_DISABLE = ('ner', 'lemmatizer')
+
+# 'torch' runs the model as published; 'quantized' applies dynamic int8 quantization
+# to its Linear layers; 'onnx' runs an exported graph (sentence-transformers>=3.2 with
+# optimum[onnxruntime] installed)
+ENCODER_BACKENDS = ('torch', 'quantized', 'onnx')
+
+class ModelRegistry:
+    def __init__(self,
+                 batch_max_size: Optional[int] = None,
+                 batch_max_wait_ms: Optional[float] = None,
+                 backend: Optional[str] = None,
+                 metrics: Optional[Metrics] = None):
+        """
+        Initialize an empty registry. Models are loaded on first request.
+
+        Args:
+            batch_max_size: Micro-batch size limit for shared encoders
+                (default JOBLY_MICROBATCH_MAX_SIZE or 64)
+            batch_max_wait_ms: Micro-batch gathering window; 0 disables micro-batching
+                (default JOBLY_MICROBATCH_WAIT_MS or 5)
+            backend: Default sentence transformer backend, one of ENCODER_BACKENDS
+                (default JOBLY_ENCODER_BACKEND or 'torch')
+            metrics: Registry for encode latency and batch sizes (default the shared one)
+        """
+        if backend is None:
+            backend = os.environ.get('JOBLY_ENCODER_BACKEND', 'torch')
+        if backend not in ENCODER_BACKENDS:
+            raise ValueError(f"Unknown encoder backend: {backend}")
+        self.backend = backend
+        if batch_max_size is None:
+            batch_max_size = int(os.environ.get('JOBLY_MICROBATCH_MAX_SIZE', 64))
+        if batch_max_wait_ms is None:
+            batch_max_wait_ms = float(os.environ.get('JOBLY_MICROBATCH_WAIT_MS', 5.0))
+        self.batch_max_size = batch_max_size
+        self.batch_max_wait_ms = batch_max_wait_ms
+        self.metrics = metrics or get_metrics()
+
+        self._models: Dict[Tuple, Any] = {}
+        self._locks: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def spacy(self, name: str = DEFAULT_SPACY_MODEL, disable: Iterable[str] = DEFAULT_SPACY_DISABLE):
+        """
+        Get a shared spaCy pipeline.
+
+        Args:
+            name: spaCy model package name
+            disable: Pipeline components to disable, e.g. 'ner' when only
+                POS tags and sentences are needed
+        """
+        disable = tuple(sorted(disable))
+
+        def load():
+            import spacy
+            return spacy.load(name, disable=list(disable))
+
+        return self._get(('spacy', name, disable), load)
+
+    def sentence_transformer(self, name: str = DEFAULT_TRANSFORMER_MODEL, backend: Optional[str] = None):
+        """
+        Get a shared SentenceTransformer model.
+
+        Args:
+            name: Model name or path
+            backend: One of ENCODER_BACKENDS, defaults to the registry's backend
+        """
+        backend = backend or self.backend
+
+        def load():
+            from sentence_transformers import SentenceTransformer
+            if backend == 'onnx':
+                return SentenceTransformer(name, device='cpu', backend='onnx')
+            model = SentenceTransformer(name)
+            if backend == 'quantized':
+                import torch
+                model = torch.ao.quantization.quantize_dynamic(
+                    model.to('cpu'), {torch.nn.Linear}, dtype=torch.qint8
+                )
+            return model
+
+        return self._get(('sentence_transformer', name, backend), load)
+
+    def model_key(self, name: str = DEFAULT_TRANSFORMER_MODEL, backend: Optional[str] = None) -> str:
+        """
+        Identify the vectors a model produces under a backend, e.g. for cache keys.
+
+        Backends other than 'torch' produce slightly different vectors, so they get
+        their own key.
+        """
+        backend = backend or self.backend
+        return name if backend == 'torch' else f"{name}@{backend}"
+
+    def encoder(self, name: str = DEFAULT_TRANSFORMER_MODEL,
+                backend: Optional[str] = None) -> Callable[[List[str]], np.ndarray]:
+        """
+        Get a shared encode function for a sentence transformer.
+
+        Concurrent callers are coalesced into batched forward passes unless
+        micro-batching is disabled. The model itself still loads on first encode.
+        """
+        backend = backend or self.backend
+        key = self.model_key(name, backend)
+
+        def encode(texts: List[str]) -> np.ndarray:
+            model = self.sentence_transformer(name, backend)
+            self.metrics.observe('jobly_encode_batch_size', len(texts), BATCH_SIZE_BUCKETS, model=key)
+            with self.metrics.timer('jobly_encode_seconds', model=key):
+                return model.encode(texts)
+
+        if self.batch_max_wait_ms <= 0:
+            return encode
+
+        def load():
+            return MicroBatcher(encode, self.batch_max_size, self.batch_max_wait_ms, name=key)
+
+        return self._get(('encoder', key), load).encode
+
+    def batchers(self) -> Dict[str, MicroBatcher]:
+        """Get the micro-batchers created so far, keyed by model key."""
+        with self._lock:
+            return {key[1]: model for key, model in self._models.items() if key[0] == 'encoder'}
+
+    def loaded(self) -> List[Tuple]:
+        """List the keys of models loaded so far."""
+        with self._lock:
+            return list(self._models.keys())
+
+    def _get(self, key: Tuple, load: Callable[[], Any]) -> Any:
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        # One lock per model so different models can load concurrently
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = load()
+                with self._lock:
+                    self._models[key] = model
+        return model
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -1,31 +1,58 @@
 """
 NLP Analyzer for processing resumes and job descriptions.
 """
-import spacy
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from langdetect import detect
+from typing import Any, Dict, List, Optional
+from .analysis_context import DocumentContext
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .job_profiles import JobProfileNotFound, JobProfileStore, get_job_profile_store
+from .key_terms import cosine, normalize_rows, unique_terms
+from .metrics import Metrics, get_metrics
+from .model_registry import ModelRegistry, get_model_registry
 
 class NLPAnalyzer:
-    def __init__(self):
-        """Initialize NLP models and components."""
-        self.nlp = spacy.load('en_core_web_sm')
-        self.transformer = SentenceTransformer('all-mpnet-base-v2')
+    def __init__(self,
+                 embedding_cache: Optional[EmbeddingCache] = None,
+                 model_registry: Optional[ModelRegistry] = None,
+                 job_profiles: Optional[JobProfileStore] = None,
+                 metrics: Optional[Metrics] = None):
+        """Initialize NLP components. Models are shared and loaded on first use."""
+        self.model_name = 'all-mpnet-base-v2'
+        self.spacy_model = 'en_core_web_sm'
+        self.model_registry = model_registry or get_model_registry()
+        self.embedding_cache = embedding_cache or get_embedding_cache()
+        self._job_profiles = job_profiles
+        self.metrics = metrics or get_metrics()
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline."""
+        return self.model_registry.spacy(self.spacy_model)
+
+    @property
+    def transformer(self):
+        """Shared sentence transformer."""
+        return self.model_registry.sentence_transformer(self.model_name)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the sentence transformer, reusing cached embeddings."""
+        return self.embedding_cache.encode(texts, self.model_registry.encoder(self.model_name),
+                                           self.model_registry.model_key(self.model_name))
 
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate semantic similarity between two texts."""
         # Get embeddings
-        embedding1 = self.transformer.encode([text1])[0]
-        embedding2 = self.transformer.encode([text2])[0]
+        embedding1, embedding2 = self.encode([text1, text2])
         
         # Calculate cosine similarity
-        similarity = cosine_similarity([embedding1], [embedding2])[0][0]
-        return float(similarity)
+        return cosine(embedding1, embedding2)
 
     def extract_skills(self, text: str) -> set:
         """Extract skills from text using NLP."""
-        doc = self.nlp(text.lower())
+        return self._skills_from_doc(self.nlp(text.lower()))
+
+    def _skills_from_doc(self, doc) -> set:
+        """Extract skills from an already parsed document."""
         skills = set()
         
         # Common skill-related words
@@ -48,20 +75,13 @@ class NLPAnalyzer:
 
     def extract_experience(self, text: str) -> int:
         """Extract years of experience from text."""
-        doc = self.nlp(text.lower())
-        years = []
-        
-        for token in doc:
-            if token.like_num:
-                next_token = token.nbor() if token.i + 1 < len(token.doc) else None
-                if next_token and next_token.text.lower() in ['year', 'years', 'yr', 'yrs']:
-                    years.append(float(token.text))
-        
-        return int(max(years)) if years else 0
+        return int(self.create_context(text).max_years)
 
     def detect_language(self, text: str) -> str:
         """Detect the language of the text."""
         try:
+            # langdetect loads its language profiles on import; only pay for it when used
+            from langdetect import detect
             return detect(text)
         except:
             return 'en'  # Default to English if detection fails
@@ -97,19 +117,63 @@ class NLPAnalyzer:
             'subjectivity': (pos_count + neg_count) / len(words)
         }
 
-    def match_role(self, resume_text: str, job_desc: str) -> dict:
-        """Match resume against job description."""
-        # Calculate overall similarity
-        similarity = self.calculate_similarity(resume_text, job_desc)
+    def create_context(self, text: str) -> DocumentContext:
+        """Create the per-request analysis context for a document."""
+        return DocumentContext(text, self.nlp, self.encode)
+
+    def match_role(self, resume_text: str, job_desc: Optional[str] = None, job_id: Optional[str] = None) -> dict:
+        """
+        Match resume against job description.
+        
+        The job is given as text or as the id of a stored job profile, in which
+        case only the resume is parsed and encoded.
+        """
+        def stage(name: str):
+            return self.metrics.timer('jobly_match_stage_seconds', stage=name)
+        
+        # Parse and encode each text once
+        resume = self.create_context(resume_text)
+        job = self._job_context(job_desc, job_id)
+        # A profiled job needs no parsing on the request path
+        with stage('parse'):
+            DocumentContext.parse_all([resume] if job.has('embedding') else [resume, job])
+        with stage('embeddings'):
+            DocumentContext.encode_all([resume, job])
         
+        # Calculate overall similarity
+        with stage('scores'):
+            similarity = cosine(resume.embedding, job.embedding)
+            return self._match_scores(resume, job, similarity)
+
+    def _job_context(self, job_desc: Optional[str], job_id: Optional[str]) -> DocumentContext:
+        """Context for a job, prefilled from its stored profile when one is current."""
+        if job_id is not None:
+            if self._job_profiles is None:
+                self._job_profiles = get_job_profile_store()
+            profile = self._job_profiles.get(job_id)
+            # Only the full-text embedding of a profile is used here
+            usable = (profile is not None
+                      and profile.embedding_model == self.model_registry.model_key(self.model_name)
+                      and profile.features.get('dependency_skills') is not None
+                      and (job_desc is None or job_desc == profile.text))
+            if usable:
+                return profile.to_context(self.nlp, self.encode)
+            if job_desc is None:
+                raise JobProfileNotFound(job_id)
+        if job_desc is None:
+            raise ValueError("match_role needs job_desc or job_id")
+        return self.create_context(job_desc)
+
+    def _match_scores(self, resume: DocumentContext, job: DocumentContext, similarity: float) -> dict:
+        """Combine similarity with skill and experience matches for one pair."""
         # Extract and compare skills
-        resume_skills = self.extract_skills(resume_text)
-        job_skills = self.extract_skills(job_desc)
+        resume_skills = self.context_skills(resume)
+        job_skills = self.context_skills(job)
         skill_match = len(resume_skills.intersection(job_skills)) / len(job_skills) if job_skills else 0
         
         # Extract and compare experience
-        resume_exp = self.extract_experience(resume_text)
-        job_exp = self.extract_experience(job_desc)
+        resume_exp = int(resume.max_years)
+        job_exp = int(job.max_years)
         exp_match = min(resume_exp / job_exp if job_exp > 0 else 1, 1)
         
         return {
@@ -117,3 +181,41 @@ class NLPAnalyzer:
             'skill_match': skill_match,
             'experience_match': exp_match
         }
+
+    def context_skills(self, context: DocumentContext) -> set:
+        """Dependency-based skills of a context, extracted once."""
+        return context.memoize('dependency_skills', lambda context: self._skills_from_doc(context.doc))
+
+    def match_roles_batch(self, resume_texts: List[str], job_descs: List[str]) -> List[Dict[str, Any]]:
+        """
+        Match every resume against every job description in one batch.
+
+        Texts are parsed with a single nlp.pipe call, encoded in one transformer
+        batch, and compared with one matrix product.
+
+        Args:
+            resume_texts: Resumes to score
+            job_descs: Job descriptions to score against
+
+        Returns:
+            One result per (job, resume) pair with the same scores as match_role
+        """
+        contexts = {text: self.create_context(text) for text in unique_terms(list(resume_texts) + list(job_descs))}
+        
+        # Parse and encode every unique text once
+        DocumentContext.parse_all(contexts.values())
+        DocumentContext.encode_all(contexts.values())
+        
+        # Compute all similarities with one matrix product
+        resumes = [contexts[text] for text in resume_texts]
+        jobs = [contexts[text] for text in job_descs]
+        similarities = (normalize_rows([job.embedding for job in jobs]) @
+                        normalize_rows([resume.embedding for resume in resumes]).T)
+        
+        results = []
+        for job_index, job in enumerate(jobs):
+            for resume_index, resume in enumerate(resumes):
+                scores = self._match_scores(resume, job, float(similarities[job_index, resume_index]))
+                results.append({'job_index': job_index, 'resume_index': resume_index, **scores})
+        
+        return results
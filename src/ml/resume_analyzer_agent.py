@@ -1,11 +1,42 @@
 """
 Resume Analyzer Agent for advanced resume analysis and matching.
 """
-from typing import Dict, Any, List
-import spacy
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+import os
+import time
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from .embedding_cache import get_embedding_cache
+from .key_terms import KeyTermMatcher, cosine, normalize_rows
+from .analysis_context import DocumentContext
+from .keyword_index import KeywordIndex
+from .metrics import get_metrics
+from .model_registry import DEFAULT_SPACY_DISABLE, get_model_registry
+from .job_profiles import JobProfile, JobProfileNotFound, JobProfileStore, get_job_profile_store
+from .score_cache import ScoreCache, get_score_cache
+from .weight_learning import COMPONENTS, DEFAULT_WEIGHTS, WeightLearner
+
+# Analysis depths, cheapest first. 'scores' computes the component scores only and
+# never tags or parses; 'standard' adds the keyword-based sections; 'full' adds key
+# terms and relevant experience, which need a full parse and many encodes.
+DEPTHS = ('scores', 'standard', 'full')
+
+# Sections of detailed_analysis, in output order, and the depth that adds them
+SECTION_DEPTHS = {
+    'skill_gaps': 'standard',
+    'experience_analysis': 'full',
+    'key_terms': 'full',
+    'culture_analysis': 'standard',
+    'future_readiness': 'standard',
+    'recommendations': 'standard'
+}
+
+# p95 latency budgets in milliseconds for one uncached medium-length pair on a
+# 4-core CPU with all-mpnet-base-v2; checked by benchmarks/pipeline.py --check-budgets
+DEPTH_BUDGETS_MS = {
+    'scores': 150.0,
+    'standard': 175.0,
+    'full': 1500.0
+}
 
 class ResumeAnalyzerAgent:
     def __init__(self, agent_id: str, config: Dict[str, Any] = None):
@@ -13,9 +44,28 @@ class ResumeAnalyzerAgent:
         self.agent_id = agent_id
         self.config = config or {}
         
-        # Load models
-        self.nlp = spacy.load('en_core_web_sm')
-        self.transformer = SentenceTransformer('all-mpnet-base-v2')
+        # Models are shared across agents and loaded on first use
+        self.model_name = self.config.get('model_name', 'all-mpnet-base-v2')
+        # Smaller model for short texts (skills, noun terms); defaults to the main model
+        self.fast_model_name = (self.config.get('fast_model_name') or os.environ.get('JOBLY_FAST_MODEL')
+                                or self.model_name)
+        self.spacy_model = self.config.get('spacy_model', 'en_core_web_sm')
+        self.spacy_disable = self.config.get('spacy_disable', DEFAULT_SPACY_DISABLE)
+        self.model_registry = self.config.get('model_registry') or get_model_registry()
+        self.embedding_cache = self.config.get('embedding_cache') or get_embedding_cache()
+        self.score_cache = self.config.get('score_cache') or get_score_cache()
+        self.metrics = self.config.get('metrics') or get_metrics()
+        self._job_profiles: Optional[JobProfileStore] = self.config.get('job_profiles')
+        self.key_term_matcher = KeyTermMatcher(self._encode_fast)
+        
+        # Scoring weights; learned versions are picked up from the feedback store
+        self.feedback_manager = self.config.get('feedback_manager')
+        self.weights_refresh_seconds = self.config.get('weights_refresh_seconds', 60.0)
+        # (version, weights) swapped as one tuple, so a request never pairs one
+        # version's weights with another's label
+        self._weights: Tuple[Optional[int], Dict[str, float]] = (None, dict(DEFAULT_WEIGHTS))
+        self._weights_checked = 0.0
+        self.reload_weights()
         
         # Technical skills dictionary
         self.common_skills = {
@@ -79,99 +129,341 @@ class ResumeAnalyzerAgent:
                 'carbon footprint', 'environmental'
             ]
         }
+        
+        # Compile every dictionary into one index so each document is scanned once
+        self.keyword_index = KeywordIndex({
+            'skills': self.common_skills,
+            'culture': self.culture_indicators,
+            'future': self.future_indicators
+        })
+
+    @property
+    def active_weights(self) -> Tuple[Optional[int], Dict[str, float]]:
+        """The (version, weights) pair in use; read it once to get a consistent pair."""
+        return self._weights
+
+    @property
+    def weights(self) -> Dict[str, float]:
+        """Scoring weights in use."""
+        return self._weights[1]
+
+    @property
+    def weights_version(self) -> Optional[int]:
+        """Version of the learned weights in use, None for the defaults."""
+        return self._weights[0]
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline."""
+        return self.model_registry.spacy(self.spacy_model, self.spacy_disable)
+
+    @property
+    def transformer(self):
+        """Shared sentence transformer."""
+        return self.model_registry.sentence_transformer(self.model_name)
+
+    @property
+    def model_key(self) -> str:
+        """Identify the models and backends behind an analysis, for cache and profile keys."""
+        full = self.model_registry.model_key(self.model_name)
+        fast = self.model_registry.model_key(self.fast_model_name)
+        return full if fast == full else f"{full}|{fast}"
+
+    def create_context(self, text: str) -> DocumentContext:
+        """Create the per-request analysis context for a document."""
+        return DocumentContext(text, self.nlp, self._encode, self.keyword_index, self._encode_fast)
+
+    @property
+    def job_profiles(self) -> JobProfileStore:
+        """Store of precomputed job profiles, opened on first use."""
+        if self._job_profiles is None:
+            self._job_profiles = get_job_profile_store()
+        return self._job_profiles
+
+    def update_job_profile(self, job_id: str, job_description: str, dependency_skills=None) -> JobProfile:
+        """
+        Precompute and store the features of a job description.
+        
+        Args:
+            job_id: Job listing id
+            job_description: Current job description text
+            dependency_skills: Optional NLPAnalyzer.context_skills, stored so
+                match_role can use the profile too
+        """
+        # An unchanged description computed with the same models needs no re-encoding
+        if self.job_profiles.is_current(job_id, job_description, self.model_key):
+            profile = self.job_profiles.get(job_id, self.model_key)
+            if profile is not None and (dependency_skills is None
+                                        or profile.features.get('dependency_skills') is not None):
+                return profile
+        profile = JobProfile.from_context(job_id, self.create_context(job_description),
+                                          self.model_key, dependency_skills)
+        self.job_profiles.put(profile)
+        return profile
 
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a resume against a job description with advanced analysis."""
+        """
+        Process a resume against a job description with advanced analysis.
+        
+        The job is given as 'job_description' text or as the 'job_id' of a stored
+        job profile, in which case only the resume is analysed on this call.
+        An optional 'depth' (one of DEPTHS, default 'full') selects which
+        sections of detailed_analysis are computed.
+        """
+        return self._assemble(self.iter_process(input_data))
+
+    def iter_process(self, input_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Run process() and yield its result piece by piece as it is computed.
+        
+        Events, in order:
+            {'event': 'scores', 'final_score', the component scores, 'component_scores',
+                'weights_version', 'depth'}
+            {'event': 'section', 'name', 'data'} for each section of detailed_analysis,
+                cheapest first; key_terms and experience_analysis come last
+            {'event': 'done'}
+        
+        The analysis is cached once every event has been consumed.
+        """
         if not self.validate_input(input_data):
             raise ValueError("Invalid input data")
         
-        job_desc = input_data['job_description']
-        resume_text = input_data['resume_text']
-        weights = input_data.get('weights', {
-            'technical': 0.3,
-            'experience': 0.2,
-            'semantic': 0.1,
-            'culture': 0.2,
-            'future': 0.2
-        })
+        job_text, profile = self._resolve_job(input_data)
+        depth = input_data.get('depth', 'full')
+        
+        # Component scores do not depend on the weights, so re-weighting a pair reuses them
+        key = ScoreCache.make_key(job_text, input_data['resume_text'], self.model_key)
+        analysis = self.score_cache.get(key)
+        if analysis is not None and self._covers(analysis, depth):
+            parts = self._replay(analysis)
+        else:
+            parts = self._analyze_and_cache(key, job_text, input_data['resume_text'], profile, depth)
+        yield from self._events(parts, input_data)
+
+    def cached_process(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Answer a process() call from the score cache without running any model.
+        
+        Returns:
+            The same result as process(), or None if the pair is not cached
+        """
+        events = self.cached_events(input_data)
+        return None if events is None else self._assemble(events)
+
+    def cached_events(self, input_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer an iter_process() call from the score cache without running any model.
+        
+        Returns:
+            Every event iter_process() would yield, or None if the pair is not cached
+        """
+        if not self.validate_input(input_data):
+            raise ValueError("Invalid input data")
+        
+        # Only the job text is needed for the key; a stored profile's vectors are not decoded
+        job_text = self._resolve_job_text(input_data)
+        analysis = self.score_cache.get(ScoreCache.make_key(job_text, input_data['resume_text'], self.model_key))
+        if analysis is None or not self._covers(analysis, input_data.get('depth', 'full')):
+            return None
+        return list(self._events(self._replay(analysis), input_data))
+
+    @staticmethod
+    def _covers(analysis: Dict[str, Any], depth: str) -> bool:
+        """Check whether an analysis went at least as deep as requested."""
+        return DEPTHS.index(analysis['depth']) >= DEPTHS.index(depth)
+
+    def _resolve_job(self, input_data: Dict[str, Any]) -> Tuple[str, Optional[JobProfile]]:
+        """Get the job text and, if one is stored and up to date, its profile."""
+        job_id = input_data.get('job_id')
+        profile = None if job_id is None else self.job_profiles.get(job_id, self.model_key)
+        job_text = self._job_text(input_data, None if profile is None else profile.text)
+        return job_text, profile if profile is not None and profile.text == job_text else None
+
+    def _resolve_job_text(self, input_data: Dict[str, Any]) -> str:
+        """Get the job text as _resolve_job does, reading only the text of a stored profile."""
+        job_id = input_data.get('job_id')
+        stored_text = None if job_id is None else self.job_profiles.get_text(job_id, self.model_key)
+        return self._job_text(input_data, stored_text)
+
+    @staticmethod
+    def _job_text(input_data: Dict[str, Any], stored_text: Optional[str]) -> str:
+        # A description sent along with the id wins if the profile is out of date
+        if stored_text is not None and input_data.get('job_description', stored_text) == stored_text:
+            return stored_text
+        if input_data.get('job_id') is not None and 'job_description' not in input_data:
+            raise JobProfileNotFound(input_data['job_id'])
+        return input_data['job_description']
+
+    def _events(self, parts: Iterable[Tuple[str, Any]], input_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Turn the (name, value) parts of an analysis into iter_process() events."""
+        # A deeper cached analysis is trimmed to the sections the caller asked for
+        depth = DEPTHS.index(input_data.get('depth', 'full'))
+        for name, value in parts:
+            if name == 'scores':
+                yield {'event': 'scores', **self._combine(value, input_data)}
+            elif DEPTHS.index(SECTION_DEPTHS[name]) <= depth:
+                yield {'event': 'section', 'name': name, 'data': value}
+        yield {'event': 'done'}
+
+    @staticmethod
+    def _assemble(events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Collect iter_process() events into a process() result."""
+        result, sections = {}, {}
+        for event in events:
+            if event['event'] == 'scores':
+                result = {name: value for name, value in event.items() if name != 'event'}
+            elif event['event'] == 'section':
+                sections[event['name']] = event['data']
+        result['detailed_analysis'] = {name: sections[name] for name in SECTION_DEPTHS if name in sections}
+        return result
+
+    def _combine(self, scores: Dict[str, float], input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Weight the component scores of an analysis into the final score."""
+        if time.monotonic() - self._weights_checked > self.weights_refresh_seconds:
+            self.reload_weights()
+        version, learned = self.active_weights
+        # Per-request weights override the learned ones component by component
+        weights = {**learned, **(input_data.get('weights') or {})}
+        
+        final_score = sum(weights[name] * scores[f"{name}_score"] for name in COMPONENTS)
+        
+        return {
+            'final_score': final_score,
+            **scores,
+            # Keyed like the weights, ready to send back with feedback for weight learning
+            'component_scores': {name: scores[f"{name}_score"] for name in COMPONENTS},
+            'weights_version': version,
+            'depth': input_data.get('depth', 'full')
+        }
+
+    @staticmethod
+    def _replay(analysis: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+        """Parts of a cached analysis in the order _analyze_pair produced them."""
+        yield 'scores', analysis['scores']
+        yield from analysis['detailed_analysis'].items()
+
+    def _analyze_and_cache(self,
+                           key: str,
+                           job_description: str,
+                           resume_text: str,
+                           job_profile: Optional[JobProfile],
+                           depth: str) -> Iterator[Tuple[str, Any]]:
+        """Pass on the parts of a fresh analysis and cache it once complete."""
+        scores, sections = None, {}
+        for name, value in self._analyze_pair(job_description, resume_text, job_profile, depth):
+            if name == 'scores':
+                scores = value
+            else:
+                sections[name] = value
+            yield name, value
         
-        # Process texts
-        job_doc = self.nlp(job_desc.lower())
-        resume_doc = self.nlp(resume_text.lower())
+        # Sections stay in the order they were computed so a cached replay streams alike
+        self.score_cache.put(key, {'scores': scores, 'detailed_analysis': sections, 'depth': depth})
+
+    def _analyze_pair(self,
+                      job_description: str,
+                      resume_text: str,
+                      job_profile: Optional[JobProfile] = None,
+                      depth: str = 'full') -> Iterator[Tuple[str, Any]]:
+        """
+        Run the weight-independent analysis of a job/resume pair down to a depth.
+        
+        Yields ('scores', component scores) first, then (section name, section)
+        for each section of detailed_analysis as soon as it is computed.
+        """
+        def stage(name: str):
+            return self.metrics.timer('jobly_analysis_stage_seconds', stage=name)
+        
+        # Each document is parsed and analysed at most once per request
+        if job_profile is not None:
+            job = job_profile.to_context(self.nlp, self._encode, self.keyword_index, self._encode_fast)
+        else:
+            job = self.create_context(job_description)
+        resume = self.create_context(resume_text)
         
         # Get embeddings
-        job_embedding = self.transformer.encode([job_desc])[0]
-        resume_embedding = self.transformer.encode([resume_text])[0]
+        with stage('embeddings'):
+            DocumentContext.encode_all([job, resume])
         
-        # Core analysis
-        technical_score = self._analyze_technical_skills(job_doc, resume_doc)
-        experience_score = self._analyze_experience(job_doc, resume_doc)
-        semantic_score = float(cosine_similarity([job_embedding], [resume_embedding])[0][0])
+        # Core analysis; keyword search and the tokenizer are enough for the scores
+        with stage('technical'):
+            technical_score = self._analyze_technical_skills(job, resume)
+        with stage('experience'):
+            experience_score = self._analyze_experience(job, resume)
+            semantic_score = cosine(job.embedding, resume.embedding)
         
         # Advanced analysis
-        culture_score = self._analyze_culture_fit(job_doc, resume_doc)
-        future_score = self._analyze_future_readiness(resume_doc)
-        
-        # Calculate final score
-        final_score = (
-            weights['technical'] * technical_score +
-            weights['experience'] * experience_score +
-            weights['semantic'] * semantic_score +
-            weights['culture'] * culture_score +
-            weights['future'] * future_score
-        )
-        
-        # Generate detailed analysis
-        detailed_analysis = {
-            'skill_gaps': self._identify_skill_gaps(job_doc, resume_doc),
-            'experience_analysis': self._detailed_experience_analysis(job_doc, resume_doc),
-            'key_terms': self._analyze_key_terms(job_doc, resume_doc, job_embedding, resume_embedding),
-            'culture_analysis': self._detailed_culture_analysis(resume_doc),
-            'future_readiness': self._detailed_future_analysis(resume_doc),
-            'recommendations': self._generate_recommendations(job_doc, resume_doc)
-        }
+        with stage('culture_future'):
+            culture_score = self._analyze_culture_fit(job, resume)
+            future_score = self._analyze_future_readiness(resume)
         
-        return {
-            'final_score': final_score,
+        yield 'scores', {
             'technical_score': technical_score,
             'experience_score': experience_score,
             'semantic_score': semantic_score,
             'culture_score': culture_score,
-            'future_score': future_score,
-            'detailed_analysis': detailed_analysis
+            'future_score': future_score
         }
+        if depth == 'scores':
+            return
+        
+        # Generate detailed analysis, cheapest sections first
+        with stage('skill_gaps'):
+            skill_gaps = self._identify_skill_gaps(job, resume)
+        yield 'skill_gaps', skill_gaps
+        with stage('culture_future'):
+            culture_analysis = self._detailed_culture_analysis(resume)
+            future_readiness = self._detailed_future_analysis(resume)
+        yield 'culture_analysis', culture_analysis
+        yield 'future_readiness', future_readiness
+        with stage('recommendations'):
+            recommendations = self._generate_recommendations(skill_gaps, culture_analysis, future_readiness)
+        yield 'recommendations', recommendations
+        if depth == 'standard':
+            return
+        
+        # Only key terms and relevant experience need tags and sentences. A
+        # profiled job needs no parsing on the request path.
+        with stage('parse'):
+            DocumentContext.parse_all([resume] if job.has('noun_terms') else [job, resume])
+        with stage('key_terms'):
+            key_terms = self._analyze_key_terms(job, resume)
+        yield 'key_terms', key_terms
+        with stage('relevant_experience'):
+            experience_analysis = self._detailed_experience_analysis(job, resume)
+        yield 'experience_analysis', experience_analysis
 
-    def _analyze_culture_fit(self, job_doc, resume_doc) -> float:
+    def _analyze_culture_fit(self, job: DocumentContext, resume: DocumentContext) -> float:
         """Analyze cultural fit based on soft skills and values."""
         culture_scores = {}
-        resume_text = resume_doc.text.lower()
+        hits = resume.keyword_hits
         
         for category, indicators in self.culture_indicators.items():
-            category_matches = sum(1 for indicator in indicators if indicator in resume_text)
+            category_matches = len(hits.get('culture', category))
             category_score = category_matches / len(indicators)
             culture_scores[category] = category_score
         
         return np.mean(list(culture_scores.values()))
 
-    def _analyze_future_readiness(self, resume_doc) -> float:
+    def _analyze_future_readiness(self, resume: DocumentContext) -> float:
         """Analyze candidate's future readiness."""
         future_scores = {}
-        resume_text = resume_doc.text.lower()
+        hits = resume.keyword_hits
         
         for category, indicators in self.future_indicators.items():
-            category_matches = sum(1 for indicator in indicators if indicator in resume_text)
+            category_matches = len(hits.get('future', category))
             category_score = category_matches / len(indicators)
             future_scores[category] = category_score
         
         return np.mean(list(future_scores.values()))
 
-    def _detailed_culture_analysis(self, resume_doc) -> Dict[str, Any]:
+    def _detailed_culture_analysis(self, resume: DocumentContext) -> Dict[str, Any]:
         """Provide detailed culture fit analysis."""
         culture_details = {}
-        resume_text = resume_doc.text.lower()
+        hits = resume.keyword_hits
         
         for category, indicators in self.culture_indicators.items():
-            matched_indicators = [ind for ind in indicators if ind in resume_text]
+            matched_indicators = hits.get('culture', category)
             culture_details[category] = {
                 'score': len(matched_indicators) / len(indicators),
                 'matched_traits': matched_indicators
@@ -179,13 +471,13 @@ class ResumeAnalyzerAgent:
         
         return culture_details
 
-    def _detailed_future_analysis(self, resume_doc) -> Dict[str, Any]:
+    def _detailed_future_analysis(self, resume: DocumentContext) -> Dict[str, Any]:
         """Provide detailed future readiness analysis."""
         future_details = {}
-        resume_text = resume_doc.text.lower()
+        hits = resume.keyword_hits
         
         for category, indicators in self.future_indicators.items():
-            matched_indicators = [ind for ind in indicators if ind in resume_text]
+            matched_indicators = hits.get('future', category)
             future_details[category] = {
                 'score': len(matched_indicators) / len(indicators),
                 'matched_indicators': matched_indicators
@@ -193,7 +485,10 @@ class ResumeAnalyzerAgent:
         
         return future_details
 
-    def _generate_recommendations(self, job_doc, resume_doc) -> Dict[str, List[str]]:
+    def _generate_recommendations(self,
+                                  skill_gaps: Dict[str, List[str]],
+                                  culture_analysis: Dict[str, Any],
+                                  future_analysis: Dict[str, Any]) -> Dict[str, List[str]]:
         """Generate personalized recommendations for improvement."""
         recommendations = {
             'technical': [],
@@ -202,14 +497,12 @@ class ResumeAnalyzerAgent:
         }
         
         # Technical skill recommendations
-        skill_gaps = self._identify_skill_gaps(job_doc, resume_doc)
         if skill_gaps['missing_skills']:
             recommendations['technical'].extend([
                 f"Consider learning {skill}" for skill in skill_gaps['missing_skills'][:3]
             ])
         
         # Soft skills recommendations
-        culture_analysis = self._detailed_culture_analysis(resume_doc)
         weak_areas = [
             category for category, details in culture_analysis.items()
             if details['score'] < 0.3
@@ -220,7 +513,6 @@ class ResumeAnalyzerAgent:
             )
         
         # Future growth recommendations
-        future_analysis = self._detailed_future_analysis(resume_doc)
         growth_areas = [
             category for category, details in future_analysis.items()
             if details['score'] < 0.3
@@ -232,146 +524,90 @@ class ResumeAnalyzerAgent:
         
         return recommendations
 
-    def _analyze_technical_skills(self, job_doc, resume_doc) -> float:
+    def _analyze_technical_skills(self, job: DocumentContext, resume: DocumentContext) -> float:
         """Analyze technical skills match with semantic understanding."""
-        job_skills = self._extract_skills(job_doc)
-        resume_skills = self._extract_skills(resume_doc)
+        job_skills = job.skills
+        resume_skills = resume.skills
         
         if not job_skills:
             return 0.0
         
-        # Get embeddings for skills
-        job_skill_embeddings = self.transformer.encode([' '.join(job_skills)])[0]
-        resume_skill_embeddings = self.transformer.encode([' '.join(resume_skills)])[0]
-        
         # Calculate semantic similarity between skill sets
-        skill_similarity = float(cosine_similarity([job_skill_embeddings], [resume_skill_embeddings])[0][0])
+        DocumentContext.encode_all([job, resume], 'skills_embedding')
+        skill_similarity = cosine(job.skills_embedding, resume.skills_embedding)
         
         # Combine exact matches with semantic similarity
         exact_match_score = len(set(job_skills) & set(resume_skills)) / len(job_skills)
         return 0.7 * exact_match_score + 0.3 * skill_similarity
 
-    def _analyze_experience(self, job_doc, resume_doc) -> float:
+    def _analyze_experience(self, job: DocumentContext, resume: DocumentContext) -> float:
         """Analyze experience requirements match."""
-        year_terms = ['year', 'years', 'yr', 'yrs']
-        job_years = []
-        resume_years = []
-        
-        # Extract years from job description
-        for token in job_doc:
-            if token.like_num:
-                next_token = token.nbor() if token.i + 1 < len(token.doc) else None
-                if next_token and next_token.text.lower() in year_terms:
-                    job_years.append(float(token.text))
-        
-        # Extract years from resume
-        for token in resume_doc:
-            if token.like_num:
-                next_token = token.nbor() if token.i + 1 < len(token.doc) else None
-                if next_token and next_token.text.lower() in year_terms:
-                    resume_years.append(float(token.text))
-        
-        if not job_years:
+        if not job.years:
             return 1.0  # No specific experience requirement
         
-        required_years = max(job_years)
-        candidate_years = max(resume_years) if resume_years else 0
+        required_years = job.max_years
+        candidate_years = resume.max_years
         
         return min(candidate_years / required_years, 1.0) if required_years > 0 else 1.0
 
-    def _extract_skills(self, doc) -> List[str]:
-        """Extract skills from text."""
-        skills = []
-        text_lower = doc.text.lower()
-        
-        for category in self.common_skills.values():
-            for skill in category:
-                if skill.lower() in text_lower:
-                    skills.append(skill)
-        
-        return list(set(skills))
-
-    def _identify_skill_gaps(self, job_doc, resume_doc) -> Dict[str, List[str]]:
+    def _identify_skill_gaps(self, job: DocumentContext, resume: DocumentContext) -> Dict[str, List[str]]:
         """Identify skill gaps between job requirements and resume."""
-        job_skills = set(self._extract_skills(job_doc))
-        resume_skills = set(self._extract_skills(resume_doc))
+        job_skills = set(job.skills)
+        resume_skills = set(resume.skills)
         
         return {
             'missing_skills': list(job_skills - resume_skills),
             'additional_skills': list(resume_skills - job_skills)
         }
 
-    def _detailed_experience_analysis(self, job_doc, resume_doc) -> Dict[str, Any]:
+    def _detailed_experience_analysis(self, job: DocumentContext, resume: DocumentContext) -> Dict[str, Any]:
         """Analyze experience in detail."""
         return {
-            'relevant_experience': self._extract_relevant_experience(job_doc, resume_doc)
+            'relevant_experience': self._extract_relevant_experience(job, resume)
         }
 
-    def _extract_relevant_experience(self, job_doc, resume_doc) -> List[str]:
+    def _extract_relevant_experience(self, job: DocumentContext, resume: DocumentContext) -> List[str]:
         """Extract relevant experience snippets using semantic similarity."""
-        relevant_snippets = []
-        job_text = job_doc.text.lower()
-        
-        # Get job description embedding
-        job_embedding = self.transformer.encode([job_text])[0]
-        
-        # Analyze each sentence in resume
-        for sent in resume_doc.sents:
-            sent_text = sent.text.strip()
-            if len(sent_text.split()) < 5:  # Skip very short sentences
-                continue
-                
-            # Get sentence embedding
-            sent_embedding = self.transformer.encode([sent_text])[0]
-            
-            # Calculate similarity
-            similarity = float(cosine_similarity([job_embedding], [sent_embedding])[0][0])
-            
-            if similarity > 0.5:  # Threshold for relevance
-                relevant_snippets.append(sent_text)
+        # Collect resume sentences long enough to be meaningful
+        sentences = [sent.text.strip() for sent in resume.doc.sents]
+        sentences = [sent for sent in sentences if len(sent.split()) >= 5]
+        if not sentences:
+            return []
+        
+        # Encode all sentences in one length-sorted batch
+        job_embedding = job.embedding
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        sentence_embeddings = np.empty((len(sentences), len(job_embedding)), dtype=np.float32)
+        sentence_embeddings[order] = self._encode([sentences[i] for i in order])
+        
+        # Score every sentence against the job in one pass
+        similarities = normalize_rows(sentence_embeddings) @ normalize_rows([job_embedding])[0]
+        relevant = np.flatnonzero(similarities > 0.5)  # Threshold for relevance
+        relevant_snippets = [sentences[i] for i in relevant]
         
         return sorted(relevant_snippets, key=len, reverse=True)[:5]  # Return top 5 longest relevant snippets
 
-    def _analyze_key_terms(self, job_doc, resume_doc, job_embedding, resume_embedding) -> Dict[str, List[str]]:
+    def _analyze_key_terms(self, job: DocumentContext, resume: DocumentContext) -> Dict[str, List[str]]:
         """Analyze key terms match using transformer embeddings."""
-        # Extract important terms (nouns and proper nouns)
-        job_terms = [token.text.lower() for token in job_doc 
-                    if token.pos_ in ['NOUN', 'PROPN'] and len(token.text) > 2]
-        resume_terms = [token.text.lower() for token in resume_doc 
-                       if token.pos_ in ['NOUN', 'PROPN'] and len(token.text) > 2]
-        
-        # Get embeddings for terms
-        job_term_embeddings = {term: self.transformer.encode([term])[0] for term in job_terms}
-        resume_term_embeddings = {term: self.transformer.encode([term])[0] for term in resume_terms}
-        
-        matched_terms = []
-        missing_terms = []
-        
-        # Find semantic matches
-        for job_term, job_emb in job_term_embeddings.items():
-            best_match = None
-            best_score = 0
-            
-            for resume_term, resume_emb in resume_term_embeddings.items():
-                similarity = float(cosine_similarity([job_emb], [resume_emb])[0][0])
-                if similarity > best_score:
-                    best_score = similarity
-                    best_match = resume_term
-            
-            if best_score > 0.8:  # High similarity threshold
-                matched_terms.append(job_term)
-            else:
-                missing_terms.append(job_term)
-        
-        return {
-            'matched': matched_terms,
-            'missing': missing_terms
-        }
+        # Encode all unique terms at once and match them with one matrix product
+        known_vectors = job.term_vectors if job.has('term_vectors') else None
+        return self.key_term_matcher.match(job.noun_terms, resume.noun_terms, known_vectors)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the sentence transformer, reusing cached embeddings."""
+        return self.embedding_cache.encode(texts, self.model_registry.encoder(self.model_name),
+                                           self.model_registry.model_key(self.model_name))
+
+    def _encode_fast(self, texts: List[str]) -> np.ndarray:
+        """Encode short texts with the fast model, reusing cached embeddings."""
+        return self.embedding_cache.encode(texts, self.model_registry.encoder(self.fast_model_name),
+                                           self.model_registry.model_key(self.fast_model_name))
 
     def validate_input(self, input_data: Dict[str, Any]) -> bool:
         """Validate input data."""
-        required_fields = ['job_description', 'resume_text']
-        return all(field in input_data for field in required_fields)
+        return ('resume_text' in input_data
+                and ('job_description' in input_data or 'job_id' in input_data)
+                and input_data.get('depth', 'full') in DEPTHS)
 
     def get_capabilities(self) -> List[str]:
         """List agent capabilities."""
@@ -386,7 +622,61 @@ class ResumeAnalyzerAgent:
             "Future readiness analysis"
         ]
     
-    def learn(self, input_data: Dict[str, Any]) -> None:
-        """Learn from input data to improve future analysis.
-        This is a placeholder for future implementation of learning capabilities."""
-        pass
+    def learn(self, input_data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Refit the scoring weights to stored feedback and hot-swap them in.
+        
+        The fit runs over every feedback row recorded with component scores.
+        A new version is always stored, but only activated if it fits the
+        ratings at least as well as the current weights.
+        
+        Args:
+            input_data: Optional 'l2', 'min_samples' and 'activate' (default True)
+            
+        Returns:
+            Dict with 'version', 'weights', 'metrics' and 'active', or None if
+            there is not enough feedback to fit
+        """
+        if self.feedback_manager is None:
+            raise ValueError("learn() needs a feedback_manager in the agent config")
+        input_data = input_data or {}
+        
+        learner = WeightLearner(
+            l2=input_data.get('l2', 10.0),
+            min_samples=input_data.get('min_samples', 50),
+            prior=self.weights
+        )
+        result = learner.fit(self.feedback_manager.iter_component_feedback())
+        if result is None:
+            return None
+        
+        metrics = result['metrics']
+        activate = input_data.get('activate', True) and metrics['rmse'] <= metrics['prior_rmse']
+        version = self.feedback_manager.save_weights(result['weights'], metrics, activate=activate)
+        if activate:
+            self._weights = (version, {**DEFAULT_WEIGHTS, **result['weights']})
+        
+        return {'version': version, 'weights': result['weights'], 'metrics': metrics, 'active': activate}
+
+    def reload_weights(self) -> bool:
+        """
+        Swap in the active learned weights if they changed.
+        
+        Returns:
+            True if the weights were replaced
+        """
+        self._weights_checked = time.monotonic()
+        if self.feedback_manager is None:
+            return False
+        
+        try:
+            active = self.feedback_manager.get_active_weights()
+        except Exception as e:
+            print(f"Error loading learned weights: {e}")
+            return False
+        
+        if active is None or active['version'] == self.weights_version:
+            return False
+        # One reference assignment, so concurrent requests see either the old or the new pair
+        self._weights = (active['version'], {**DEFAULT_WEIGHTS, **active['weights']})
+        return True
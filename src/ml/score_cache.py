@@ -0,0 +1,102 @@
+"""
+Score Cache for Resume Matcher.
+Keeps the weight-independent analysis of (job, resume) pairs so re-weighting is pure arithmetic.
+"""
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+import time
+from .embedding_cache import EmbeddingCache
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL_SECONDS = 3600.0
+
+class ScoreCache:
+    """LRU cache with per-entry expiry, keyed by the content of a job/resume pair."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Number of pairs kept before the least recently used is evicted
+            ttl: Seconds an entry stays valid; 0 or less keeps entries until evicted
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    @staticmethod
+    def make_key(job_text: str, resume_text: str, model_name: str) -> str:
+        """Build the key for a job/resume pair analysed with a given model."""
+        payload = "\0".join([
+            model_name, EmbeddingCache.normalize(job_text), EmbeddingCache.normalize(resume_text)
+        ]).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an analysis; expired entries count as misses and are dropped."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            expires, value = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store an analysis. Cached values are shared between callers and must not be mutated."""
+        expires = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the number of entries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drop every entry and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+_shared_cache: Optional[ScoreCache] = None
+_shared_lock = threading.Lock()
+
+def get_score_cache() -> ScoreCache:
+    """
+    Get the process-wide score cache.
+
+    Size and expiry are configured with the JOBLY_SCORE_CACHE_SIZE and
+    JOBLY_SCORE_CACHE_TTL environment variables.
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ScoreCache(
+                max_entries=int(os.environ.get('JOBLY_SCORE_CACHE_SIZE', DEFAULT_MAX_ENTRIES)),
+                ttl=float(os.environ.get('JOBLY_SCORE_CACHE_TTL', DEFAULT_TTL_SECONDS))
+            )
+        return _shared_cache
@@ -0,0 +1,39 @@
+"""
+Tests for DocumentContext features.
+"""
+import pytest
+from src.ml.analysis_context import DocumentContext, parse_number
+
+@pytest.mark.parametrize('text, value', [
+    ('5', 5.0),
+    ('2.5', 2.5),
+    ('1,000', 1000.0),
+    ('two', 2.0),
+    ('Ten', 10.0),
+    ('first', None),
+    ('third', None),
+    ('1/2', None),
+    ('nan', None),
+])
+def test_parse_number(text, value):
+    assert parse_number(text) == value
+
+@pytest.fixture(scope='module')
+def nlp():
+    spacy = pytest.importorskip('spacy')
+    return spacy.blank('en')
+
+def context(nlp, text: str) -> DocumentContext:
+    # years only tokenizes, so no encoder is needed
+    return DocumentContext(text, nlp, encoder=None)
+
+@pytest.mark.parametrize('text, years', [
+    ('Senior engineer with 7 years of Python.', [7.0]),
+    ('Two years of experience with Docker and 3 yrs of Go.', [2.0, 3.0]),
+    ('Mentored interns through their first year on the team.', []),
+    ('In my third year I led the migration.', []),
+])
+def test_years_with_number_words(nlp, text, years):
+    resume = context(nlp, text)
+    assert resume.years == years
+    assert resume.max_years == max(years, default=0.0)
@@ -0,0 +1,35 @@
+"""
+Tests for the feedback endpoints of the ML API.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from src.ml import api
+from src.ml.feedback_manager import FeedbackManager
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    manager = FeedbackManager(str(tmp_path / 'feedback.db'), read_pool_size=1)
+    monkeypatch.setattr(api, 'get_feedback_manager', lambda: manager)
+    # Without the context manager the lifespan, and so the model warm-up, never runs
+    yield TestClient(api.app)
+    manager.close()
+
+def test_batch_reports_bad_timestamps_per_record(client):
+    records = [
+        {'job_id': 'j', 'resume_id': f"r{i}", 'match_score': 0.5, 'user_rating': 4,
+         'timestamp': '2024-01-15T10:00:00Z'}
+        for i in range(3)
+    ]
+    records.append({'job_id': 'j', 'resume_id': 'bad', 'match_score': 0.5, 'user_rating': 4,
+                    'timestamp': 'not-a-date'})
+
+    response = client.post('/feedback/batch', json={'records': records})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['recorded'], body['failed']) == (3, 1)
+    assert body['results'][3]['index'] == 3 and not body['results'][3]['success']
+    assert 'Invalid timestamp' in body['results'][3]['error']
+    history = client.get('/feedback/history').json()
+    assert sorted(record['resume_id'] for record in history) == ['r0', 'r1', 'r2']
+    assert {record['timestamp'] for record in history} == {'2024-01-15 10:00:00'}
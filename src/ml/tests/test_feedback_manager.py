@@ -0,0 +1,128 @@
+"""
+Tests for FeedbackManager writes and the trigger-maintained rollups.
+"""
+import pytest
+from src.ml.feedback_manager import FeedbackManager, normalize_timestamp
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = FeedbackManager(str(tmp_path / 'feedback.db'), read_pool_size=1)
+    yield manager
+    manager.close()
+
+def rollups(manager: FeedbackManager):
+    with manager._read('test_rollups') as cursor:
+        return {
+            'total': cursor.execute(
+                'SELECT feedback_count, rating_count, rating_sum FROM feedback_rollup'
+            ).fetchone(),
+            'monthly': cursor.execute(
+                'SELECT month, feedback_count, rating_count, rating_sum FROM feedback_monthly_rollup '
+                'WHERE feedback_count > 0 ORDER BY month'
+            ).fetchall(),
+            'categories': cursor.execute(
+                'SELECT category, row_count, score_count, score_sum FROM feedback_category_rollup '
+                'WHERE row_count > 0 ORDER BY category'
+            ).fetchall(),
+        }
+
+def test_rerating_a_pair_updates_rollups(manager):
+    assert manager.record_feedback('j', 'r', 0.5, 4, feedback_categories={'skills': 0.8})
+    assert manager.record_feedback('j', 'r', 0.5, 2, feedback_categories={'skills': 0.3, 'culture': 0.5})
+
+    stats = manager.get_feedback_stats()
+    assert stats['total_feedback'] == 1
+    assert stats['average_rating'] == 2.0
+
+    before = rollups(manager)
+    assert before['total'] == (1, 1, 2.0)
+    assert [(count, ratings, total) for _, count, ratings, total in before['monthly']] == [(1, 1, 2.0)]
+    assert before['categories'] == [('culture', 1, 1, 0.5), ('skills', 1, 1, 0.3)]
+
+    # Incremental rollups agree with a full rebuild
+    manager.rebuild_rollups()
+    assert rollups(manager) == before
+
+def test_rerating_moves_the_pair_between_months(manager):
+    manager.record_feedback_batch([{
+        'job_id': 'j', 'resume_id': 'r', 'match_score': 0.5, 'user_rating': 5, 'timestamp': '2024-01-15 10:00:00'
+    }])
+    manager.record_feedback_batch([{
+        'job_id': 'j', 'resume_id': 'r', 'match_score': 0.5, 'user_rating': 3, 'timestamp': '2024-02-01 09:30:00'
+    }])
+
+    assert rollups(manager)['monthly'] == [('2024-02', 1, 1, 3.0)]
+    assert manager.analyze_feedback_trends()['monthly_trends'] == [
+        {'month': '2024-02', 'avg_rating': 3.0, 'feedback_count': 1}
+    ]
+
+def test_batch_with_repeated_pair_keeps_last_record(manager):
+    statuses = manager.record_feedback_batch([
+        {'job_id': 'j', 'resume_id': 'r', 'match_score': 0.5, 'user_rating': 1},
+        {'job_id': 'j', 'resume_id': 'r', 'match_score': 0.5, 'user_rating': 5},
+        {'job_id': 'j', 'resume_id': 'other', 'match_score': 0.5, 'user_rating': 3},
+    ])
+
+    assert all(status['success'] for status in statuses)
+    assert rollups(manager)['total'] == (2, 2, 8.0)
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-01-15 10:00:00', '2024-01-15 10:00:00'),
+    ('2024-01-15T10:00:00', '2024-01-15 10:00:00'),
+    ('2024-01-15T10:00:00.250Z', '2024-01-15 10:00:00'),
+    ('2024-01-15T12:00:00+02:00', '2024-01-15 10:00:00'),
+    ('2024-01-15', '2024-01-15 00:00:00'),
+])
+def test_normalize_timestamp(value, expected):
+    assert normalize_timestamp(value) == expected
+
+def test_backfill_timestamps_are_normalized_or_rejected(manager):
+    statuses = manager.record_feedback_batch([
+        {'job_id': 'j', 'resume_id': 'a', 'match_score': 0.5, 'user_rating': 4, 'timestamp': 'yesterday'},
+        {'job_id': 'j', 'resume_id': 'b', 'match_score': 0.5, 'user_rating': 4, 'timestamp': '2024-01-15T10:00:00Z'},
+        {'job_id': 'j', 'resume_id': 'c', 'match_score': 0.5, 'user_rating': 4, 'timestamp': '2024-01-15 09:00:00'},
+    ])
+
+    assert [status['success'] for status in statuses] == [False, True, True]
+    assert 'Invalid timestamp' in statuses[0]['error']
+    history = manager.get_feedback_history()
+    assert [(record['resume_id'], record['timestamp']) for record in history] == [
+        ('b', '2024-01-15 10:00:00'), ('c', '2024-01-15 09:00:00')
+    ]
+    assert rollups(manager)['monthly'] == [('2024-01', 2, 2, 8.0)]
+
+def test_migration_normalizes_stored_timestamps(tmp_path):
+    path = str(tmp_path / 'feedback.db')
+    manager = FeedbackManager(path, read_pool_size=1)
+    with manager._write('test_legacy_row') as cursor:
+        cursor.execute(
+            "INSERT INTO feedback (job_id, resume_id, match_score, user_rating, timestamp) "
+            "VALUES ('j', 'r', 0.5, 4, '2024-01-15T10:00:00')"
+        )
+        cursor.execute('PRAGMA user_version = 3')
+    manager.close()
+
+    migrated = FeedbackManager(path, read_pool_size=1)
+    try:
+        assert migrated.get_feedback_history()[0]['timestamp'] == '2024-01-15 10:00:00'
+        assert rollups(migrated)['monthly'] == [('2024-01', 1, 1, 4.0)]
+    finally:
+        migrated.close()
+
+def test_suggestions_share_one_schema(manager):
+    manager.record_feedback_batch([
+        {'job_id': 'j', 'resume_id': f"r{i}", 'match_score': 0.5, 'user_rating': 2,
+         'feedback_categories': {'skills': 0.2}}
+        for i in range(10)
+    ])
+    manager.save_theme_state('model', None, [{
+        'theme_id': 0, 'label': 'salary range', 'size': 4, 'centroid': b'',
+        'snippets': ['salary was wrong'], 'terms': {}
+    }])
+
+    suggestions = manager.get_improvement_suggestions()
+    assert [(entry['category'], entry['theme']) for entry in suggestions] == [
+        ('skills', None), ('theme', 'salary range')
+    ]
+    assert all(entry.keys() == suggestions[0].keys() for entry in suggestions)
+    assert suggestions[1]['examples'] == ['salary was wrong']
@@ -0,0 +1,37 @@
+"""
+Tests for InferenceExecutor worker set-up.
+"""
+import asyncio
+import os
+from src.ml.inference_executor import InferenceExecutor
+
+INITIALIZED = []
+
+def _initialize() -> None:
+    INITIALIZED.append(os.getpid())
+
+def _initialized_here():
+    return os.getpid(), list(INITIALIZED)
+
+def test_process_workers_run_the_initializer_before_any_call():
+    executor = InferenceExecutor(max_workers=2, kind='process', initializer=_initialize)
+
+    async def run_all():
+        return await asyncio.gather(*(executor.run(_initialized_here) for _ in range(8)))
+
+    try:
+        results = asyncio.run(run_all())
+    finally:
+        executor.shutdown()
+
+    # Every worker that served a call ran the initializer exactly once, first
+    assert all(initialized == [pid] for pid, initialized in results)
+    assert INITIALIZED == []
+
+def test_thread_workers_skip_the_initializer():
+    executor = InferenceExecutor(max_workers=2, kind='thread', initializer=_initialize)
+    try:
+        pid, initialized = asyncio.run(executor.run(_initialized_here))
+    finally:
+        executor.shutdown()
+    assert (pid, initialized) == (os.getpid(), [])
@@ -0,0 +1,57 @@
+"""
+Parity tests for KeyTermMatcher against the pairwise cosine loop it replaced.
+"""
+import random
+import zlib
+import numpy as np
+import pytest
+from src.ml.key_terms import KeyTermMatcher
+
+# Reference implementation: the original key term loop of ResumeAnalyzerAgent
+def reference_key_terms(encode, job_terms, resume_terms, threshold=0.8):
+    job_embeddings = {term: encode([term])[0] for term in job_terms}
+    resume_embeddings = {term: encode([term])[0] for term in resume_terms}
+    matched, missing = [], []
+    for job_term, job_embedding in job_embeddings.items():
+        best_score = 0
+        for resume_embedding in resume_embeddings.values():
+            similarity = float(job_embedding @ resume_embedding /
+                               (np.linalg.norm(job_embedding) * np.linalg.norm(resume_embedding)))
+            best_score = max(best_score, similarity)
+        (matched if best_score > threshold else missing).append(job_term)
+    return {'matched': matched, 'missing': missing}
+
+def fake_encoder(dim=16):
+    """Deterministic term vectors; terms sharing a prefix get nearly identical vectors."""
+    def vector(term):
+        rng = np.random.default_rng(zlib.crc32(term[:4].encode('utf-8')))
+        noise = np.random.default_rng(zlib.crc32(term.encode('utf-8'))).normal(scale=0.3, size=dim)
+        return rng.normal(size=dim) + noise
+
+    def encode(terms):
+        return np.stack([vector(term) for term in terms]) if terms else np.zeros((0, dim))
+    return encode
+
+@pytest.mark.parametrize('seed', range(20))
+def test_key_term_matcher_matches_pairwise_loop(seed):
+    rng = random.Random(seed)
+    vocabulary = ['python', 'pythonic', 'docker', 'dockerfile', 'kubernetes', 'kube', 'team', 'teams',
+                  'leadership', 'leader', 'cloud', 'clouds', 'testing', 'tests', 'design', 'designer']
+    job_terms = [rng.choice(vocabulary) for _ in range(rng.randint(1, 12))]
+    resume_terms = [rng.choice(vocabulary) for _ in range(rng.randint(1, 12))]
+    encode = fake_encoder()
+
+    expected = reference_key_terms(encode, job_terms, resume_terms)
+    assert KeyTermMatcher(encode).match(job_terms, resume_terms) == expected
+
+    # Precomputed job term vectors, as a job profile supplies them, give the same result
+    known = {term: encode([term])[0] for term in job_terms}
+    assert KeyTermMatcher(encode).match(job_terms, resume_terms, known) == expected
+
+def test_key_term_matcher_edge_cases():
+    encode = fake_encoder()
+    matcher = KeyTermMatcher(encode)
+    assert matcher.match([], ['python']) == {'matched': [], 'missing': []}
+    assert matcher.match(['python', 'python'], []) == {'matched': [], 'missing': ['python']}
+    assert matcher.match(['python', 'docker', 'python'], ['python']) == \
+        reference_key_terms(encode, ['python', 'docker'], ['python'])
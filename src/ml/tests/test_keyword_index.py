@@ -0,0 +1,57 @@
+"""
+Parity tests for KeywordIndex against the per-keyword substring loops it replaced.
+"""
+import random
+import pytest
+from src.ml.keyword_index import KeywordIndex
+from src.ml.resume_analyzer_agent import ResumeAnalyzerAgent
+
+# Reference implementations: the original matching loops of ResumeAnalyzerAgent
+def reference_skills(common_skills, text):
+    text_lower = text.lower()
+    return {skill for category in common_skills.values() for skill in category if skill.lower() in text_lower}
+
+def reference_indicators(indicators, text):
+    text_lower = text.lower()
+    return {category: [indicator for indicator in terms if indicator in text_lower]
+            for category, terms in indicators.items()}
+
+@pytest.fixture(scope='module')
+def agent():
+    # Dictionaries only; models and stores are opened lazily and never touched here
+    return ResumeAnalyzerAgent('test')
+
+def random_texts(dictionaries, count=200, seed=0):
+    """Texts mixing dictionary keywords, their fragments and filler, in random case."""
+    rng = random.Random(seed)
+    keywords = [keyword for categories in dictionaries.values()
+                for terms in categories.values() for keyword in terms]
+    filler = ['with', 'the', 'team', 'years', 'built', 'a', 'of', 'and', '-', '.', ',', '\n']
+    texts = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(0, 40)):
+            word = rng.choice(keywords) if rng.random() < 0.4 else rng.choice(filler)
+            if rng.random() < 0.1:
+                word = word[:rng.randint(1, len(word))]
+            words.append(word.upper() if rng.random() < 0.2 else word)
+        texts.append(rng.choice([' ', '', '/']).join(words))
+    return texts
+
+def test_keyword_index_matches_substring_loops(agent):
+    dictionaries = {'skills': agent.common_skills, 'culture': agent.culture_indicators,
+                    'future': agent.future_indicators}
+    index = KeywordIndex(dictionaries)
+    for text in random_texts(dictionaries) + ['', 'javascript', 'TypeScript and Java', 'aws' * 3]:
+        hits = index.search(text)
+        assert set(hits.terms('skills')) == reference_skills(agent.common_skills, text), text
+        for group in ('culture', 'future'):
+            expected = reference_indicators(dictionaries[group], text)
+            assert {category: hits.get(group, category) for category in expected} == expected, text
+
+def test_keyword_index_reports_shared_keywords_everywhere():
+    index = KeywordIndex({'a': {'x': ['lead', 'go'], 'y': ['Lead']}, 'b': {'z': ['lead', '']}})
+    hits = index.search('They LEAD teams')
+    assert hits.group('a') == {'x': ['lead'], 'y': ['Lead']}
+    assert hits.get('b', 'z') == ['lead']
+    assert hits.terms('a') == ['lead', 'Lead']
@@ -0,0 +1,69 @@
+"""
+Tests for VectorIndex persistence and CandidateRetriever shortlisting.
+"""
+import numpy as np
+import pytest
+from src.ml.vector_index import INDEX_FILE, CandidateRetriever, VectorIndex
+
+def random_vectors(count: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+
+@pytest.mark.parametrize('train_threshold', [1024, 16])
+def test_save_and_load_round_trip(tmp_path, train_threshold):
+    index = VectorIndex(n_probe=64, train_threshold=train_threshold)
+    vectors = random_vectors(40)
+    index.add_many([f"r{i}" for i in range(40)], vectors)
+    index.remove('r3')
+    index.save(str(tmp_path))
+
+    # One file, switched in by a single rename, and no temporary files left behind
+    assert [path.name for path in tmp_path.iterdir()] == [INDEX_FILE]
+
+    loaded = VectorIndex.load(str(tmp_path))
+    assert len(loaded) == 39 and 'r3' not in loaded
+    assert loaded.is_trained == index.is_trained
+    assert loaded.search(vectors[7], k=3) == index.search(vectors[7], k=3)
+    assert loaded.search(vectors[7], k=1)[0][0] == 'r7'
+
+def test_save_replaces_previous_copy(tmp_path):
+    index = VectorIndex()
+    index.add('a', random_vectors(1)[0])
+    index.save(str(tmp_path))
+    index.add('b', random_vectors(1, seed=1)[0])
+    index.save(str(tmp_path))
+
+    assert sorted(VectorIndex.load(str(tmp_path))._row_of) == ['a', 'b']
+
+class FakeAgent:
+    def __init__(self):
+        self.calls = []
+
+    def process(self, input_data):
+        self.calls.append(input_data)
+        return {'final_score': len(input_data['resume_text'])}
+
+def test_retriever_shortlists_then_ranks(tmp_path):
+    vectors = np.eye(4, dtype=np.float32)
+    retriever = CandidateRetriever(encoder=None, index_dir=str(tmp_path))
+    retriever.upsert_resumes({'near': 'x', 'close': 'xx', 'far': 'xxx'},
+                             np.stack([vectors[0], vectors[0] + 0.5 * vectors[1], vectors[2]]))
+    retriever.upsert_jobs({'job': 'description'}, vectors[:1])
+    assert retriever.dirty
+
+    shortlist = retriever.top_resumes_for_job('job', k=2)
+    assert [resume_id for resume_id, _ in shortlist] == ['near', 'close']
+
+    agent = FakeAgent()
+    results = CandidateRetriever.rank_shortlist(agent, {'job_id': 'job'}, shortlist,
+                                                {'near': 'x', 'close': 'xx', 'far': 'xxx'}, depth='scores')
+    # Only the shortlist is analysed, and results are ordered by final_score
+    assert [result['resume_id'] for result in results] == ['close', 'near']
+    assert [call['depth'] for call in agent.calls] == ['scores', 'scores']
+
+    retriever.save()
+    assert not retriever.dirty
+    reopened = CandidateRetriever(encoder=None, index_dir=str(tmp_path))
+    assert reopened.top_resumes_for_job('job', k=2) == shortlist
+    assert reopened.top_jobs_for_resume('far', k=1)[0][0] == 'job'
+    with pytest.raises(KeyError):
+        reopened.top_resumes_for_job('missing')
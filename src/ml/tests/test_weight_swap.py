@@ -0,0 +1,39 @@
+"""
+Tests for hot-swapping learned weights in ResumeAnalyzerAgent.
+"""
+from src.ml.resume_analyzer_agent import ResumeAnalyzerAgent
+from src.ml.weight_learning import COMPONENTS
+
+class FakeFeedbackManager:
+    def __init__(self):
+        self.active = None
+
+    def get_active_weights(self):
+        return self.active
+
+def only(component):
+    return {name: float(name == component) for name in COMPONENTS}
+
+SCORES = {f"{name}_score": 0.1 * (index + 1) for index, name in enumerate(COMPONENTS)}
+
+def test_scores_are_labelled_with_the_weights_that_produced_them():
+    manager = FakeFeedbackManager()
+    agent = ResumeAnalyzerAgent('test', {'feedback_manager': manager, 'weights_refresh_seconds': -1})
+    assert agent.active_weights[0] is None
+
+    for version, component in ((1, 'technical'), (2, 'future')):
+        manager.active = {'version': version, 'weights': only(component)}
+        result = agent._combine(SCORES, {})
+        assert result['weights_version'] == version
+        assert result['final_score'] == SCORES[f"{component}_score"]
+        assert agent.active_weights == (version, only(component))
+        assert (agent.weights_version, agent.weights) == agent.active_weights
+
+def test_request_weights_override_learned_ones():
+    manager = FakeFeedbackManager()
+    manager.active = {'version': 3, 'weights': only('technical')}
+    agent = ResumeAnalyzerAgent('test', {'feedback_manager': manager})
+
+    result = agent._combine(SCORES, {'weights': {'technical': 0.0, 'semantic': 1.0}})
+    assert result['final_score'] == SCORES['semantic_score']
+    assert result['weights_version'] == 3
@@ -0,0 +1,465 @@
+"""
+Vector Index for Resume Matcher.
+Approximate nearest-neighbour retrieval over resume and job embeddings.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import threading
+from pathlib import Path
+import numpy as np
+from .embedding_store import EmbeddingStore
+from .key_terms import normalize_rows
+
+# Single file holding a saved index, so a save is switched in with one rename
+INDEX_FILE = 'index.npz'
+
+class VectorIndex:
+    """
+    Inverted-file (IVF) index with cosine scoring.
+
+    Vectors are clustered around k-means centroids; a query only scans the
+    n_probe closest clusters, so search cost grows sub-linearly with the
+    number of stored vectors. Until train_threshold vectors are stored the
+    index falls back to exact search.
+    """
+
+    def __init__(self,
+                 dim: Optional[int] = None,
+                 n_lists: Optional[int] = None,
+                 n_probe: int = 8,
+                 train_threshold: int = 1024,
+                 seed: int = 0):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Vector dimension, inferred from the first added vector if omitted
+            n_lists: Number of clusters, defaults to sqrt(n) at training time
+            n_probe: Number of clusters scanned per query
+            train_threshold: Number of vectors at which clustering kicks in
+            seed: Random seed for k-means initialisation
+        """
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_threshold = train_threshold
+        self.seed = seed
+
+        self._vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        self._size = 0
+        self._ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._assignment = np.zeros(0, dtype=np.int32)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._trained_size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._row_of
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        """Get the stored (normalized) vector for an id."""
+        with self._lock:
+            row = self._row_of.get(item_id)
+            return None if row is None else self._vectors[row].copy()
+
+    def add(self, item_id: str, vector: np.ndarray) -> None:
+        """Add or replace a single vector."""
+        self.add_many([item_id], np.asarray(vector)[None, :])
+
+    def add_many(self, item_ids: Iterable[str], vectors: np.ndarray) -> None:
+        """Add or replace vectors; existing ids are updated in place of their old vector."""
+        item_ids = list(item_ids)
+        vectors = normalize_rows(np.atleast_2d(vectors))
+        if len(item_ids) != len(vectors):
+            raise ValueError("item_ids and vectors must have the same length")
+        if not item_ids:
+            return
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+            for item_id in item_ids:
+                self._remove_locked(item_id)
+
+            start = self._size
+            self._reserve(start + len(item_ids))
+            self._vectors[start:start + len(item_ids)] = vectors
+            self._alive[start:start + len(item_ids)] = True
+            self._size += len(item_ids)
+            for offset, item_id in enumerate(item_ids):
+                self._ids.append(item_id)
+                self._row_of[item_id] = start + offset
+
+            rows = np.arange(start, self._size)
+            if self.is_trained:
+                self._assign(rows)
+
+            # Cluster once there is enough data, and re-cluster as the index grows
+            if (not self.is_trained and len(self) >= self.train_threshold) or \
+               (self.is_trained and len(self) >= 4 * self._trained_size):
+                self.train()
+
+    def remove(self, item_id: str) -> bool:
+        """Remove a vector by id. Returns False if the id was not present."""
+        with self._lock:
+            return self._remove_locked(item_id)
+
+    def search(self, vector: np.ndarray, k: int = 10,
+               exclude: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Find the k most similar stored vectors.
+
+        Args:
+            vector: Query vector
+            k: Number of results
+            exclude: Optional ids to leave out of the results
+
+        Returns:
+            List of (id, cosine similarity) pairs, best first
+        """
+        query = normalize_rows(np.atleast_2d(vector))[0]
+        excluded = set(exclude or ())
+
+        with self._lock:
+            if not len(self):
+                return []
+
+            if self.is_trained:
+                n_probe = min(self.n_probe, len(self._centroids))
+                probe = np.argpartition(-(self._centroids @ query), n_probe - 1)[:n_probe]
+                rows = np.fromiter(
+                    (row for cluster in probe for row in self._lists[cluster]),
+                    dtype=np.int64
+                )
+                rows = rows[self._alive[rows]]
+            else:
+                rows = np.flatnonzero(self._alive[:self._size])
+
+            if excluded:
+                rows = np.array([row for row in rows if self._ids[row] not in excluded], dtype=np.int64)
+            if not len(rows):
+                return []
+
+            scores = self._vectors[rows] @ query
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self._ids[rows[i]], float(scores[i])) for i in top]
+
+    def train(self, iterations: int = 10) -> None:
+        """Cluster the stored vectors with spherical k-means and rebuild the inverted lists."""
+        with self._lock:
+            self._compact()
+            if not self._size:
+                return
+
+            n_lists = self.n_lists or int(np.sqrt(self._size))
+            n_lists = max(1, min(n_lists, self._size))
+            rng = np.random.default_rng(self.seed)
+            data = self._vectors[:self._size]
+
+            centroids = data[rng.choice(self._size, n_lists, replace=False)].copy()
+            for _ in range(iterations):
+                assignment = self._nearest(data, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, data)
+                # Re-seed empty clusters from random points
+                empty = np.bincount(assignment, minlength=n_lists) == 0
+                sums[empty] = data[rng.choice(self._size, int(empty.sum()))]
+                centroids = normalize_rows(sums)
+
+            self._centroids = centroids
+            self._trained_size = self._size
+            self._lists = [[] for _ in range(n_lists)]
+            self._assign(np.arange(self._size))
+
+    def save(self, path: str) -> None:
+        """
+        Persist the index to a directory, replacing any previous copy atomically.
+
+        Vectors, clustering and metadata go into a single index.npz, written to a
+        temporary file and switched in with one rename, so readers never see a
+        mix of old and new state.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._compact()
+            arrays = {
+                'vectors': self._vectors[:self._size],
+                'assignment': self._assignment[:self._size],
+            }
+            if self._centroids is not None:
+                arrays['centroids'] = self._centroids
+            meta = {
+                'dim': self.dim,
+                'n_lists': self.n_lists,
+                'n_probe': self.n_probe,
+                'train_threshold': self.train_threshold,
+                'seed': self.seed,
+                'trained_size': self._trained_size,
+                'ids': self._ids[:self._size],
+            }
+            arrays['meta'] = np.array(json.dumps(meta))
+
+        tmp_path = path / f"index.{os.getpid()}.{threading.get_ident()}.npz.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path / INDEX_FILE)
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        """Whether a saved index is present in a directory."""
+        return (Path(path) / INDEX_FILE).exists()
+
+    @classmethod
+    def load(cls, path: str) -> 'VectorIndex':
+        """Load an index previously written with save()."""
+        with np.load(Path(path) / INDEX_FILE, allow_pickle=False) as arrays:
+            meta = json.loads(str(arrays['meta']))
+            index = cls(dim=meta['dim'], n_lists=meta['n_lists'], n_probe=meta['n_probe'],
+                        train_threshold=meta['train_threshold'], seed=meta['seed'])
+            vectors = arrays['vectors']
+            index._vectors = np.array(vectors, dtype=np.float32).reshape(len(vectors), meta['dim'] or 0)
+            index._assignment = np.array(arrays['assignment'], dtype=np.int32)
+            if 'centroids' in arrays:
+                index._centroids = np.array(arrays['centroids'], dtype=np.float32)
+
+        index._size = len(index._vectors)
+        index._ids = list(meta['ids'])
+        index._row_of = {item_id: row for row, item_id in enumerate(index._ids)}
+        index._alive = np.ones(index._size, dtype=bool)
+        index._trained_size = meta['trained_size']
+        if index._centroids is not None:
+            index._lists = [[] for _ in range(len(index._centroids))]
+            for row, cluster in enumerate(index._assignment.tolist()):
+                index._lists[cluster].append(row)
+        return index
+
+    def _remove_locked(self, item_id: str) -> bool:
+        row = self._row_of.pop(item_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._ids[row] = None
+        return True
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the backing arrays geometrically."""
+        if capacity <= len(self._vectors):
+            return
+        new_capacity = max(capacity, 2 * len(self._vectors), 64)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        assignment = np.zeros(new_capacity, dtype=np.int32)
+        assignment[:self._size] = self._assignment[:self._size]
+        self._vectors, self._alive, self._assignment = vectors, alive, assignment
+
+    def _compact(self) -> None:
+        """Drop deleted rows from the backing arrays."""
+        live = np.flatnonzero(self._alive[:self._size])
+        if len(live) == self._size:
+            return
+        self._vectors = self._vectors[live].copy()
+        self._alive = np.ones(len(live), dtype=bool)
+        self._assignment = self._assignment[live].copy()
+        self._ids = [self._ids[row] for row in live]
+        self._row_of = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._size = len(live)
+        if self._centroids is not None:
+            self._lists = [[] for _ in range(len(self._centroids))]
+            for row, cluster in enumerate(self._assignment):
+                self._lists[cluster].append(row)
+
+    def _assign(self, rows: np.ndarray) -> None:
+        """Assign rows to their nearest centroid and append them to its inverted list."""
+        clusters = self._nearest(self._vectors[rows], self._centroids)
+        self._assignment[rows] = clusters
+        for row, cluster in zip(rows.tolist(), clusters.tolist()):
+            self._lists[cluster].append(row)
+
+    @staticmethod
+    def _nearest(data: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+        """Index of the most similar centroid for every row, computed in chunks."""
+        result = np.empty(len(data), dtype=np.int32)
+        for start in range(0, len(data), chunk_size):
+            result[start:start + chunk_size] = (data[start:start + chunk_size] @ centroids.T).argmax(axis=1)
+        return result
+
+class CandidateRetriever:
+    def __init__(self,
+                 encoder: Callable[[List[str]], np.ndarray],
+                 index_dir: Optional[str] = None,
+                 store_dir: Optional[str] = None,
+                 store_dtype: str = 'float16',
+                 readonly: bool = False,
+                 **index_options):
+        """
+        Initialize resume and job indexes.
+
+        Args:
+            encoder: Callable that encodes a list of texts into a 2D array,
+                e.g. NLPAnalyzer.encode or ResumeAnalyzerAgent._encode
+            index_dir: Optional directory the indexes are loaded from and saved to
+            store_dir: Optional directory of memory-mapped EmbeddingStores to use
+                instead of in-memory indexes, shared by every worker process
+            store_dtype: 'float16' or 'int8' for new stores
+            readonly: Open the stores read-only, e.g. in serving workers
+            index_options: Extra keyword arguments for new VectorIndex instances
+        """
+        self.encoder = encoder
+        self.index_dir = Path(index_dir) if index_dir else None
+        self.store_dir = Path(store_dir) if store_dir else None
+        self._dirty = False
+        if self.store_dir is not None:
+            self.resumes = EmbeddingStore(str(self.store_dir / 'resumes'), dtype=store_dtype, readonly=readonly)
+            self.jobs = EmbeddingStore(str(self.store_dir / 'jobs'), dtype=store_dtype, readonly=readonly)
+        else:
+            self.resumes = self._load_index('resumes', index_options)
+            self.jobs = self._load_index('jobs', index_options)
+
+    def _load_index(self, name: str, index_options: Dict[str, Any]) -> VectorIndex:
+        if self.index_dir is not None and VectorIndex.exists(str(self.index_dir / name)):
+            return VectorIndex.load(str(self.index_dir / name))
+        return VectorIndex(**index_options)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether in-memory indexes have changes not yet written by save()."""
+        return self._dirty
+
+    def upsert_resumes(self, resumes: Dict[str, str], vectors: Optional[np.ndarray] = None) -> None:
+        """
+        Add or update resumes, given as id -> text.
+
+        Args:
+            resumes: Resume id -> text
+            vectors: Optional embeddings of the texts, in the same order, e.g.
+                computed on an inference worker; encoded here if omitted
+        """
+        if resumes:
+            self.resumes.add_many(resumes.keys(), self._vectors(resumes, vectors))
+            self._dirty = True
+
+    def upsert_jobs(self, jobs: Dict[str, str], vectors: Optional[np.ndarray] = None) -> None:
+        """Add or update jobs, given as id -> description. vectors as in upsert_resumes."""
+        if jobs:
+            self.jobs.add_many(jobs.keys(), self._vectors(jobs, vectors))
+            self._dirty = True
+
+    def _vectors(self, texts: Dict[str, str], vectors: Optional[np.ndarray]) -> np.ndarray:
+        return self.encoder(list(texts.values())) if vectors is None else vectors
+
+    def remove_resume(self, resume_id: str) -> bool:
+        removed = self.resumes.remove(resume_id)
+        self._dirty = self._dirty or removed
+        return removed
+
+    def remove_job(self, job_id: str) -> bool:
+        removed = self.jobs.remove(job_id)
+        self._dirty = self._dirty or removed
+        return removed
+
+    def top_resumes_for_job(self, job_id: str, k: int = 50) -> List[Tuple[str, float]]:
+        """Get the k resumes closest to an indexed job."""
+        vector = self.jobs.get(job_id)
+        if vector is None:
+            raise KeyError(f"Job {job_id} is not indexed")
+        return self.resumes.search(vector, k)
+
+    def top_jobs_for_resume(self, resume_id: str, k: int = 50) -> List[Tuple[str, float]]:
+        """Get the k jobs closest to an indexed resume."""
+        vector = self.resumes.get(resume_id)
+        if vector is None:
+            raise KeyError(f"Resume {resume_id} is not indexed")
+        return self.jobs.search(vector, k)
+
+    def rank_resumes_for_job(self,
+                             agent,
+                             job_id: str,
+                             job_description: str,
+                             resume_texts: Dict[str, str],
+                             k: int = 20,
+                             depth: str = 'full') -> List[Dict[str, Any]]:
+        """
+        Shortlist resumes from the index and run the full analysis only on them.
+
+        Args:
+            agent: ResumeAnalyzerAgent used to score the shortlist
+            job_id: Indexed job to rank candidates for
+            job_description: Text of the job
+            resume_texts: Lookup of resume id -> text for the shortlisted ids
+            k: Shortlist size
+            depth: Analysis depth passed to the agent
+
+        Returns:
+            Full analysis results for the shortlist, best final_score first
+        """
+        return self.rank_shortlist(agent, {'job_id': job_id, 'job_description': job_description},
+                                   self.top_resumes_for_job(job_id, k), resume_texts, depth)
+
+    @staticmethod
+    def rank_shortlist(agent,
+                       job: Dict[str, Any],
+                       shortlist: List[Tuple[str, float]],
+                       resume_texts: Dict[str, str],
+                       depth: str = 'full') -> List[Dict[str, Any]]:
+        """
+        Run the analysis on a shortlist picked by top_resumes_for_job.
+
+        Static so an inference worker can score a shortlist retrieved in
+        another process.
+
+        Args:
+            agent: ResumeAnalyzerAgent used to score the shortlist
+            job: 'job_description' and/or 'job_id' input for the agent
+            shortlist: (resume id, similarity) pairs
+            resume_texts: Lookup of resume id -> text; ids without text are skipped
+            depth: Analysis depth passed to the agent
+
+        Returns:
+            Analysis results with 'resume_id' and 'similarity', best final_score first
+        """
+        results = []
+        for resume_id, similarity in shortlist:
+            if resume_id not in resume_texts:
+                continue
+            analysis = agent.process({**job, 'resume_text': resume_texts[resume_id], 'depth': depth})
+            analysis['resume_id'] = resume_id
+            analysis['similarity'] = similarity
+            results.append(analysis)
+        return sorted(results, key=lambda result: result['final_score'], reverse=True)
+
+    def save(self) -> None:
+        """Persist both indexes to index_dir. Embedding stores are always up to date on disk."""
+        if self.store_dir is not None:
+            return
+        if self.index_dir is None:
+            raise ValueError("CandidateRetriever was created without an index_dir")
+        # Cleared first so changes made while saving keep the indexes dirty
+        self._dirty = False
+        try:
+            self.resumes.save(str(self.index_dir / 'resumes'))
+            self.jobs.save(str(self.index_dir / 'jobs'))
+        except Exception:
+            self._dirty = True
+            raise
@@ -0,0 +1,103 @@
+"""
+Weight Learning for Resume Matcher.
+Fits the component weights of ResumeAnalyzerAgent.process to stored user ratings.
+"""
+from typing import Any, Dict, Iterable, Optional
+import numpy as np
+
+COMPONENTS = ('technical', 'experience', 'semantic', 'culture', 'future')
+
+DEFAULT_WEIGHTS = {
+    'technical': 0.3,
+    'experience': 0.2,
+    'semantic': 0.1,
+    'culture': 0.2,
+    'future': 0.2
+}
+
+class WeightLearner:
+    """
+    Ridge regression of user ratings on component scores.
+
+    Ratings 1-5 are mapped to targets 0-1 and the fit is shrunk towards the
+    prior weights, so sparse feedback only nudges them. Feedback is folded
+    into the normal equations chunk by chunk, so memory does not grow with
+    the size of the feedback table.
+    """
+
+    def __init__(self,
+                 l2: float = 10.0,
+                 min_samples: int = 50,
+                 prior: Optional[Dict[str, float]] = None):
+        """
+        Initialize the learner.
+
+        Args:
+            l2: Strength of the pull towards the prior weights
+            min_samples: Fewest usable feedback rows needed for a fit
+            prior: Weights to shrink towards (default DEFAULT_WEIGHTS)
+        """
+        self.l2 = l2
+        self.min_samples = min_samples
+        self.prior = dict(prior or DEFAULT_WEIGHTS)
+
+    def fit(self, feedback: Iterable[Dict[str, Any]], chunk_size: int = 4096) -> Optional[Dict[str, Any]]:
+        """
+        Fit weights to feedback.
+
+        Args:
+            feedback: Dicts with 'component_scores' and 'user_rating', e.g. from
+                FeedbackManager.iter_component_feedback
+            chunk_size: Rows converted to arrays at a time
+
+        Returns:
+            Dict with 'weights' and 'metrics' (samples, rmse, prior_rmse), or
+            None if there is too little feedback
+        """
+        dim = len(COMPONENTS)
+        gram = np.zeros((dim, dim))
+        moment = np.zeros(dim)
+        target_sq = 0.0
+        samples = 0
+
+        rows, targets = [], []
+        for record in feedback:
+            scores = record['component_scores']
+            if not all(name in scores for name in COMPONENTS):
+                continue
+            rows.append([scores[name] for name in COMPONENTS])
+            targets.append((record['user_rating'] - 1) / 4.0)
+            if len(rows) == chunk_size:
+                samples += self._accumulate(rows, targets, gram, moment)
+                target_sq += float(np.dot(targets, targets))
+                rows, targets = [], []
+        if rows:
+            samples += self._accumulate(rows, targets, gram, moment)
+            target_sq += float(np.dot(targets, targets))
+
+        if samples < self.min_samples:
+            return None
+
+        prior = np.array([self.prior[name] for name in COMPONENTS])
+        solution = np.linalg.solve(gram + self.l2 * np.eye(dim), moment + self.l2 * prior)
+
+        # Scores stay a convex combination of the components, as with the defaults
+        weights = np.clip(solution, 0.0, None)
+        weights = weights / weights.sum() if weights.sum() > 0 else prior
+
+        def rmse(w: np.ndarray) -> float:
+            sse = target_sq - 2 * w @ moment + w @ gram @ w
+            return float(np.sqrt(max(sse, 0.0) / samples))
+
+        return {
+            'weights': {name: float(weight) for name, weight in zip(COMPONENTS, weights)},
+            'metrics': {'samples': samples, 'rmse': rmse(weights), 'prior_rmse': rmse(prior), 'l2': self.l2}
+        }
+
+    @staticmethod
+    def _accumulate(rows, targets, gram: np.ndarray, moment: np.ndarray) -> int:
+        x = np.asarray(rows, dtype=np.float64)
+        y = np.asarray(targets, dtype=np.float64)
+        gram += x.T @ x
+        moment += x.T @ y
+        return len(x)